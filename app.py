@@ -1,103 +1,238 @@
-from flask import Flask, render_template, jsonify, request
-from threading import Thread
+import asyncio
+import time
+STARTUP_STARTED = time.perf_counter()
+
+from src.utils.env import load_env
+load_env()  # Before any module reads its settings from the environment
+
+from flask import Flask, render_template, jsonify, request, redirect, send_file, Response, g
+from threading import Thread, get_ident
+import functools
+import os
 import traceback
-from src.database import get_all_games, get_game_count, add_game, update_game_metadata
-from src.scrapers.epic_scraper import open_chrome_browser, start_parsing_now, close_chrome_browser
-from src.sync.rawg_sync import sync_with_rawg, RAWGSyncer
-from src.sync.igdb_sync import IGDBSyncer
-
-app = Flask(__name__)
-
-# Store task status and logs
-task_status = {
-    'scraping': {
-        'running': False,
-        'logs': [],
-        'result': None,
-        'chrome_open': False
-    },
-    'syncing': {
-        'running': False,
-        'logs': [],
-        'result': None
-    },
-    'igdb': {
-        'running': False,
-        'logs': [],
-        'result': None
-    }
-}
+import src.database as database
+from src.database import (get_all_games, get_filtered_games, count_filtered_games, get_library_stats, add_game,
+                          update_game_metadata, get_game_by_id, resolve_igdb_related_games)
+from src.task_store import get_task, start_task, finish_task, update_task, append_log, clear_task, TASK_TYPES, OWNER
+from src.utils import metrics, profiler
+
+# The scraper (Selenium) and sync stacks are imported inside the routes that use them,
+# and the database is set up on its first query, so the server starts serving quickly
+
+class LibraryFlask(Flask):
+    def async_to_sync(self, func):
+        """Run an async view on its event loop thread, which a ?profile=1 request profile follows."""
+        @functools.wraps(func)
+        async def run(*args, **kwargs):
+            sampler = g.get('profile')
+            if sampler is not None:
+                sampler.add_thread(get_ident(), 'request-loop')
+            return await func(*args, **kwargs)
+
+        return super().async_to_sync(run)
+
+app = LibraryFlask(__name__)
+
+MAX_GAMES_PAGE_SIZE = 1000  # Largest page /api/games returns when a limit is given
+
+# Seconds since STARTUP_STARTED for each startup phase
+startup_timings = {'imports': time.perf_counter() - STARTUP_STARTED}
+
+def print_startup_report():
+    """Print how long each startup phase took."""
+    print("[STARTUP] " + ", ".join(f"{phase}: {seconds * 1000:.0f}ms" for phase, seconds in startup_timings.items()))
+
+@app.before_request
+def record_first_request():
+    """Record time-to-first-request once per process."""
+    if 'first_request' not in startup_timings:
+        startup_timings['first_request'] = time.perf_counter() - STARTUP_STARTED
+
+@app.after_request
+def report_first_request(response):
+    """Print the startup report after the first response (includes lazy database setup)."""
+    if 'first_response' not in startup_timings:
+        startup_timings['first_response'] = time.perf_counter() - STARTUP_STARTED
+        if database.init_seconds is not None:
+            startup_timings['db_init'] = database.init_seconds
+        print_startup_report()
+    return response
+
+@app.before_request
+def start_request_metrics():
+    """Start timing the request (database and API time add up per request, see src/utils/metrics.py)."""
+    if metrics.METRICS_ENABLED:
+        metrics.start_request()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record the request in the route histogram and report its timings in a Server-Timing header."""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    timings = metrics.finish_request(request.method, route, response.status_code)
+    if timings is not None:
+        response.headers['Server-Timing'] = metrics.server_timing_header(timings)
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Metrics of this worker process in the Prometheus text format."""
+    if not metrics.METRICS_ENABLED:
+        return jsonify({'success': False, 'error': 'Metrics are disabled'}), 404
+
+    import src.sync.rawg_search  # noqa: F401 - registers the search cache counters
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def admin_token():
+    """Admin token sent with a request (X-Admin-Token header only, so it stays out of logs and history)."""
+    return request.headers.get('X-Admin-Token')
+
+@app.before_request
+def start_request_profile():
+    """Profile this request's threads when asked with ?profile=1 and the admin token."""
+    if request.args.get('profile') == '1' and profiler.is_authorized(admin_token()):
+        g.profile = profiler.StackSampler(labels={get_ident(): 'request'}, only={get_ident()}).start()
+
+@app.after_request
+def return_request_profile(response):
+    """Replace a profiled request's response with its collapsed stacks."""
+    sampler = g.pop('profile', None)
+    if sampler is None:
+        return response
+
+    sampler.stop()
+    profiled = Response(sampler.collapsed(), mimetype='text/plain')
+    profiled.headers['X-Profiled-Status'] = str(response.status_code)
+    profiled.headers['X-Profile-Samples'] = str(sampler.samples)
+    return profiled
+
+@app.route('/api/admin/profile', methods=['GET'])
+def profile_process():
+    """
+    Sample every thread of this worker process (requests and syncs) for ?seconds=N.
+
+    Returns collapsed stacks (?format=json for a summary of the busiest functions).
+    Requires the ADMIN_TOKEN as an X-Admin-Token header.
+    """
+    if not profiler.is_enabled():
+        return jsonify({'success': False, 'error': 'Profiling is disabled. Set ADMIN_TOKEN to enable it.'}), 404
+    if not profiler.is_authorized(admin_token()):
+        return jsonify({'success': False, 'error': 'Invalid admin token'}), 401
+
+    seconds = request.args.get('seconds', 10, type=float)
+    try:
+        sampler = profiler.profile_process(seconds)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+
+    if request.args.get('format') == 'json':
+        return jsonify({'success': True, **sampler.summary()})
+    return Response(sampler.collapsed(), mimetype='text/plain')
+
+# Task state and logs live in a shared store, so every worker process sees the same tasks
+# (see src/task_store.py). Routes claim a task with start_task() before starting its thread.
 
 def scraping_callback(message):
     """Callback to receive scraping status updates."""
-    task_status['scraping']['logs'].append(message)
+    append_log('scraping', message)
 
 def syncing_callback(message):
     """Callback to receive syncing status updates."""
-    task_status['syncing']['logs'].append(message)
+    append_log('syncing', message)
 
 def run_open_chrome():
     """Open Chrome browser - Step 1."""
     try:
-        task_status['scraping']['logs'] = []
-        task_status['scraping']['result'] = None
+        clear_task('scraping')
 
+        from src.scrapers.epic_scraper import open_chrome_browser
         result = open_chrome_browser(callback=scraping_callback)
 
-        if result['success']:
-            task_status['scraping']['chrome_open'] = True
-
-        task_status['scraping']['result'] = result
+        update_task('scraping', chrome_open=result['success'], result=result)
 
     except Exception as e:
         error_msg = f"Error opening Chrome: {str(e)}\n{traceback.format_exc()}"
-        task_status['scraping']['logs'].append(error_msg)
-        task_status['scraping']['result'] = {
+        append_log('scraping', error_msg)
+        update_task('scraping', result={
             'success': False,
             'error': str(e)
-        }
+        })
 
-def run_start_parsing():
-    """Start parsing - Step 2."""
+def run_start_parsing(mode=None, full_scan=False):
+    """Start parsing - Step 2 (the scraping task must already be started)."""
     try:
-        task_status['scraping']['running'] = True
-        task_status['scraping']['logs'] = []
-        task_status['scraping']['result'] = None
+        from src.scrapers.epic_scraper import start_parsing_now
+        result = start_parsing_now(callback=scraping_callback, mode=mode, full_scan=full_scan)
 
-        result = start_parsing_now(callback=scraping_callback)
-
-        task_status['scraping']['result'] = result
-        task_status['scraping']['running'] = False
+        # The browser went back to the browser manager (kept warm for the next scrape)
+        update_task('scraping', chrome_open=False)
+        finish_task('scraping', result)
 
     except Exception as e:
         error_msg = f"Parsing error: {str(e)}\n{traceback.format_exc()}"
-        task_status['scraping']['logs'].append(error_msg)
-        task_status['scraping']['result'] = {
+        append_log('scraping', error_msg)
+        finish_task('scraping', {
             'success': False,
             'error': str(e)
-        }
-        task_status['scraping']['running'] = False
+        })
 
 def run_syncing(force_resync=False):
-    """Run RAWG syncing in a background thread."""
+    """Run RAWG syncing in a background thread (the syncing task must already be started)."""
     try:
-        task_status['syncing']['running'] = True
-        task_status['syncing']['logs'] = []
-        task_status['syncing']['result'] = None
-
+        from src.sync.rawg_sync import sync_with_rawg
         result = sync_with_rawg(callback=syncing_callback, force_resync=force_resync)
 
-        task_status['syncing']['result'] = result
-        task_status['syncing']['running'] = False
+        finish_task('syncing', result)
 
     except Exception as e:
         error_msg = f"Syncing error: {str(e)}\n{traceback.format_exc()}"
-        task_status['syncing']['logs'].append(error_msg)
-        task_status['syncing']['result'] = {
+        append_log('syncing', error_msg)
+        finish_task('syncing', {
             'success': False,
             'error': str(e)
-        }
-        task_status['syncing']['running'] = False
+        })
+
+def igdb_callback(message):
+    """Callback to receive IGDB syncing status updates."""
+    append_log('igdb', message)
+
+def run_igdb_syncing():
+    """Run the IGDB sync in a background thread (the igdb task must already be started)."""
+    result = None
+
+    try:
+        from src.sync.igdb_sync import sync_all_games_with_igdb
+        result = sync_all_games_with_igdb(callback=igdb_callback)
+    except Exception as e:
+        append_log('igdb', f"ERROR: {str(e)}")
+        append_log('igdb', traceback.format_exc())
+    finally:
+        finish_task('igdb', result)
+
+def resume_interrupted_syncs():
+    """Resume sync jobs that were interrupted by a crash or restart."""
+    runners = {
+        'rawg_sync': ('syncing', run_syncing),
+        'igdb_sync': ('igdb', run_igdb_syncing)
+    }
+
+    from src.job_queue import get_unfinished_jobs
+
+    for job in get_unfinished_jobs():
+        if job['kind'] not in runners:
+            continue
+
+        # Claiming the task first means a job is never resumed twice, even by several workers
+        task_type, runner = runners[job['kind']]
+        if not start_task(task_type):
+            continue
+
+        print(f"Resuming interrupted {job['kind']} job #{job['id']}")
+
+        thread = Thread(target=runner)
+        thread.daemon = True
+        thread.start()
 
 @app.route('/')
 def index():
@@ -108,51 +243,35 @@ def index():
 def get_games():
     """Get all games from the database with optional filtering."""
     try:
-        # Get filter parameters
-        min_local_players = request.args.get('min_local_players', type=int)
-        min_online_players = request.args.get('min_online_players', type=int)
-        max_local_players = request.args.get('max_local_players', type=int)
-        max_online_players = request.args.get('max_online_players', type=int)
-        multiplayer_type = request.args.get('multiplayer_type', '')
+        # Filters, sorting and pagination run in SQL (see GAMES_INDEXES in src/migrations.py)
+        filters = {
+            'min_local_players': request.args.get('min_local_players', type=int),
+            'max_local_players': request.args.get('max_local_players', type=int),
+            'min_online_players': request.args.get('min_online_players', type=int),
+            'max_online_players': request.args.get('max_online_players', type=int),
+            'multiplayer_type': request.args.get('multiplayer_type', '')
+        }
+        limit = request.args.get('limit', type=int)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        if limit is not None:
+            limit = min(max(limit, 1), MAX_GAMES_PAGE_SIZE)
 
-        games = get_all_games()
+        games = get_filtered_games(sort=request.args.get('sort', 'title'), limit=limit, offset=offset, **filters)
+
+        # IGDB covers come with srcsets so cards download the smallest adequate size
+        from src.sync.igdb_images import add_image_variants
+        for game in games:
+            add_image_variants(game)
 
-        # Apply player count filters
-        if min_local_players is not None:
-            games = [g for g in games if g.get('rawg__local_players_max') and g.get('rawg__local_players_max') >= min_local_players]
-
-        if max_local_players is not None:
-            games = [g for g in games if g.get('rawg__local_players_max') and g.get('rawg__local_players_max') <= max_local_players]
-
-        if min_online_players is not None:
-            games = [g for g in games if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') >= min_online_players]
-
-        if max_online_players is not None:
-            games = [g for g in games if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') <= max_online_players]
-
-        # Apply multiplayer type filter
-        if multiplayer_type == 'local':
-            games = [g for g in games if g.get('rawg__local_players_max') and g.get('rawg__local_players_max') > 1]
-        elif multiplayer_type == 'online':
-            games = [g for g in games if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') > 1]
-        elif multiplayer_type == 'singleplayer':
-            games = [g for g in games if (not g.get('rawg__local_players_max') or g.get('rawg__local_players_max') <= 1) and
-                     (not g.get('rawg__online_players_max') or g.get('rawg__online_players_max') <= 1)]
-        elif multiplayer_type == 'coop_local':
-            games = [g for g in games if g.get('rawg__local_players_max') and g.get('rawg__local_players_max') >= 2]
-        elif multiplayer_type == 'coop_online':
-            games = [g for g in games if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') >= 2]
-        elif multiplayer_type == 'party_local':
-            games = [g for g in games if g.get('rawg__local_players_max') and g.get('rawg__local_players_max') >= 4]
-        elif multiplayer_type == 'party_online':
-            games = [g for g in games if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') >= 4]
-        elif multiplayer_type == 'large_online':
-            games = [g for g in games if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') >= 10]
+        # Without a limit every game is returned, so the page is the total
+        total = count_filtered_games(**filters) if limit is not None else len(games)
 
         return jsonify({
             'success': True,
             'games': games,
-            'count': len(games)
+            'count': len(games),
+            'total': total,
+            'offset': offset
         })
     except Exception as e:
         return jsonify({
@@ -160,33 +279,42 @@ def get_games():
             'error': str(e)
         }), 500
 
+@app.route('/api/games/<int:game_id>', methods=['GET'])
+def get_game(game_id):
+    """Get a single game with the image variants of its detail view and its related IGDB games."""
+    from src.sync.igdb_images import add_image_variants
+
+    game = get_game_by_id(game_id)
+    if not game:
+        return jsonify({
+            'success': False,
+            'error': 'Game not found'
+        }), 404
+
+    # DLCs, remakes, similar games... are stored as IGDB IDs
+    resolve_igdb_related_games(game)
+
+    return jsonify({
+        'success': True,
+        'game': add_image_variants(game, detail=True)
+    })
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get library statistics."""
     try:
-        total_games = get_game_count()
-        games = get_all_games()
-
-        synced_games_rawg = sum(1 for g in games if g.get('rawg__synced'))
-        synced_games_igdb = sum(1 for g in games if g.get('igdb__synced'))
-
-        # Count games with local multiplayer
-        local_mp_games = sum(1 for g in games
-                           if g.get('rawg__local_players_max') and g.get('rawg__local_players_max') > 1)
-
-        # Count games with online multiplayer
-        online_mp_games = sum(1 for g in games
-                            if g.get('rawg__online_players_max') and g.get('rawg__online_players_max') > 1)
+        stats = get_library_stats()
+        total_games = stats['total_games']
 
         return jsonify({
             'success': True,
             'total_games': total_games,
-            'synced_games_rawg': synced_games_rawg,
-            'synced_games_igdb': synced_games_igdb,
-            'unsynced_games_rawg': total_games - synced_games_rawg,
-            'unsynced_games_igdb': total_games - synced_games_igdb,
-            'local_multiplayer_games': local_mp_games,
-            'online_multiplayer_games': online_mp_games
+            'synced_games_rawg': stats['synced_games_rawg'],
+            'synced_games_igdb': stats['synced_games_igdb'],
+            'unsynced_games_rawg': total_games - stats['synced_games_rawg'],
+            'unsynced_games_igdb': total_games - stats['synced_games_igdb'],
+            'local_multiplayer_games': stats['local_multiplayer_games'],
+            'online_multiplayer_games': stats['online_multiplayer_games']
         })
     except Exception as e:
         return jsonify({
@@ -194,9 +322,27 @@ def get_stats():
             'error': str(e)
         }), 500
 
+def browser_elsewhere_error(task):
+    """
+    Error response if the scraping browser is open in another worker process.
+
+    The driver lives in the process that opened it, so only that worker can scrape with it.
+    """
+    owner = task['chrome_owner']
+    if owner and owner != OWNER:
+        return jsonify({
+            'success': False,
+            'message': f'Scraping runs in worker {owner}, not this one. Use WEB_WORKERS=1 to scrape.'
+        }), 409
+    return None
+
 @app.route('/api/open-chrome', methods=['POST'])
 def open_chrome():
     """Open Chrome browser - Step 1."""
+    error = browser_elsewhere_error(get_task('scraping', with_logs=False))
+    if error:
+        return error
+
     # Open Chrome in background thread
     thread = Thread(target=run_open_chrome)
     thread.daemon = True
@@ -207,23 +353,66 @@ def open_chrome():
         'message': 'Opening Chrome...'
     })
 
+@app.route('/api/browser/status', methods=['GET'])
+def browser_status():
+    """Get the state of the managed scraping browser."""
+    from src.scrapers.browser import get_browser_manager
+
+    return jsonify({
+        'success': True,
+        'browser': get_browser_manager().status()
+    })
+
+@app.route('/api/browser/close', methods=['POST'])
+def close_browser():
+    """Quit the managed scraping browser now instead of waiting for the idle timeout."""
+    task = get_task('scraping', with_logs=False)
+    if task['running']:
+        return jsonify({
+            'success': False,
+            'message': 'Parsing is in progress'
+        }), 400
+
+    error = browser_elsewhere_error(task)
+    if error:
+        return error
+
+    from src.scrapers.epic_scraper import close_chrome_browser
+    close_chrome_browser(callback=scraping_callback, shutdown=True)
+    update_task('scraping', chrome_open=False)
+
+    return jsonify({
+        'success': True,
+        'message': 'Chrome closed'
+    })
+
 @app.route('/api/start-parsing', methods=['POST'])
 def start_parsing():
     """Start parsing - Step 2."""
-    if task_status['scraping']['running']:
+    task = get_task('scraping', with_logs=False)
+    if not task['chrome_open']:
         return jsonify({
             'success': False,
-            'message': 'Parsing is already in progress'
+            'message': 'Chrome not open. Click "Open Chrome" first.'
         }), 400
 
-    if not task_status['scraping']['chrome_open']:
+    error = browser_elsewhere_error(task)
+    if error:
+        return error
+
+    if not start_task('scraping'):
         return jsonify({
             'success': False,
-            'message': 'Chrome not open. Click "Open Chrome" first.'
+            'message': 'Parsing is already in progress'
         }), 400
 
+    # Optional scrape mode: 'api' (default) or 'ui', and full_scan to ignore the previous scrape
+    data = request.get_json(silent=True) or {}
+    mode = data.get('mode')
+    full_scan = bool(data.get('full_scan', False))
+
     # Start parsing in background thread
-    thread = Thread(target=run_start_parsing)
+    thread = Thread(target=run_start_parsing, args=(mode, full_scan))
     thread.daemon = True
     thread.start()
 
@@ -235,7 +424,7 @@ def start_parsing():
 @app.route('/api/sync', methods=['POST'])
 def start_syncing():
     """Start RAWG metadata syncing."""
-    if task_status['syncing']['running']:
+    if not start_task('syncing'):
         return jsonify({
             'success': False,
             'message': 'Syncing is already in progress'
@@ -263,13 +452,13 @@ def get_task_status(task_type):
     Args:
         task_type: 'scraping', 'syncing', or 'igdb'
     """
-    if task_type not in ['scraping', 'syncing', 'igdb']:
+    if task_type not in TASK_TYPES:
         return jsonify({
             'success': False,
             'error': 'Invalid task type'
         }), 400
 
-    status = task_status[task_type]
+    status = get_task(task_type)
 
     return jsonify({
         'success': True,
@@ -281,43 +470,70 @@ def get_task_status(task_type):
 @app.route('/api/task_status', methods=['GET'])
 def get_all_task_status():
     """Get status of all background tasks."""
+    scraping = get_task('scraping')
+    syncing = get_task('syncing')
+    igdb = get_task('igdb')
+
     return jsonify({
         'success': True,
         'scraping': {
-            'active': task_status['scraping']['running'],
-            'logs': task_status['scraping']['logs'],
-            'waiting_for_continue': task_status['scraping'].get('chrome_open', False) and not task_status['scraping']['running']
+            'active': scraping['running'],
+            'logs': scraping['logs'],
+            'waiting_for_continue': scraping['chrome_open'] and not scraping['running']
         },
         'syncing': {
-            'active': task_status['syncing']['running'],
-            'logs': task_status['syncing']['logs']
+            'active': syncing['running'],
+            'logs': syncing['logs']
         },
         'igdb': {
-            'active': task_status['igdb']['running'],
-            'logs': task_status['igdb']['logs']
+            'active': igdb['running'],
+            'logs': igdb['logs']
         }
     })
 
 @app.route('/api/clear-logs/<task_type>', methods=['POST'])
 def clear_logs(task_type):
     """Clear logs for a specific task."""
-    if task_type not in ['scraping', 'syncing', 'igdb']:
+    if task_type not in TASK_TYPES:
         return jsonify({
             'success': False,
             'error': 'Invalid task type'
         }), 400
 
-    task_status[task_type]['logs'] = []
-    task_status[task_type]['result'] = None
+    clear_task(task_type)
 
     return jsonify({
         'success': True,
         'message': f'{task_type.capitalize()} logs cleared'
     })
 
+@app.route('/api/image')
+def cached_image():
+    """Serve a cover or screenshot from the local image cache, resized with ?w=<width>."""
+    from src.image_cache import is_allowed, get_image, guess_mimetype
+
+    url = request.args.get('url', '')
+    if not is_allowed(url):
+        return jsonify({
+            'success': False,
+            'error': 'Image host not allowed'
+        }), 400
+
+    path = get_image(url, request.args.get('w', type=int))
+    if path is None:
+        # Could not cache it (e.g. the CDN is unreachable): let the browser try directly
+        return redirect(url)
+
+    # Cached files never change for a given URL and width
+    response = send_file(path, mimetype=guess_mimetype(url, path), max_age=365 * 24 * 3600,
+                         conditional=True, etag=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/api/search-game', methods=['POST'])
-def search_game():
-    """Search for a game on RAWG."""
+async def search_game():
+    """Search the library and RAWG for a game to add."""
     try:
         data = request.get_json()
         query = data.get('query', '').strip()
@@ -328,39 +544,16 @@ def search_game():
                 'error': 'No search query provided'
             }), 400
 
-        # Use RAWG syncer to search
-        syncer = RAWGSyncer()
-
-        # Search for games (get top 5 results)
-        import requests
-        url = "https://api.rawg.io/api/games"
-        params = {
-            'key': syncer.api_key,
-            'search': query,
-            'page_size': 5
-        }
-
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        results = []
-        for game in data.get('results', []):
-            results.append({
-                'id': game.get('id'),
-                'name': game.get('name'),
-                'released': game.get('released'),
-                'background_image': game.get('background_image'),  # Direct from RAWG API
-                'rating': game.get('rating'),
-                'metacritic': game.get('metacritic'),
-                'genres': [g['name'] for g in game.get('genres', [])],
-                'platforms': [p['platform']['name'] for p in game.get('platforms', [])]
-            })
+        # Cached, coalesced search (library matches first, then the top 5 RAWG results)
+        from src.sync.rawg_search import get_search_service
+        found = await get_search_service().search(query, limit=5)
 
         return jsonify({
             'success': True,
-            'results': results,
-            'count': len(results)
+            'library': found['library'],
+            'results': found['results'],
+            'count': len(found['results']),
+            'source': found['source']
         })
 
     except Exception as e:
@@ -370,7 +563,7 @@ def search_game():
         }), 500
 
 @app.route('/api/add-manual-game', methods=['POST'])
-def add_manual_game():
+async def add_manual_game():
     """Add a game manually with full RAWG metadata."""
     try:
         data = request.get_json()
@@ -384,7 +577,7 @@ def add_manual_game():
             }), 400
 
         # Add game to database
-        game_db_id, was_new = add_game(game_name)
+        game_db_id, was_new = await asyncio.to_thread(add_game, game_name)
 
         if not was_new:
             return jsonify({
@@ -393,45 +586,35 @@ def add_manual_game():
                 'already_exists': True
             }), 400
 
-        # Fetch full metadata from RAWG
+        # Fetch details and all sub-resources from RAWG concurrently
+        from src.sync.rawg_sync import RAWGSyncer
+        from src.utils.http_client import create_async_client
         syncer = RAWGSyncer()
 
-        # Get detailed information
-        game_details = syncer.get_game_details(rawg_id)
-        if not game_details:
+        async with create_async_client() as client:
+            metadata = await syncer.afetch_game(client, rawg_id)
+
+        if not metadata:
             return jsonify({
                 'success': False,
                 'error': 'Could not fetch game details from RAWG'
             }), 500
 
-        # Fetch additional data
-        screenshots = syncer.get_game_screenshots(rawg_id)
-        achievements = syncer.get_game_achievements(rawg_id)
-        trailers = syncer.get_game_trailers(rawg_id)
-        stores = syncer.get_game_stores(rawg_id)
-
-        # Extract ALL metadata with rawg__ prefix
-        metadata = syncer.extract_all_metadata(
-            game_details,
-            screenshots,
-            achievements,
-            trailers,
-            stores
-        )
-
         # Update database with RAWG data
         from src.database import update_game_with_rawg_data
-        update_game_with_rawg_data(game_db_id, metadata)
+        from src.image_cache import prefetch_game_images
+        await asyncio.to_thread(update_game_with_rawg_data, game_db_id, metadata)
+        prefetch_game_images(metadata)
 
         return jsonify({
             'success': True,
             'message': f'{game_name} added to your library!',
             'game_id': game_db_id,
             'metadata': {
-                'screenshots_count': len(screenshots),
-                'achievements_count': len(achievements),
-                'trailers_count': len(trailers),
-                'stores_count': len(stores)
+                'screenshots_count': len(metadata.get('rawg__screenshots') or []),
+                'achievements_count': len(metadata.get('rawg__achievements') or []),
+                'trailers_count': len(metadata.get('rawg__trailers') or []),
+                'stores_count': len(metadata.get('rawg__stores') or [])
             }
         })
 
@@ -663,15 +846,14 @@ def print_game_info(game_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/sync-single-game/<int:game_id>', methods=['POST'])
-def sync_single_game(game_id):
+async def sync_single_game(game_id):
     """Sync a single game with RAWG or IGDB."""
     try:
         data = request.get_json() or {}
         source = data.get('source', 'rawg').lower()
 
         # Get the game
-        games = get_all_games()
-        game = next((g for g in games if g['id'] == game_id), None)
+        game = await asyncio.to_thread(get_game_by_id, game_id)
 
         if not game:
             return jsonify({
@@ -686,55 +868,43 @@ def sync_single_game(game_id):
 
             # Sync with RAWG
             from src.sync.rawg_sync import RAWGSyncer
+            from src.utils.http_client import create_async_client
             syncer = RAWGSyncer()
 
-            # Search for the game
-            print(f"🔍 Searching RAWG for: {game_title}")
-            search_result = syncer.search_game(game_title)
+            async with create_async_client() as client:
+                # Search for the game
+                print(f"🔍 Searching RAWG for: {game_title}")
+                search_result = await syncer.asearch_game(client, game_title)
 
-            if not search_result:
-                print(f"❌ Could not find '{game_title}' on RAWG")
-                return jsonify({
-                    'success': False,
-                    'message': f'Could not find "{game_title}" on RAWG. Try searching with a different name.'
-                }), 404
+                if not search_result:
+                    print(f"❌ Could not find '{game_title}' on RAWG")
+                    return jsonify({
+                        'success': False,
+                        'message': f'Could not find "{game_title}" on RAWG. Try searching with a different name.'
+                    }), 404
+
+                # Use the search result directly (search_game returns a single game object)
+                rawg_game_id = search_result.get('id')
+                rawg_game_name = search_result.get('name')
+                print(f"✓ Found match: {rawg_game_name} (RAWG ID: {rawg_game_id})")
 
-            # Use the search result directly (search_game returns a single game object)
-            rawg_game_id = search_result.get('id')
-            rawg_game_name = search_result.get('name')
-            print(f"✓ Found match: {rawg_game_name} (RAWG ID: {rawg_game_id})")
+                # Details, screenshots, achievements, trailers and stores are fetched concurrently
+                print("📥 Fetching game details and media...")
+                metadata = await syncer.afetch_game(client, rawg_game_id)
 
-            # Fetch all metadata using correct method names
-            print("📥 Fetching game details...")
-            game_details = syncer.get_game_details(rawg_game_id)
-            if not game_details:
+            if not metadata:
                 return jsonify({
                     'success': False,
                     'message': 'Failed to fetch game details from RAWG'
                 }), 500
 
-            print("📷 Fetching screenshots...")
-            screenshots = syncer.get_game_screenshots(rawg_game_id)
-
-            print("🏆 Fetching achievements...")
-            achievements = syncer.get_game_achievements(rawg_game_id)
-
-            print("🎬 Fetching trailers...")
-            trailers = syncer.get_game_trailers(rawg_game_id)
-
-            print("🛒 Fetching store info...")
-            stores = syncer.get_game_stores(rawg_game_id)
-
-            # Extract metadata
-            print("🔧 Extracting metadata...")
-            metadata = syncer.extract_all_metadata(
-                game_details, screenshots, achievements, trailers, stores
-            )
-
             # Update database
             print("💾 Updating database...")
             from src.database import update_game_with_rawg_data
-            success = update_game_with_rawg_data(game_id, metadata)
+            success = await asyncio.to_thread(update_game_with_rawg_data, game_id, metadata)
+            if success:
+                from src.image_cache import prefetch_game_images
+                prefetch_game_images(metadata)
 
             if success:
                 print(f"✅ RAWG sync complete for: {game_title}")
@@ -764,7 +934,8 @@ def sync_single_game(game_id):
 
             # Search for the game
             print(f"\n🔍 Searching IGDB for: {game_title}")
-            search_result = syncer.search_game(game_title)
+            # The IGDB client is synchronous; run its calls off the event loop
+            search_result = await asyncio.to_thread(syncer.search_game, game_title)
 
             if not search_result:
                 print(f"❌ Could not find '{game_title}' on IGDB")
@@ -780,7 +951,7 @@ def sync_single_game(game_id):
             print(f"✓ Found match: {igdb_game_name} (IGDB ID: {igdb_game_id})")
 
             print(f"\n📥 Fetching complete game details from IGDB...")
-            game_data = syncer.get_game_details(igdb_game_id)
+            game_data = await asyncio.to_thread(syncer.get_game_details, igdb_game_id)
 
             if not game_data:
                 print("❌ Failed to fetch game data from IGDB")
@@ -806,6 +977,9 @@ def sync_single_game(game_id):
             if game_data.get('rating'):
                 print(f"  Rating: {game_data.get('rating', 0) / 20:.1f}/5.0")
 
+            # Cache related games (DLCs, remakes...) in the shared table
+            await asyncio.to_thread(syncer.cache_related_games, game_data)
+
             # Extract all metadata
             print(f"\n🔧 Extracting metadata...")
             metadata = syncer.extract_all_metadata(game_data)
@@ -813,7 +987,10 @@ def sync_single_game(game_id):
 
             # Update database
             print(f"\n💾 Updating database...")
-            success = update_game_with_igdb_data(game_id, metadata)
+            success = await asyncio.to_thread(update_game_with_igdb_data, game_id, metadata)
+            if success:
+                from src.image_cache import prefetch_game_images
+                prefetch_game_images(metadata)
 
             if success:
                 print(f"✓ Database updated successfully!")
@@ -852,35 +1029,14 @@ def sync_with_igdb():
     Sync all unsynced games with IGDB API.
     Similar to RAWG sync but for IGDB.
     """
-    if task_status['igdb']['running']:
+    if not start_task('igdb'):
         return jsonify({
             'success': False,
             'message': 'IGDB sync already running'
         }), 409
 
-    def update_status(message: str):
-        """Callback to update sync status."""
-        task_status['igdb']['logs'].append(message)
-
-    def run_sync():
-        """Run the IGDB sync in background."""
-        task_status['igdb']['running'] = True
-        task_status['igdb']['logs'] = []
-
-        try:
-            from src.sync.igdb_sync import sync_all_games_with_igdb
-            result = sync_all_games_with_igdb(callback=update_status)
-            task_status['igdb']['result'] = result
-        except Exception as e:
-            task_status['igdb']['logs'].append(f"ERROR: {str(e)}")
-            import traceback
-            task_status['igdb']['logs'].append(traceback.format_exc())
-        finally:
-            task_status['igdb']['running'] = False
-
     # Start sync in background thread
-    import threading
-    sync_thread = threading.Thread(target=run_sync)
+    sync_thread = Thread(target=run_igdb_syncing)
     sync_thread.daemon = True
     sync_thread.start()
 
@@ -900,4 +1056,11 @@ if __name__ == '__main__':
     print("\nPress Ctrl+C to stop the server")
     print("=" * 60)
 
+    # The reloader starts the app twice; only resume jobs in the serving process
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        resume_interrupted_syncs()
+
+    startup_timings['server_start'] = time.perf_counter() - STARTUP_STARTED
+    print_startup_report()
+
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,148 @@
+"""
+Production ASGI entry point
+Run with: gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app
+
+Async views (add-game search, manual add and single-game sync, which wait on RAWG/IGDB)
+run as coroutines on the worker's event loop, so a request waiting on an API holds no
+thread. Every other route is the regular Flask app, served from a thread pool.
+"""
+import inspect
+import io
+import sys
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import request, request_started
+from werkzeug.exceptions import HTTPException
+
+from app import app as flask_app, resume_interrupted_syncs
+
+# Sync routes (library, tasks, images...) run in asgiref's thread pool
+wsgi_app = WsgiToAsgi(flask_app)
+
+
+def build_environ(scope, body: bytes):
+    """WSGI environ of an ASGI HTTP request, so Flask can build its request context from it."""
+    script_name = scope.get('root_path', '')
+    path_info = scope['path']
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path_info.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+    return environ
+
+
+def async_view(scope):
+    """The async view function a request is routed to, or None if it goes to a sync route."""
+    adapter = flask_app.url_map.bind_to_environ(build_environ(scope, b''))
+    try:
+        endpoint, _ = adapter.match()
+    except HTTPException:
+        return None  # Redirects, 404 and 405 are answered by the Flask app
+
+    view = flask_app.view_functions.get(endpoint)
+    return view if inspect.iscoroutinefunction(view) else None
+
+
+async def read_body(receive) -> bytes:
+    """Read the whole request body."""
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def dispatch(view):
+    """Flask's full_dispatch_request, awaiting the view on this event loop."""
+    try:
+        request_started.send(flask_app)
+        rv = flask_app.preprocess_request()
+        if rv is None:
+            rv = await view(**request.view_args)
+    except Exception as e:
+        rv = flask_app.handle_user_exception(e)
+    return flask_app.finalize_request(rv)
+
+
+async def serve_async_view(view, scope, receive, send):
+    """Run an async view in a Flask request context and send its response."""
+    environ = build_environ(scope, await read_body(receive))
+
+    # Flask's contexts are context variables, local to this request's task
+    with flask_app.request_context(environ):
+        try:
+            response = await dispatch(view)
+        except Exception as e:
+            response = flask_app.handle_exception(e)
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in response.headers.items()]
+        })
+        try:
+            for chunk in response.iter_encoded():
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            response.close()
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+async def lifespan(receive, send):
+    """Acknowledge server startup and shutdown (jobs are resumed on import, as in wsgi.py)."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application: async views on the event loop, everything else through the WSGI app."""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    view = async_view(scope) if scope['type'] == 'http' else None
+    if view is None:
+        await wsgi_app(scope, receive, send)
+    else:
+        await serve_async_view(view, scope, receive, send)
+
+
+# Every worker tries; the shared task store lets only one of them resume each job
+resume_interrupted_syncs()
@@ -0,0 +1,256 @@
+"""
+Fake RAWG / IGDB / Twitch server for benchmarks
+Answers the endpoints the sync code calls with generated games, with configurable
+latency, per-provider rate limits (429 + Retry-After) and payload sizes
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+import payloads
+
+# Mount points (set RAWG_BASE_URL etc. to http://host:port + these)
+RAWG_PREFIX = '/rawg/api'
+IGDB_PREFIX = '/igdb/v4'
+TWITCH_PREFIX = '/twitch/oauth2/token'
+
+_SEARCH_PATTERN = re.compile(r'search "((?:[^"\\]|\\.)*)"')
+_ID_PATTERN = re.compile(r'where id = (\d+)\s*;')
+_ID_LIST_PATTERN = re.compile(r'where id = \(([\d,\s]+)\)')
+_OFFSET_PATTERN = re.compile(r'offset (\d+)')
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        """
+        Token bucket allowing `rate` requests per second (0 = unlimited).
+
+        Args:
+            rate: Sustained requests per second, also used as the burst size
+        """
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Optional[float]:
+        """Take a token, or return how many seconds until one is available."""
+        if not self.rate:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return None
+            return (1 - self.tokens) / self.rate
+
+
+class FakeUpstream(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.05, jitter: float = 0.01,
+                 rawg_rate: float = 0, igdb_rate: float = 4, payload_size: str = 'medium'):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to listen on (port 0 picks a free one)
+            latency: Seconds added to every response
+            jitter: Maximum random seconds added on top of latency
+            rawg_rate: RAWG requests per second before answering 429 (0 = unlimited)
+            igdb_rate: IGDB requests per second before answering 429 (IGDB allows 4)
+            payload_size: 'small', 'medium' or 'large' (see payloads.PAYLOAD_SIZES)
+        """
+        super().__init__(address, FakeUpstreamHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.payload_size = payload_size
+        self.limiters = {'rawg': RateLimiter(rawg_rate), 'igdb': RateLimiter(igdb_rate)}
+
+        self.stats = {'requests': 0, 'rate_limited': 0, 'bytes': 0}
+        self._stats_lock = threading.Lock()
+
+    def count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs (the client pools connections)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body, headers: Dict = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(bytes=len(data))
+
+    def _read_body(self) -> str:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length).decode('utf-8') if length else ''
+
+    def _delay(self):
+        server = self.server
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+
+    def _rate_limited(self, provider: str) -> bool:
+        """Answer 429 if the provider's rate limit is exceeded."""
+        wait = self.server.limiters[provider].acquire()
+        if wait is None:
+            return False
+
+        self.server.count(rate_limited=1)
+        self._send_json(429, {'error': 'Too Many Requests'}, {'Retry-After': str(max(1, round(wait)))})
+        return True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        if url.path == '/__stats':
+            self._send_json(200, self.server.stats)
+            return
+
+        self.server.count(requests=1)
+
+        if not url.path.startswith(RAWG_PREFIX):
+            self._send_json(404, {'detail': 'Not found.'})
+            return
+        if self._rate_limited('rawg'):
+            return
+
+        self._delay()
+        self._rawg(url.path[len(RAWG_PREFIX):], parse_qs(url.query))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self._read_body()
+        self.server.count(requests=1)
+
+        if url.path == TWITCH_PREFIX:
+            self._delay()
+            self._send_json(200, {'access_token': 'benchmark-token', 'expires_in': 5_000_000,
+                                  'token_type': 'bearer'})
+        elif url.path.startswith(IGDB_PREFIX):
+            if self._rate_limited('igdb'):
+                return
+            self._delay()
+            self._igdb(url.path[len(IGDB_PREFIX) + 1:], body)
+        else:
+            self._send_json(404, {'message': 'Not found'})
+
+    def _rawg(self, path: str, query: Dict):
+        """RAWG: /games?search=, /games/{id} and /games/{id}/{resource}."""
+        size = self.server.payload_size
+        parts = path.strip('/').split('/')
+
+        if parts == ['games']:
+            search = (query.get('search') or [''])[0]
+            page_size = int((query.get('page_size') or ['20'])[0])
+            game_id = payloads.title_id(search)
+            results = [payloads.rawg_search_result(game_id + i, search if i == 0 else f"{search} {i + 1}")
+                       for i in range(page_size)]
+            self._send_json(200, {'count': page_size, 'next': None, 'previous': None, 'results': results})
+
+        elif len(parts) == 2 and parts[0] == 'games' and parts[1].isdigit():
+            game_id = int(parts[1])
+            self._send_json(200, payloads.rawg_game(game_id, payloads.game_title(game_id), size))
+
+        elif len(parts) == 3 and parts[0] == 'games' and parts[1].isdigit():
+            results = payloads.rawg_sub_resource(int(parts[1]), parts[2], size)
+            self._send_json(200, {'count': len(results), 'next': None, 'previous': None, 'results': results})
+
+        else:
+            self._send_json(404, {'detail': 'Not found.'})
+
+    def _igdb(self, endpoint: str, body: str):
+        """IGDB: games search / details / related games, and reference endpoints."""
+        if self.headers.get('Authorization') != 'Bearer benchmark-token':
+            self._send_json(401, {'message': 'Authorization Failure'})
+            return
+
+        search = _SEARCH_PATTERN.search(body)
+        single = _ID_PATTERN.search(body)
+        id_list = _ID_LIST_PATTERN.search(body)
+
+        if endpoint == 'games':
+            if search:
+                name = search.group(1).replace('\\"', '"')
+                rows = payloads.igdb_search_results(payloads.title_id(name), name)
+            elif single:
+                game_id = int(single.group(1))
+                rows = [payloads.igdb_game(game_id, payloads.game_title(game_id), self.server.payload_size)]
+            elif id_list:
+                rows = [payloads.igdb_minimal_game(int(i)) for i in id_list.group(1).split(',')]
+            else:
+                rows = []
+        elif id_list:
+            rows = [payloads.igdb_reference_entity(endpoint, int(i)) for i in id_list.group(1).split(',')
+                    if int(i) <= payloads.REFERENCE_COUNT]
+        else:
+            # Bulk load of a reference table: everything on the first page
+            offset = _OFFSET_PATTERN.search(body)
+            rows = [] if offset and int(offset.group(1)) > 0 else \
+                [payloads.igdb_reference_entity(endpoint, i) for i in range(1, payloads.REFERENCE_COUNT + 1)]
+
+        self._send_json(200, rows)
+
+
+def start_server(port: int = 0, **options) -> FakeUpstream:
+    """Start a fake upstream server in a background thread (see FakeUpstream for options)."""
+    server = FakeUpstream(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True, name='fake-upstream').start()
+    return server
+
+
+def base_urls(port: int) -> Dict[str, str]:
+    """Environment variables pointing the sync code at a fake upstream server."""
+    root = f"http://127.0.0.1:{port}"
+    return {
+        'RAWG_BASE_URL': root + RAWG_PREFIX,
+        'IGDB_BASE_URL': root + IGDB_PREFIX,
+        'TWITCH_AUTH_URL': root + TWITCH_PREFIX
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake RAWG/IGDB server for benchmarks")
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=10)
+    parser.add_argument('--rawg-rate', type=float, default=0, help="RAWG requests/s before 429s (0 = unlimited)")
+    parser.add_argument('--igdb-rate', type=float, default=4, help="IGDB requests/s before 429s (0 = unlimited)")
+    parser.add_argument('--payload', choices=sorted(payloads.PAYLOAD_SIZES), default='medium')
+    args = parser.parse_args()
+
+    server = FakeUpstream(('127.0.0.1', args.port), latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                          rawg_rate=args.rawg_rate, igdb_rate=args.igdb_rate, payload_size=args.payload)
+
+    # The benchmark runner reads the port from this line
+    print(f"READY {server.server_address[1]}", flush=True)
+    for name, value in base_urls(server.server_address[1]).items():
+        print(f"  {name}={value}", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
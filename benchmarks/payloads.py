@@ -0,0 +1,224 @@
+"""
+Generated RAWG / IGDB payloads
+Deterministic fake API responses shared by the fake upstream server and the
+synthetic libraries, so both look like what the real APIs return
+"""
+
+import random
+import zlib
+from typing import Dict, List
+
+# Payload size -> list lengths and text size of a generated game
+PAYLOAD_SIZES = {
+    'small': {'screenshots': 3, 'achievements': 5, 'trailers': 1, 'stores': 2, 'tags': 6, 'paragraphs': 2},
+    'medium': {'screenshots': 10, 'achievements': 40, 'trailers': 3, 'stores': 4, 'tags': 15, 'paragraphs': 6},
+    'large': {'screenshots': 40, 'achievements': 400, 'trailers': 8, 'stores': 8, 'tags': 40, 'paragraphs': 20}
+}
+
+GENRES = ['Action', 'Adventure', 'RPG', 'Strategy', 'Shooter', 'Puzzle', 'Racing', 'Sports',
+          'Simulation', 'Platformer', 'Indie', 'Casual', 'Fighting', 'Arcade']
+TAGS = ['Singleplayer', 'Multiplayer', 'Local Co-Op', 'Online Co-Op', 'Split Screen', 'Co-op',
+        'Atmospheric', 'Open World', 'Story Rich', 'Great Soundtrack', 'Difficult', 'Pixel Graphics',
+        'Sandbox', 'Exploration', 'Fantasy', 'Sci-fi', 'Horror', 'Funny', 'Retro', 'Stealth']
+PLATFORMS = ['PC', 'PlayStation 5', 'Xbox Series S/X', 'Nintendo Switch', 'macOS', 'Linux']
+STORES = ['Steam', 'Epic Games', 'GOG', 'PlayStation Store', 'Xbox Store', 'Nintendo Store']
+
+_ADJECTIVES = ['Dark', 'Lost', 'Eternal', 'Broken', 'Silent', 'Crimson', 'Hidden', 'Final', 'Iron',
+               'Frozen', 'Wild', 'Ancient', 'Neon', 'Hollow', 'Golden', 'Last']
+_NOUNS = ['Kingdom', 'Legends', 'Horizon', 'Echoes', 'Frontier', 'Empire', 'Odyssey', 'Chronicles',
+          'Dungeon', 'Galaxy', 'Tactics', 'Island', 'Station', 'Souls', 'Racer', 'Arena']
+_LOREM = ("Explore a vast world full of secrets, forge alliances and battle ancient foes "
+          "across hand-crafted levels with dozens of hours of content. ")
+
+# Number of entities per IGDB reference endpoint
+REFERENCE_COUNT = 30
+
+
+def game_title(number: int) -> str:
+    """Unique, readable title of a synthetic game."""
+    adjective = _ADJECTIVES[number % len(_ADJECTIVES)]
+    noun = _NOUNS[(number // len(_ADJECTIVES)) % len(_NOUNS)]
+    return f"{adjective} {noun} {number}"
+
+
+def title_id(title: str) -> int:
+    """Stable fake API ID of a game title (the same title always finds the same game)."""
+    return zlib.crc32(title.lower().encode('utf-8')) % 10_000_000 + 1
+
+
+def _named(rng: random.Random, names: List[str], count: int) -> List[Dict]:
+    picks = rng.sample(names, min(count, len(names)))
+    return [{'id': names.index(name) + 1, 'name': name, 'slug': name.lower().replace(' ', '-')} for name in picks]
+
+
+def rawg_search_result(game_id: int, name: str) -> Dict:
+    """Entry of a RAWG /games search."""
+    rng = random.Random(game_id)
+    return {
+        'id': game_id,
+        'name': name,
+        'slug': name.lower().replace(' ', '-'),
+        'released': f"{rng.randint(1995, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'background_image': f"https://media.rawg.io/media/games/{game_id % 1000:03d}/{game_id}.jpg",
+        'rating': round(rng.uniform(1, 5), 2),
+        'metacritic': rng.randint(40, 98),
+        'genres': _named(rng, GENRES, 2),
+        'platforms': [{'platform': p} for p in _named(rng, PLATFORMS, 3)]
+    }
+
+
+def rawg_game(game_id: int, name: str, size: str = 'medium') -> Dict:
+    """RAWG /games/{id} details."""
+    rng = random.Random(game_id)
+    sizes = PAYLOAD_SIZES[size]
+    game = rawg_search_result(game_id, name)
+    description = _LOREM * sizes['paragraphs']
+
+    game.update({
+        'name_original': name,
+        'description': f"<p>{description}</p>",
+        'description_raw': description,
+        'tba': False,
+        'updated': '2024-01-01T00:00:00',
+        'rating_top': 5,
+        'ratings': [{'id': i, 'title': t, 'count': rng.randint(0, 5000), 'percent': 25.0}
+                    for i, t in enumerate(['exceptional', 'recommended', 'meh', 'skip'], start=1)],
+        'ratings_count': rng.randint(0, 20000),
+        'reviews_count': rng.randint(0, 20000),
+        'reviews_text_count': rng.randint(0, 500),
+        'metacritic_url': '',
+        'metacritic_platforms': [],
+        'tags': _named(rng, TAGS, sizes['tags']),
+        'playtime': rng.randint(0, 120),
+        'added': rng.randint(0, 50000),
+        'added_by_status': {'owned': rng.randint(0, 20000), 'playing': rng.randint(0, 2000)},
+        'suggestions_count': rng.randint(0, 500),
+        'achievements_count': sizes['achievements'],
+        'screenshots_count': sizes['screenshots'],
+        'movies_count': sizes['trailers'],
+        'creators_count': 0,
+        'additions_count': 0,
+        'game_series_count': 0,
+        'parents_count': 0,
+        'background_image_additional': game['background_image'].replace('.jpg', '-2.jpg'),
+        'parent_platforms': game['platforms'][:2],
+        'esrb_rating': {'id': 4, 'name': 'Mature', 'slug': 'mature'},
+        'website': f"https://example.com/games/{game_id}",
+        'developers': [{'id': game_id % 500, 'name': f"Studio {game_id % 500}", 'slug': f"studio-{game_id % 500}"}],
+        'publishers': [{'id': game_id % 200, 'name': f"Publisher {game_id % 200}", 'slug': f"publisher-{game_id % 200}"}],
+        'creators': [],
+        'reddit_url': '',
+        'reddit_name': '',
+        'reddit_description': '',
+        'reddit_logo': '',
+        'reddit_count': 0,
+        'twitch_count': rng.randint(0, 100),
+        'youtube_count': rng.randint(0, 1000),
+        'alternative_names': [],
+        'reactions': {}
+    })
+    return game
+
+
+def rawg_sub_resource(game_id: int, resource: str, size: str = 'medium') -> List[Dict]:
+    """Results of a RAWG /games/{id}/{screenshots,achievements,movies,stores} page."""
+    sizes = PAYLOAD_SIZES[size]
+
+    if resource == 'screenshots':
+        return [{'id': game_id * 100 + i, 'image': f"https://media.rawg.io/media/screenshots/{game_id}-{i}.jpg",
+                 'width': 1920, 'height': 1080} for i in range(sizes['screenshots'])]
+    if resource == 'achievements':
+        return [{'id': game_id * 1000 + i, 'name': f"Achievement {i}",
+                 'description': f"Complete challenge number {i} without dying",
+                 'image': f"https://media.rawg.io/media/achievements/{game_id}-{i}.jpg",
+                 'percent': f"{(i * 7) % 100}.00"} for i in range(sizes['achievements'])]
+    if resource == 'movies':
+        return [{'id': game_id * 10 + i, 'name': f"Trailer {i}",
+                 'preview': f"https://media.rawg.io/media/movies/{game_id}-{i}.jpg",
+                 'data': {'480': f"https://steamcdn.example/{game_id}-{i}-480.mp4",
+                          'max': f"https://steamcdn.example/{game_id}-{i}-max.mp4"}}
+                for i in range(sizes['trailers'])]
+    if resource == 'stores':
+        return [{'id': i, 'game_id': game_id, 'store_id': i + 1, 'url': f"https://store.example/{i}/{game_id}",
+                 'store': {'id': i + 1, 'name': STORES[i % len(STORES)]}} for i in range(sizes['stores'])]
+    return []
+
+
+def igdb_search_results(game_id: int, name: str) -> List[Dict]:
+    """Results of an IGDB games search (main game first, like IGDB usually answers)."""
+    return [
+        {'id': game_id, 'name': name, 'category': 0},
+        {'id': game_id + 1, 'name': f"{name}: Deluxe Edition", 'category': 3, 'version_parent': game_id}
+    ]
+
+
+def igdb_game(game_id: int, name: str, size: str = 'medium') -> Dict:
+    """IGDB /games details with reference fields as IDs (as requested by the field profiles)."""
+    rng = random.Random(game_id)
+    sizes = PAYLOAD_SIZES[size]
+
+    def ids(count: int) -> List[int]:
+        return rng.sample(range(1, REFERENCE_COUNT + 1), min(count, REFERENCE_COUNT))
+
+    return {
+        'id': game_id,
+        'name': name,
+        'slug': name.lower().replace(' ', '-'),
+        'first_release_date': rng.randint(800_000_000, 1_700_000_000),
+        'summary': _LOREM * sizes['paragraphs'],
+        'storyline': _LOREM,
+        'url': f"https://www.igdb.com/games/{game_id}",
+        'created_at': 1_500_000_000,
+        'updated_at': 1_700_000_000,
+        'rating': round(rng.uniform(40, 95), 2),
+        'rating_count': rng.randint(0, 2000),
+        'total_rating': round(rng.uniform(40, 95), 2),
+        'total_rating_count': rng.randint(0, 2000),
+        'aggregated_rating': round(rng.uniform(40, 95), 2),
+        'aggregated_rating_count': rng.randint(0, 50),
+        'hypes': rng.randint(0, 100),
+        'follows': rng.randint(0, 1000),
+        'category': 0,
+        'status': 0,
+        'cover': {'id': game_id, 'image_id': f"co{game_id:x}"},
+        'artworks': [{'id': game_id * 10 + i, 'image_id': f"ar{game_id:x}{i}"} for i in range(sizes['trailers'])],
+        'screenshots': [{'id': game_id * 100 + i, 'image_id': f"sc{game_id:x}{i}"}
+                        for i in range(sizes['screenshots'])],
+        'videos': [{'id': game_id * 10 + i, 'name': 'Trailer', 'video_id': f"yt{game_id}{i}"}
+                   for i in range(sizes['trailers'])],
+        'genres': ids(2),
+        'themes': ids(2),
+        'game_modes': ids(2),
+        'player_perspectives': ids(1),
+        'platforms': ids(3),
+        'game_engines': ids(1),
+        'keywords': [{'id': i, 'name': f"keyword {i}"} for i in range(sizes['tags'])],
+        'alternative_names': [{'id': game_id, 'name': name.upper()}],
+        'multiplayer_modes': [{'id': game_id, 'onlinemax': rng.choice([0, 4, 16, 64]),
+                               'offlinemax': rng.choice([0, 2, 4]), 'splitscreen': rng.random() < 0.3}],
+        'involved_companies': [{'id': game_id, 'company': {'id': game_id % 500, 'name': f"Studio {game_id % 500}"},
+                                'developer': True, 'publisher': False}],
+        'age_ratings': [{'id': game_id, 'category': 1, 'rating': 11}],
+        'release_dates': [{'id': game_id, 'date': 1_600_000_000, 'human': 'Sep 13, 2020', 'region': 8,
+                           'platform': {'id': 6, 'name': 'PC (Microsoft Windows)'}}],
+        'similar_games': [rng.randint(1, 10_000_000) for _ in range(min(sizes['tags'], 10))],
+        'dlcs': [rng.randint(1, 10_000_000) for _ in range(sizes['trailers'])],
+        'franchise': {'id': game_id % 100, 'name': f"Franchise {game_id % 100}"},
+        'websites': [{'id': game_id, 'category': 1, 'url': f"https://example.com/games/{game_id}"}],
+        'external_games': [{'id': game_id, 'category': 1, 'uid': str(game_id),
+                            'url': f"https://store.example/{game_id}"}],
+        'language_supports': [{'id': i, 'language': {'name': lang}, 'language_support_type': {'name': 'Audio'}}
+                              for i, lang in enumerate(['English', 'French', 'German'][:sizes['trailers'] + 1])]
+    }
+
+
+def igdb_minimal_game(game_id: int) -> Dict:
+    """Related game as cached in igdb_games ('minimal' field profile)."""
+    return {'id': game_id, 'name': game_title(game_id), 'slug': f"game-{game_id}",
+            'first_release_date': 1_600_000_000, 'cover': {'id': game_id, 'image_id': f"co{game_id:x}"}}
+
+
+def igdb_reference_entity(endpoint: str, entity_id: int) -> Dict:
+    """Genre, platform, theme... entity."""
+    name = f"{endpoint.replace('_', ' ').title()} {entity_id}"
+    return {'id': entity_id, 'name': name, 'slug': name.lower().replace(' ', '-'), 'updated_at': 1_700_000_000}
@@ -0,0 +1,370 @@
+"""
+Benchmark runner
+Runs the scenarios in scenarios.py on synthetic libraries (1k/10k/100k games by default)
+against a fake RAWG/IGDB server, reports throughput, p50/p99 latency and peak RSS,
+and compares them with a stored baseline.
+
+    python benchmarks/run.py                                  # Everything, compared with baseline.json
+    python benchmarks/run.py --sizes 1000 --scenarios api_games,api_stats
+    python benchmarks/run.py --save-baseline                  # Record this machine's baseline
+
+Exits with status 1 when a result is worse than the baseline by more than --tolerance.
+Baselines are machine specific: record one before comparing on a new machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional, Tuple
+from urllib.request import urlopen
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, "baseline.json")
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "mygaminglib-benchmarks")
+DATABASE_FILE = "epic_games_library.db"
+
+# Metric -> True if higher is better
+METRICS = {'throughput': True, 'p50_ms': False, 'p99_ms': False, 'peak_rss_mb': False}
+MIN_LATENCY_CHANGE_MS = 5  # Smaller latency changes are noise, whatever the percentage
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ===== WORKER (one scenario per process) =====
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Percentile with linear interpolation between the closest ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def upstream_stats(port: Optional[int]) -> Dict:
+    """Request counters of the fake upstream server."""
+    if not port:
+        return {}
+    with urlopen(f"http://127.0.0.1:{port}/__stats", timeout=5) as response:
+        return json.load(response)
+
+
+def run_worker(args):
+    """Run one scenario in this process and write its summary to args.output."""
+    from scenarios import SCENARIOS
+
+    options = {'sync_games': args.sync_games, 'workers': args.workers}
+    port = int(os.environ['BENCHMARK_UPSTREAM_PORT']) if os.getenv('BENCHMARK_UPSTREAM_PORT') else None
+
+    before = upstream_stats(port)
+    # The code under test logs every step; keep it out of the report
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        measurement = SCENARIOS[args.worker](args.size, options)
+    after = upstream_stats(port)
+
+    latencies = measurement['latencies']
+    summary = {
+        'operations': measurement['operations'],
+        'throughput': measurement['operations'] / measurement['elapsed'] if measurement['elapsed'] else 0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_rss_mb': peak_rss_mb()
+    }
+    if 'failed' in measurement:
+        summary['failed'] = measurement['failed']
+    if before:
+        summary['upstream_requests'] = after['requests'] - before['requests']
+        summary['rate_limited'] = after['rate_limited'] - before['rate_limited']
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({name: round(value, 3) if isinstance(value, float) else value
+                   for name, value in summary.items()}, f)
+
+
+def run_build_library(args):
+    """Create a synthetic library in DATA_DIR."""
+    from synthetic import build_library
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        count = build_library(args.size, args.library_payload)
+    print(f"  built library of {count} games")
+
+
+# ===== RUNNER =====
+
+def start_upstream(args) -> Tuple[subprocess.Popen, int]:
+    """Start the fake RAWG/IGDB server and return (process, port)."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARK_DIR, "fake_upstream.py"),
+         '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms),
+         '--rawg-rate', str(args.rawg_rate), '--igdb-rate', str(args.igdb_rate), '--payload', args.payload],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    line = process.stdout.readline()
+    if not line.startswith('READY '):
+        process.kill()
+        raise RuntimeError("Fake upstream server did not start")
+    return process, int(line.split()[1])
+
+
+def worker_env(data_dir: str, port: Optional[int]) -> Dict[str, str]:
+    """Environment of a worker: its own data directory, fake credentials, no real network."""
+    env = dict(os.environ)
+    env.update({
+        'DATA_DIR': data_dir,
+        'RAWG_API_KEY': 'benchmark',
+        'IGDB_CLIENT_ID': 'benchmark',
+        'IGDB_CLIENT_SECRET': 'benchmark',
+        # The fake server enforces the rate limits, so the client-side pauses are left out
+        'RAWG_REQUEST_DELAY': '0',
+        'IGDB_REQUEST_DELAY': '0',
+        'IGDB_FAILED_REQUEST_DELAY': '0',
+        'IMAGE_CACHE_PREFETCH': '0'
+    })
+    if port:
+        from fake_upstream import base_urls
+        env.update(base_urls(port))
+        env['BENCHMARK_UPSTREAM_PORT'] = str(port)
+    return env
+
+
+def ensure_library(args, size: int) -> str:
+    """Get the cached synthetic library of a size, building it on first use."""
+    library_dir = os.path.join(args.cache_dir, f"library-{size}-{args.library_payload}")
+    database = os.path.join(library_dir, DATABASE_FILE)
+
+    if not os.path.exists(database):
+        print(f"Building synthetic library of {size} games...")
+        build_dir = library_dir + '.building'
+        shutil.rmtree(build_dir, ignore_errors=True)
+        subprocess.run([sys.executable, __file__, '--build-library', '--size', str(size),
+                        '--library-payload', args.library_payload],
+                       env=worker_env(build_dir, None), check=True)
+        shutil.rmtree(library_dir, ignore_errors=True)
+        os.replace(build_dir, library_dir)
+
+    return database
+
+
+def run_scenario(args, scenario: str, size: int, library: str, port: Optional[int]) -> Optional[Dict]:
+    """Run a scenario in a fresh process on a copy of the library."""
+    with tempfile.TemporaryDirectory(prefix='bench-') as data_dir:
+        shutil.copy(library, os.path.join(data_dir, DATABASE_FILE))
+        output = os.path.join(data_dir, 'result.json')
+
+        command = [sys.executable, __file__, '--worker', scenario, '--size', str(size),
+                   '--sync-games', str(args.sync_games), '--output', output]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+
+        completed = subprocess.run(command, env=worker_env(data_dir, port), cwd=PROJECT_ROOT)
+        if completed.returncode != 0 or not os.path.exists(output):
+            return None
+
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def environment() -> Dict:
+    """Describe the machine results were measured on."""
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """List the metrics of a result that regressed against its baseline."""
+    regressions = []
+
+    for metric, higher_is_better in METRICS.items():
+        current, previous = result.get(metric), baseline.get(metric)
+        if current is None or not previous:
+            continue
+
+        change = (current - previous) / previous
+        worse = -change if higher_is_better else change
+        if metric.endswith('_ms') and abs(current - previous) < MIN_LATENCY_CHANGE_MS:
+            continue
+        if worse > tolerance:
+            regressions.append(f"{metric} {change:+.0%}")
+
+    return regressions
+
+
+def format_change(result: Dict, baseline: Optional[Dict], metric: str) -> str:
+    """Format a metric with its change from the baseline."""
+    value = result.get(metric)
+    if value is None:
+        return '-'
+    text = f"{value:.1f}" if value >= 10 else f"{value:.2f}"
+    if baseline and baseline.get(metric):
+        text += f" ({(value - baseline[metric]) / baseline[metric]:+.0%})"
+    return text
+
+
+def print_report(results: Dict[str, Dict], baseline: Dict[str, Dict]):
+    """Print a table of results, with changes from the baseline in parentheses."""
+    headers = ['scenario', 'ops', 'ops/s', 'p50 ms', 'p99 ms', 'peak RSS MB', 'notes']
+    rows = []
+
+    for key, result in results.items():
+        base = baseline.get(key)
+        notes = []
+        if result.get('failed'):
+            notes.append(f"{result['failed']} failed")
+        if result.get('rate_limited'):
+            notes.append(f"{result['rate_limited']}/{result['upstream_requests']} requests rate limited")
+        rows.append([key, str(result['operations'])] +
+                    [format_change(result, base, metric) for metric in ('throughput', 'p50_ms', 'p99_ms', 'peak_rss_mb')] +
+                    [', '.join(notes)])
+
+    widths = [max(len(str(row[i])) for row in rows + [headers]) for i in range(len(headers))]
+    print()
+    print('  '.join(h.ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(cell).ljust(w) for cell, w in zip(row, widths)))
+    print()
+
+
+def main(args):
+    from scenarios import SCENARIOS, UPSTREAM_SCENARIOS
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    scenarios = args.scenarios.split(',') if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+
+    baseline_data = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline_data = json.load(f)
+        if baseline_data.get('environment') != environment():
+            print(f"[WARN] Baseline was recorded on another machine or Python "
+                  f"({baseline_data.get('environment')}); differences may not be regressions")
+    baseline = baseline_data.get('results', {})
+
+    upstream, port = (None, None)
+    if UPSTREAM_SCENARIOS & set(scenarios):
+        upstream, port = start_upstream(args)
+
+    results = {}
+    failures = []
+    try:
+        for size in sizes:
+            library = ensure_library(args, size)
+            for scenario in scenarios:
+                key = f"{scenario}@{size}"
+                print(f"Running {key}...", flush=True)
+                started = time.perf_counter()
+                result = run_scenario(args, scenario, size, library, port)
+                if result is None:
+                    failures.append(key)
+                    print(f"  ✗ {key} failed")
+                    continue
+                results[key] = result
+                print(f"  done in {time.perf_counter() - started:.1f}s")
+    finally:
+        if upstream:
+            upstream.terminate()
+
+    print_report(results, baseline)
+
+    regressions = {key: compare(result, baseline[key], args.tolerance)
+                   for key, result in results.items() if key in baseline}
+    regressions = {key: metrics for key, metrics in regressions.items() if metrics}
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'options': {
+                'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms, 'rawg_rate': args.rawg_rate,
+                'igdb_rate': args.igdb_rate, 'payload': args.payload, 'library_payload': args.library_payload,
+                'sync_games': args.sync_games, 'workers': args.workers
+            }, 'results': baseline}, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"Regressions (worse than baseline by more than {args.tolerance:.0%}):")
+        for key, metrics in regressions.items():
+            print(f"  ✗ {key}: {', '.join(metrics)}")
+    elif baseline:
+        print("No regressions against the baseline.")
+
+    if failures:
+        print(f"Failed scenarios: {', '.join(failures)}")
+
+    if failures or (regressions and not args.save_baseline):
+        sys.exit(1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the sync, database and API hot paths")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated library sizes")
+    parser.add_argument('--scenarios', default='', help="Comma-separated scenarios (default: all)")
+    parser.add_argument('--sync-games', type=int, default=50, help="Unsynced games the sync scenarios work through")
+    parser.add_argument('--workers', type=int, default=0, help="Sync queue workers (default: the app's setting)")
+    parser.add_argument('--latency-ms', type=float, default=50, help="Fake upstream latency per request")
+    parser.add_argument('--jitter-ms', type=float, default=10, help="Random extra latency per request")
+    parser.add_argument('--rawg-rate', type=float, default=0, help="Fake RAWG requests/s limit (0 = unlimited)")
+    parser.add_argument('--igdb-rate', type=float, default=4, help="Fake IGDB requests/s limit (0 = unlimited)")
+    parser.add_argument('--payload', choices=['small', 'medium', 'large'], default='medium',
+                        help="Size of fake upstream responses")
+    parser.add_argument('--library-payload', choices=['small', 'medium', 'large'], default='small',
+                        help="Size of each synthetic library game's stored data")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative slowdown before a result counts as a regression")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Where synthetic libraries are kept between runs")
+
+    # Internal: run a single scenario / build a library in a child process
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--build-library', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+
+    if arguments.worker:
+        try:
+            run_worker(arguments)
+        except Exception:
+            traceback.print_exc()
+            sys.exit(1)
+    elif arguments.build_library:
+        run_build_library(arguments)
+    else:
+        main(arguments)
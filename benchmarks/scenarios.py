@@ -0,0 +1,221 @@
+"""
+Benchmark scenarios
+Each scenario runs in its own process against a copy of a synthetic library
+(see run.py) and returns the latency of every operation it timed
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+from urllib.request import Request, urlopen
+
+import payloads
+import synthetic
+
+ADD_GAME_COUNT = 500  # Games added one by one by the add_game scenario
+
+CONCURRENT_SEARCHES = 64  # Add-game searches in flight at once in the search_concurrency scenarios
+SEARCH_ROUNDS = 4         # Searches sent per concurrent client
+SERVER_THREADS = 4        # Request threads of the gthread (WSGI) server, as in gunicorn.conf.py
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _repeats(size: int, budget: int = 100_000, most: int = 50) -> int:
+    """How many times to repeat a whole-library operation (fewer on big libraries)."""
+    return max(3, min(most, budget // max(size, 1)))
+
+
+def _measure(call: Callable[[], None], repeat: int) -> Dict:
+    """Time `repeat` calls after one untimed warm-up call (connection setup, imports, caches)."""
+    call()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    return {'latencies': latencies, 'operations': repeat, 'elapsed': time.perf_counter() - started}
+
+
+def _get(client, url: str) -> Callable[[], None]:
+    """Build a call requesting a URL from the Flask test client."""
+    def call():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        response.get_data()
+    return call
+
+
+def get_all_games(size: int, options: Dict) -> Dict:
+    """Read and decode the whole library."""
+    from src.database import get_all_games as read_all
+    return _measure(read_all, _repeats(size))
+
+
+def api_games(size: int, options: Dict) -> Dict:
+    """GET /api/games without a limit (the whole library as JSON)."""
+    from app import app
+    return _measure(_get(app.test_client(), '/api/games'), _repeats(size))
+
+
+def api_games_page(size: int, options: Dict) -> Dict:
+    """GET /api/games first page, as the web UI loads it."""
+    from app import app
+    return _measure(_get(app.test_client(), '/api/games?limit=200&offset=0&sort=rating'), 100)
+
+
+def api_stats(size: int, options: Dict) -> Dict:
+    """GET /api/stats."""
+    from app import app
+    return _measure(_get(app.test_client(), '/api/stats'), 100)
+
+
+def add_game(size: int, options: Dict) -> Dict:
+    """Add new games one at a time (as the manual add-game route does)."""
+    from src.database import add_game as add, get_game_count
+
+    get_game_count()  # Set up the database outside the timed calls
+
+    titles = iter([payloads.game_title(size + i) for i in range(ADD_GAME_COUNT + 1)])
+    return _measure(lambda: add(next(titles)), ADD_GAME_COUNT)
+
+
+def _timed_sync(syncer_class, run: Callable[[], Dict]) -> Dict:
+    """Run a library sync, timing each game's sync_game() call."""
+    latencies: List[float] = []
+    sync_game = syncer_class.sync_game
+
+    def timed_sync_game(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return sync_game(self, *args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    syncer_class.sync_game = timed_sync_game
+    try:
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+    finally:
+        syncer_class.sync_game = sync_game
+
+    if not result.get('success'):
+        raise RuntimeError(result.get('error') or 'Sync failed')
+
+    return {'latencies': latencies, 'operations': len(latencies), 'elapsed': elapsed,
+            'failed': result.get('failed_count', 0)}
+
+
+def sync_rawg(size: int, options: Dict) -> Dict:
+    """sync_with_rawg() over the unsynced games, against the fake RAWG server."""
+    from src.sync.rawg_sync import RAWGSyncer, sync_with_rawg
+
+    synthetic.add_unsynced_games(options['sync_games'], size)
+    workers = options.get('workers')
+    return _timed_sync(RAWGSyncer, lambda: sync_with_rawg(**({'workers': workers} if workers else {})))
+
+
+def sync_igdb(size: int, options: Dict) -> Dict:
+    """sync_all_games_with_igdb() over the unsynced games, against the fake IGDB server."""
+    from src.sync.igdb_sync import IGDBSyncer, sync_all_games_with_igdb
+
+    synthetic.add_unsynced_games(options['sync_games'], size)
+    workers = options.get('workers')
+    return _timed_sync(IGDBSyncer, lambda: sync_all_games_with_igdb(**({'workers': workers} if workers else {})))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(arguments: List[str]) -> Tuple[subprocess.Popen, str]:
+    """Start one gunicorn worker serving the app and return (process, base URL) once it answers."""
+    port = _free_port()
+    env = dict(os.environ, WEB_WORKERS='1', WEB_THREADS=str(SERVER_THREADS))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f"127.0.0.1:{port}"] + arguments,
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + 30
+    while True:
+        try:
+            with urlopen(f"{base_url}/api/stats", timeout=5) as response:
+                response.read()
+            return process, base_url
+        except OSError:
+            if process.poll() is not None or time.time() > deadline:
+                process.kill()
+                raise RuntimeError("Server did not start (is gunicorn installed?)")
+            time.sleep(0.2)
+
+
+def _search(base_url: str) -> float:
+    """Send an add-game search nothing has cached yet and return its latency."""
+    request = Request(f"{base_url}/api/search-game", method='POST',
+                      data=json.dumps({'query': uuid.uuid4().hex[:12]}).encode('utf-8'),
+                      headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urlopen(request, timeout=60) as response:
+        if response.status != 200:
+            raise RuntimeError(f"Search returned {response.status}")
+        response.read()
+    return time.perf_counter() - start
+
+
+def _concurrent_searches(arguments: List[str]) -> Dict:
+    """Send CONCURRENT_SEARCHES searches at a time to a server waiting on the fake RAWG server."""
+    process, base_url = _start_server(arguments)
+    try:
+        _search(base_url)  # Warm-up (imports, database setup)
+
+        count = CONCURRENT_SEARCHES * SEARCH_ROUNDS
+        with ThreadPoolExecutor(max_workers=CONCURRENT_SEARCHES) as pool:
+            started = time.perf_counter()
+            latencies = list(pool.map(lambda _: _search(base_url), range(count)))
+            elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {'latencies': latencies, 'operations': count, 'elapsed': elapsed}
+
+
+def search_concurrency_wsgi(size: int, options: Dict) -> Dict:
+    """Concurrent add-game searches on one gthread worker (wsgi:app): each waits on RAWG in a thread."""
+    return _concurrent_searches(['wsgi:app'])
+
+
+def search_concurrency_asgi(size: int, options: Dict) -> Dict:
+    """Concurrent add-game searches on one uvicorn worker (asgi:app): waits share the event loop."""
+    return _concurrent_searches(['-k', 'uvicorn.workers.UvicornWorker', 'asgi:app'])
+
+
+# Name -> scenario function(size, options)
+SCENARIOS = {
+    'get_all_games': get_all_games,
+    'api_games': api_games,
+    'api_games_page': api_games_page,
+    'api_stats': api_stats,
+    'add_game': add_game,
+    'sync_rawg': sync_rawg,
+    'sync_igdb': sync_igdb,
+    'search_concurrency_wsgi': search_concurrency_wsgi,
+    'search_concurrency_asgi': search_concurrency_asgi
+}
+
+# Scenarios that call the fake upstream server
+UPSTREAM_SCENARIOS = {'sync_rawg', 'sync_igdb', 'search_concurrency_wsgi', 'search_concurrency_asgi'}
@@ -0,0 +1,86 @@
+"""
+Synthetic libraries for benchmarks
+Fills the database pointed to by DATA_DIR with generated games, stored exactly
+as a RAWG sync would store them
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List
+
+import payloads
+
+BATCH_SIZE = 1000
+
+
+def library_games(count: int, first_number: int = 0, payload_size: str = 'small') -> List[Dict]:
+    """
+    Generate the rows of synced library games.
+
+    Args:
+        count: Number of games
+        first_number: Number of the first game (titles are unique per number)
+        payload_size: Size of each game's RAWG data (see payloads.PAYLOAD_SIZES)
+
+    Returns:
+        list: Column -> value dicts (JSON fields already encoded)
+    """
+    from src.database import normalize_title
+    from src.sync.rawg_sync import RAWGSyncer
+
+    syncer = RAWGSyncer(api_key='benchmark')
+    now = datetime.now()
+    rows = []
+
+    for number in range(first_number, first_number + count):
+        title = payloads.game_title(number)
+        rawg_id = payloads.title_id(title)
+        metadata = syncer.extract_all_metadata(
+            payloads.rawg_game(rawg_id, title, payload_size),
+            *(payloads.rawg_sub_resource(rawg_id, resource, payload_size)
+              for resource in ('screenshots', 'achievements', 'movies', 'stores'))
+        )
+
+        row = {'title': title, 'title_normalized': normalize_title(title), 'epic_id': f"epic-{number}",
+               'rawg__synced': 1, 'rawg__synced_at': now, 'igdb__synced': 1, 'igdb__id': rawg_id, 'igdb__name': title,
+               'igdb__cover': f"https://images.igdb.com/igdb/image/upload/t_cover_big/co{rawg_id:x}.jpg",
+               'igdb__cover_image_id': f"co{rawg_id:x}"}
+        for key, value in metadata.items():
+            row[key] = json.dumps(value) if isinstance(value, (list, dict)) else value
+        rows.append(row)
+
+    return rows
+
+
+def build_library(size: int, payload_size: str = 'small') -> int:
+    """
+    Create a library of `size` synced games in the current database.
+
+    Returns:
+        int: Number of games in the database afterwards
+    """
+    from src.database import get_db_connection, get_game_count
+
+    conn = get_db_connection()
+
+    for start in range(0, size, BATCH_SIZE):
+        rows = library_games(min(BATCH_SIZE, size - start), start, payload_size)
+        columns = list(rows[0])
+        conn.executemany(
+            f"INSERT INTO games ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [[row.get(column) for column in columns] for row in rows]
+        )
+        conn.commit()
+
+    conn.execute("ANALYZE")
+    conn.close()
+    return get_game_count()
+
+
+def add_unsynced_games(count: int, first_number: int) -> List[str]:
+    """Add games that still need a RAWG and IGDB sync (what the sync scenarios work through)."""
+    from src.database import add_games
+
+    titles = [payloads.game_title(first_number + i) for i in range(count)]
+    add_games({title: None for title in titles})
+    return titles
@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the production serving mode:
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app   (async API routes)
+    gunicorn -c gunicorn.conf.py wsgi:app                                    (threaded WSGI)
+Values can be overridden with the environment variables below
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:5000")
+
+# Read-heavy API: one process per core, a few threads each for the long-polling task status calls
+workers = int(os.getenv("WEB_WORKERS", str(min(multiprocessing.cpu_count(), 8))))
+worker_class = "gthread"  # Replaced by -k uvicorn.workers.UvicornWorker for asgi:app
+threads = int(os.getenv("WEB_THREADS", "4"))
+
+# Syncs run in background threads, so requests themselves stay short
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
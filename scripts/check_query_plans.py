@@ -0,0 +1,31 @@
+"""
+Check that the hot library queries are answered from indexes.
+Exits with status 1 if any of them falls back to a full scan of the games table.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import HOT_QUERIES, check_query_plans
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Query Plan Check")
+    print("=" * 60)
+
+    offenders = check_query_plans()
+
+    for name in HOT_QUERIES:
+        if name in offenders:
+            print(f"✗ {name}: {offenders[name]}")
+        else:
+            print(f"✓ {name}")
+
+    print("=" * 60)
+
+    if offenders:
+        print(f"\n{len(offenders)} hot queries scan the games table. Add an index to GAMES_INDEXES in src/migrations.py")
+        sys.exit(1)
+
+    print("\nAll hot queries use indexes.")
@@ -6,223 +6,136 @@ Clean separation: Epic data vs RAWG data vs IGDB data
 import sqlite3
 import json
 import os
+import re
+import threading
+import time
+import unicodedata
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
+from src.migrations import migrate, run_pending_backfills
+from src.utils.metrics import db_query
+
 # Get the project root directory (two levels up from this file: src/database.py -> src/ -> myGamingLib/)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(PROJECT_ROOT, "data"))
 DATABASE_NAME = os.path.join(DATA_DIR, "epic_games_library.db")
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
-
-
-def get_db_connection():
-    """Create a database connection."""
+# The data directory and schema are set up on the first connection, not on import
+_db_ready = False
+_db_lock = threading.Lock()
+init_seconds: Optional[float] = None  # How long the first-use setup took (startup report)
+
+# Columns stored as JSON text, decoded when games are read
+GAME_JSON_FIELDS = [
+    # RAWG fields
+    'rawg__ratings', 'rawg__metacritic_platforms', 'rawg__added_by_status',
+    'rawg__screenshots', 'rawg__trailers', 'rawg__genres', 'rawg__tags',
+    'rawg__platforms', 'rawg__parent_platforms', 'rawg__esrb_rating',
+    'rawg__achievements', 'rawg__stores', 'rawg__developers', 'rawg__publishers',
+    'rawg__creators', 'rawg__alternative_names', 'rawg__reactions', 'rawg__incomplete',
+    # IGDB fields
+    'igdb__metadata', 'igdb__artworks', 'igdb__screenshots', 'igdb__videos',
+    'igdb__genres', 'igdb__themes', 'igdb__game_modes', 'igdb__player_perspectives',
+    'igdb__keywords', 'igdb__platforms', 'igdb__alternative_names',
+    'igdb__multiplayer_modes', 'igdb__involved_companies', 'igdb__developers',
+    'igdb__publishers', 'igdb__age_ratings', 'igdb__release_dates',
+    'igdb__similar_games', 'igdb__dlcs', 'igdb__expansions', 'igdb__bundles',
+    'igdb__remakes', 'igdb__remasters', 'igdb__franchises', 'igdb__collections',
+    'igdb__websites', 'igdb__external_games', 'igdb__game_engines',
+    'igdb__language_supports'
+]
+
+# Columns holding IGDB game IDs, resolved through the shared igdb_games table
+IGDB_RELATED_GAME_FIELDS = ['igdb__similar_games', 'igdb__dlcs', 'igdb__expansions', 'igdb__bundles',
+                            'igdb__remakes', 'igdb__remasters']
+
+# /api/games multiplayer_type filter -> SQL condition
+MULTIPLAYER_FILTERS = {
+    'local': "rawg__local_players_max > 1",
+    'online': "rawg__online_players_max > 1",
+    'singleplayer': ("(rawg__local_players_max IS NULL OR rawg__local_players_max <= 1) AND "
+                     "(rawg__online_players_max IS NULL OR rawg__online_players_max <= 1)"),
+    'coop_local': "rawg__local_players_max >= 2",
+    'coop_online': "rawg__online_players_max >= 2",
+    'party_local': "rawg__local_players_max >= 4",
+    'party_online': "rawg__online_players_max >= 4",
+    'large_online': "rawg__online_players_max >= 10"
+}
+
+# /api/games sort -> ORDER BY clause
+# Ties are broken by id (in the index's direction) so pages never overlap or skip games
+GAME_SORTS = {
+    'title': "title",
+    'rating': "rawg__rating DESC, id DESC",
+    'release_date': "rawg__released DESC, id DESC",
+    'local_players': "rawg__local_players_max DESC, id DESC",
+    'online_players': "rawg__online_players_max DESC, id DESC"
+}
+
+
+def normalize_title(text: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace ("Pokémon: Arceus" -> "pokemon arceus")."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
+
+
+def _connect():
+    """Open a connection without checking the schema."""
     conn = sqlite3.connect(DATABASE_NAME)
     conn.row_factory = sqlite3.Row
+    # Used by the title_normalized backfill
+    conn.create_function('normalize_title', 1, normalize_title, deterministic=True)
     return conn
 
 
+def get_db_connection():
+    """Create a database connection (initializing the database on first use)."""
+    if not _db_ready:
+        _ensure_db()
+    return _connect()
+
+
+def _ensure_db():
+    """Create the data directory and migrate the schema, once per process."""
+    global _db_ready, init_seconds
+
+    with _db_lock:
+        if not _db_ready:
+            started = time.perf_counter()
+            init_db()
+            init_seconds = time.perf_counter() - started
+            _db_ready = True
+
+
 def init_db():
-    """Initialize the database with clean schema."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    """Bring the database schema up to date and resume unfinished backfills."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = _connect()
+    try:
+        applied = migrate(conn)
+        if applied:
+            # Refresh planner statistics for tables whose indexes changed
+            conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
 
-    # Create table only if it doesn't exist (preserves existing data)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS games (
-            -- Primary Key
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-
-            -- ===== EPIC GAMES DATA (from parser) =====
-            title TEXT NOT NULL UNIQUE,
-            epic_id TEXT,
-            epic_added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-
-            -- ===== RAWG API DATA (from sync) =====
-            -- Basic Info
-            rawg__id INTEGER,
-            rawg__slug TEXT,
-            rawg__name TEXT,
-            rawg__name_original TEXT,
-            rawg__description TEXT,
-            rawg__description_raw TEXT,
-
-            -- Dates
-            rawg__released TEXT,
-            rawg__tba BOOLEAN,
-            rawg__updated TEXT,
-
-            -- Ratings & Reviews
-            rawg__rating REAL,
-            rawg__rating_top INTEGER,
-            rawg__ratings TEXT,
-            rawg__ratings_count INTEGER,
-            rawg__reviews_count INTEGER,
-            rawg__reviews_text_count INTEGER,
-            rawg__metacritic INTEGER,
-            rawg__metacritic_url TEXT,
-            rawg__metacritic_platforms TEXT,
-
-            -- Player Counts (KEY FEATURE!)
-            rawg__local_players_min INTEGER,
-            rawg__local_players_max INTEGER,
-            rawg__online_players_min INTEGER,
-            rawg__online_players_max INTEGER,
-
-            -- Statistics
-            rawg__playtime INTEGER,
-            rawg__added INTEGER,
-            rawg__added_by_status TEXT,
-            rawg__suggestions_count INTEGER,
-
-            -- Content Counts
-            rawg__achievements_count INTEGER,
-            rawg__screenshots_count INTEGER,
-            rawg__movies_count INTEGER,
-            rawg__creators_count INTEGER,
-            rawg__additions_count INTEGER,
-            rawg__game_series_count INTEGER,
-            rawg__parents_count INTEGER,
-
-            -- Media & Images
-            rawg__background_image TEXT,
-            rawg__background_image_additional TEXT,
-            rawg__screenshots TEXT,
-            rawg__trailers TEXT,
-
-            -- Classifications
-            rawg__genres TEXT,
-            rawg__tags TEXT,
-            rawg__platforms TEXT,
-            rawg__parent_platforms TEXT,
-            rawg__esrb_rating TEXT,
-
-            -- Achievements
-            rawg__achievements TEXT,
-
-            -- Store Links
-            rawg__stores TEXT,
-            rawg__website TEXT,
-
-            -- Development
-            rawg__developers TEXT,
-            rawg__publishers TEXT,
-            rawg__creators TEXT,
-
-            -- Community
-            rawg__reddit_url TEXT,
-            rawg__reddit_name TEXT,
-            rawg__reddit_description TEXT,
-            rawg__reddit_logo TEXT,
-            rawg__reddit_count INTEGER,
-            rawg__twitch_count INTEGER,
-            rawg__youtube_count INTEGER,
-
-            -- Additional Data
-            rawg__alternative_names TEXT,
-            rawg__reactions TEXT,
-
-            -- Sync Status
-            rawg__synced BOOLEAN DEFAULT 0,
-            rawg__synced_at TIMESTAMP,
-
-            -- ===== IGDB API DATA =====
-            -- Basic Info
-            igdb__id INTEGER,
-            igdb__name TEXT,
-            igdb__slug TEXT,
-            igdb__summary TEXT,
-            igdb__storyline TEXT,
-            igdb__url TEXT,
-
-            -- Dates
-            igdb__first_release_date INTEGER,
-            igdb__created_at INTEGER,
-            igdb__updated_at INTEGER,
-
-            -- Ratings
-            igdb__rating REAL,
-            igdb__rating_count INTEGER,
-            igdb__total_rating REAL,
-            igdb__total_rating_count INTEGER,
-            igdb__aggregated_rating REAL,
-            igdb__aggregated_rating_count INTEGER,
-            igdb__hypes INTEGER,
-            igdb__follows INTEGER,
-
-            -- Classification
-            igdb__category INTEGER,
-            igdb__status INTEGER,
-            igdb__version_title TEXT,
-
-            -- Media
-            igdb__cover TEXT,
-            igdb__artworks TEXT,
-            igdb__screenshots TEXT,
-            igdb__videos TEXT,
-
-            -- Game Info
-            igdb__genres TEXT,
-            igdb__themes TEXT,
-            igdb__game_modes TEXT,
-            igdb__player_perspectives TEXT,
-            igdb__keywords TEXT,
-            igdb__platforms TEXT,
-            igdb__alternative_names TEXT,
-
-            -- Multiplayer
-            igdb__multiplayer_modes TEXT,
-
-            -- Companies
-            igdb__involved_companies TEXT,
-            igdb__developers TEXT,
-            igdb__publishers TEXT,
-
-            -- Ratings & Age
-            igdb__age_ratings TEXT,
-            igdb__esrb_rating TEXT,
-            igdb__pegi_rating TEXT,
-
-            -- Release Info
-            igdb__release_dates TEXT,
-
-            -- Related Games
-            igdb__similar_games TEXT,
-            igdb__dlcs TEXT,
-            igdb__expansions TEXT,
-            igdb__bundles TEXT,
-            igdb__remakes TEXT,
-            igdb__remasters TEXT,
-            igdb__franchise TEXT,
-            igdb__franchises TEXT,
-            igdb__collection TEXT,
-            igdb__collections TEXT,
-            igdb__parent_game TEXT,
-
-            -- External Links
-            igdb__websites TEXT,
-            igdb__external_games TEXT,
-
-            -- Game Engines & Localization
-            igdb__game_engines TEXT,
-            igdb__language_supports TEXT,
-
-            -- Sync Status
-            igdb__synced BOOLEAN DEFAULT 0,
-            igdb__synced_at TIMESTAMP,
-
-            -- ===== TIMESTAMPS =====
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    run_pending_backfills(_connect)
 
-    conn.commit()
-    conn.close()
-    print("[OK] Database initialized with clean Epic/RAWG separation schema")
+
+def _row_to_game(row) -> Dict:
+    """Convert a games row to a dict, decoding its JSON fields."""
+    game_dict = dict(row)
+
+    for field in GAME_JSON_FIELDS:
+        if game_dict.get(field):
+            try:
+                game_dict[field] = json.loads(game_dict[field])
+            except:
+                pass
+
+    return game_dict
 
 
 # ===== EPIC GAMES FUNCTIONS =====
@@ -239,31 +152,111 @@ def add_game(title: str, epic_id: Optional[str] = None) -> Tuple[int, bool]:
     Returns:
         tuple[int, bool]: (game_id, was_new) where was_new is True if newly added
     """
+    return add_games({title: epic_id})[title]
+
+
+@db_query
+def get_existing_titles(titles) -> set:
+    """Return which of the given titles are already in the games table."""
+    titles = list(titles)
+    if not titles:
+        return set()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    existing = set()
+    for start in range(0, len(titles), 500):
+        chunk = titles[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f"SELECT title FROM games WHERE title IN ({placeholders})", chunk)
+        existing.update(row['title'] for row in cursor.fetchall())
+
+    conn.close()
+    return existing
+
+
+@db_query
+def add_games(games: Dict[str, Optional[str]]) -> Dict[str, Tuple[int, bool]]:
+    """
+    Add many games from the Epic Games parser in a single transaction.
+    Titles already in the library are left untouched.
+
+    Args:
+        games: Dict of title -> epic_id (or None)
+
+    Returns:
+        dict: title -> (game_id, was_new) for every given title
+    """
+    if not games:
+        return {}
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    was_new = False
+    now = datetime.now()
+    titles = list(games)
+    results = {}
+
     try:
-        cursor.execute(
-            "INSERT INTO games (title, epic_id, epic_added_at) VALUES (?, ?, ?)",
-            (title, epic_id, datetime.now())
-        )
+        for start in range(0, len(titles), 300):
+            chunk = titles[start:start + 300]
+
+            # New titles come back from RETURNING; conflicting ones are skipped
+            values = ','.join(['(?, ?, ?, ?)'] * len(chunk))
+            params = [value for title in chunk for value in (title, normalize_title(title), games[title], now)]
+            cursor.execute(f"""
+                INSERT INTO games (title, title_normalized, epic_id, epic_added_at) VALUES {values}
+                ON CONFLICT(title) DO NOTHING
+                RETURNING id, title
+            """, params)
+            results.update({row['title']: (row['id'], True) for row in cursor.fetchall()})
+
+            # Look up the ids of the titles that were already there
+            existing = [title for title in chunk if title not in results]
+            if existing:
+                placeholders = ','.join('?' * len(existing))
+                cursor.execute(f"SELECT id, title FROM games WHERE title IN ({placeholders})", existing)
+                results.update({row['title']: (row['id'], False) for row in cursor.fetchall()})
+
         conn.commit()
-        game_id = cursor.lastrowid
-        was_new = True
-    except sqlite3.IntegrityError:
-        # Game already exists, get its ID
-        cursor.execute("SELECT id FROM games WHERE title = ?", (title,))
-        game_id = cursor.fetchone()[0]
-        was_new = False
     finally:
         conn.close()
 
-    return (game_id, was_new)
+    return results
+
+
+@db_query
+def get_scrape_state(key: str) -> Optional[Dict]:
+    """Get a scraper bookkeeping value (None if never recorded)."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT value FROM scrape_state WHERE key = ?", (key,))
+    row = cursor.fetchone()
+
+    conn.close()
+    return json.loads(row['value']) if row else None
+
+
+@db_query
+def set_scrape_state(key: str, value: Dict):
+    """Record a scraper bookkeeping value."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        INSERT INTO scrape_state (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+    """, (key, json.dumps(value)))
+
+    conn.commit()
+    conn.close()
 
 
 # ===== RAWG SYNC FUNCTIONS =====
 
+@db_query
 def update_game_with_rawg_data(game_id: int, rawg_data: Dict) -> bool:
     """
     Update game with comprehensive RAWG metadata.
@@ -315,6 +308,32 @@ def update_game_with_rawg_data(game_id: int, rawg_data: Dict) -> bool:
     return success
 
 
+@db_query
+def get_games_with_incomplete_rawg_data() -> List[Dict]:
+    """Get synced games whose RAWG sub-resources (screenshots, achievements, ...) failed to fetch."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT id, title, rawg__id, rawg__incomplete
+        FROM games
+        WHERE rawg__synced = 1 AND rawg__incomplete IS NOT NULL AND rawg__incomplete != '[]'
+    """)
+
+    games = []
+    for row in cursor.fetchall():
+        games.append({
+            'id': row['id'],
+            'title': row['title'],
+            'rawg__id': row['rawg__id'],
+            'rawg__incomplete': json.loads(row['rawg__incomplete'])
+        })
+
+    conn.close()
+    return games
+
+
+@db_query
 def get_games_without_rawg_sync() -> List[Dict]:
     """Get all games that haven't been synced with RAWG yet."""
     conn = get_db_connection()
@@ -340,6 +359,7 @@ def get_games_without_rawg_sync() -> List[Dict]:
 
 # ===== IGDB FUNCTIONS =====
 
+@db_query
 def update_game_with_igdb_data(game_id: int, igdb_data: Dict) -> bool:
     """
     Update game with comprehensive IGDB metadata.
@@ -391,6 +411,7 @@ def update_game_with_igdb_data(game_id: int, igdb_data: Dict) -> bool:
     return success
 
 
+@db_query
 def get_games_without_igdb_sync() -> List[Dict]:
     """Get all games that haven't been synced with IGDB yet."""
     conn = get_db_connection()
@@ -414,15 +435,15 @@ def get_games_without_igdb_sync() -> List[Dict]:
     return games
 
 
+@db_query
 def get_igdb_synced_count() -> int:
     """Get count of games synced with IGDB."""
     conn = get_db_connection()
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT COUNT(*) as count
-        FROM games
-        WHERE igdb__synced = 1
+        SELECT (SELECT COUNT(*) FROM games) -
+               (SELECT COUNT(*) FROM games WHERE igdb__synced = 0 OR igdb__synced IS NULL) as count
     """)
 
     count = cursor.fetchone()['count']
@@ -430,52 +451,248 @@ def get_igdb_synced_count() -> int:
     return count
 
 
+@db_query
+def get_known_igdb_game_ids(igdb_ids) -> set:
+    """Return which of the given IGDB game IDs are already in the shared igdb_games table."""
+    igdb_ids = list(igdb_ids)
+    if not igdb_ids:
+        return set()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    known = set()
+    for start in range(0, len(igdb_ids), 500):
+        chunk = igdb_ids[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f"SELECT id FROM igdb_games WHERE id IN ({placeholders})", chunk)
+        known.update(row['id'] for row in cursor.fetchall())
+
+    conn.close()
+    return known
+
+
+@db_query
+def upsert_igdb_games(games: List[Dict]):
+    """Insert or refresh entries of the shared igdb_games table."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.executemany("""
+        INSERT INTO igdb_games (id, name, slug, first_release_date, cover_image_id, cached_at)
+        VALUES (:id, :name, :slug, :first_release_date, :cover_image_id, CURRENT_TIMESTAMP)
+        ON CONFLICT(id) DO UPDATE SET
+            name = excluded.name,
+            slug = excluded.slug,
+            first_release_date = excluded.first_release_date,
+            cover_image_id = excluded.cover_image_id,
+            cached_at = excluded.cached_at
+    """, games)
+
+    conn.commit()
+    conn.close()
+
+
+@db_query
+def get_igdb_games(igdb_ids) -> Dict[int, Dict]:
+    """Resolve IGDB game IDs (e.g. igdb__dlcs) to cached names, slugs and covers."""
+    igdb_ids = list(igdb_ids)
+    if not igdb_ids:
+        return {}
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    games = {}
+    for start in range(0, len(igdb_ids), 500):
+        chunk = igdb_ids[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f"SELECT * FROM igdb_games WHERE id IN ({placeholders})", chunk)
+        games.update({row['id']: dict(row) for row in cursor.fetchall()})
+
+    conn.close()
+    return games
+
+
+def resolve_igdb_related_games(game: Dict) -> Dict:
+    """
+    Replace the IGDB game IDs of a game's related-game fields (igdb__dlcs, igdb__similar_games...)
+    with their entries in the shared igdb_games table: {'id', 'name', 'slug', 'first_release_date',
+    'cover_image_id'}. IDs that aren't cached yet become {'id': id}.
+    """
+    fields = [field for field in IGDB_RELATED_GAME_FIELDS if game.get(field)]
+    cached = get_igdb_games({igdb_id for field in fields for igdb_id in game[field] if isinstance(igdb_id, int)})
+
+    for field in fields:
+        resolved = []
+        for related in game[field]:
+            if isinstance(related, dict):
+                # Synced before related games were cached: the expanded game is stored inline
+                resolved.append(related)
+            elif related in cached:
+                resolved.append({key: value for key, value in cached[related].items() if key != 'cached_at'})
+            else:
+                resolved.append({'id': related})
+        game[field] = resolved
+
+    return game
+
+
+@db_query
+def get_igdb_reference_entities(endpoint: str) -> Dict[int, Dict]:
+    """Get all cached reference entities of an IGDB endpoint, keyed by ID."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT id, name, slug FROM igdb_reference WHERE endpoint = ?", (endpoint,))
+    entities = {row['id']: dict(row) for row in cursor.fetchall()}
+
+    conn.close()
+    return entities
+
+
+@db_query
+def get_igdb_reference_max_updated_at(endpoint: str) -> int:
+    """Get the newest updated_at cached for an IGDB endpoint (0 if empty)."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT MAX(updated_at) FROM igdb_reference WHERE endpoint = ?", (endpoint,))
+    max_updated_at = cursor.fetchone()[0]
+
+    conn.close()
+    return max_updated_at or 0
+
+
+@db_query
+def upsert_igdb_reference_entities(entities: List[Dict]):
+    """Insert or refresh IGDB reference entities ({'endpoint', 'id', 'name', 'slug', 'updated_at'})."""
+    if not entities:
+        return
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.executemany("""
+        INSERT INTO igdb_reference (endpoint, id, name, slug, updated_at)
+        VALUES (:endpoint, :id, :name, :slug, :updated_at)
+        ON CONFLICT(endpoint, id) DO UPDATE SET
+            name = excluded.name,
+            slug = excluded.slug,
+            updated_at = excluded.updated_at
+    """, entities)
+
+    conn.commit()
+    conn.close()
+
+
 # ===== QUERY FUNCTIONS =====
 
+@db_query
 def get_all_games() -> List[Dict]:
     """Get all games with all their data."""
     conn = get_db_connection()
     cursor = conn.cursor()
 
     cursor.execute("SELECT * FROM games ORDER BY title")
+    games = [_row_to_game(row) for row in cursor.fetchall()]
 
-    games = []
-    for row in cursor.fetchall():
-        game_dict = dict(row)
-
-        # Parse JSON fields
-        json_fields = [
-            # RAWG fields
-            'rawg__ratings', 'rawg__metacritic_platforms', 'rawg__added_by_status',
-            'rawg__screenshots', 'rawg__trailers', 'rawg__genres', 'rawg__tags',
-            'rawg__platforms', 'rawg__parent_platforms', 'rawg__esrb_rating',
-            'rawg__achievements', 'rawg__stores', 'rawg__developers', 'rawg__publishers',
-            'rawg__creators', 'rawg__alternative_names', 'rawg__reactions',
-            # IGDB fields
-            'igdb__metadata', 'igdb__artworks', 'igdb__screenshots', 'igdb__videos',
-            'igdb__genres', 'igdb__themes', 'igdb__game_modes', 'igdb__player_perspectives',
-            'igdb__keywords', 'igdb__platforms', 'igdb__alternative_names',
-            'igdb__multiplayer_modes', 'igdb__involved_companies', 'igdb__developers',
-            'igdb__publishers', 'igdb__age_ratings', 'igdb__release_dates',
-            'igdb__similar_games', 'igdb__dlcs', 'igdb__expansions', 'igdb__bundles',
-            'igdb__remakes', 'igdb__remasters', 'igdb__franchises', 'igdb__collections',
-            'igdb__websites', 'igdb__external_games', 'igdb__game_engines',
-            'igdb__language_supports'
-        ]
-
-        for field in json_fields:
-            if game_dict.get(field):
-                try:
-                    game_dict[field] = json.loads(game_dict[field])
-                except:
-                    pass
-
-        games.append(game_dict)
+    conn.close()
+    return games
+
+
+def _game_filter_clause(min_local_players: Optional[int] = None, max_local_players: Optional[int] = None,
+                        min_online_players: Optional[int] = None, max_online_players: Optional[int] = None,
+                        multiplayer_type: str = '') -> Tuple[str, List]:
+    """Build the WHERE clause and parameters of the library filters (see get_filtered_games)."""
+    conditions = []
+    params = []
+
+    # Unknown (NULL) and 0 player counts never match a player count filter
+    for column, minimum, maximum in [('rawg__local_players_max', min_local_players, max_local_players),
+                                     ('rawg__online_players_max', min_online_players, max_online_players)]:
+        if minimum is not None:
+            conditions.append(f"{column} >= ? AND {column} != 0")
+            params.append(minimum)
+        if maximum is not None:
+            conditions.append(f"{column} <= ? AND {column} != 0")
+            params.append(maximum)
+
+    if multiplayer_type in MULTIPLAYER_FILTERS:
+        conditions.append(MULTIPLAYER_FILTERS[multiplayer_type])
+
+    where = f"WHERE {' AND '.join(f'({c})' for c in conditions)}" if conditions else ""
+    return where, params
+
+
+def _filtered_games_query(min_local_players: Optional[int] = None, max_local_players: Optional[int] = None,
+                          min_online_players: Optional[int] = None, max_online_players: Optional[int] = None,
+                          multiplayer_type: str = '', sort: str = 'title', limit: Optional[int] = None,
+                          offset: int = 0) -> Tuple[str, List]:
+    """Build the query and parameters of a page of filtered games (see get_filtered_games)."""
+    where, params = _game_filter_clause(min_local_players, max_local_players,
+                                        min_online_players, max_online_players, multiplayer_type)
+    order_by = GAME_SORTS.get(sort, GAME_SORTS['title'])
+
+    page = ""
+    if limit is not None:
+        page = "LIMIT ? OFFSET ?"
+        params = params + [limit, offset]
+
+    return f"SELECT * FROM games {where} ORDER BY {order_by} {page}", params
+
+
+@db_query
+def get_filtered_games(min_local_players: Optional[int] = None, max_local_players: Optional[int] = None,
+                       min_online_players: Optional[int] = None, max_online_players: Optional[int] = None,
+                       multiplayer_type: str = '', sort: str = 'title', limit: Optional[int] = None,
+                       offset: int = 0) -> List[Dict]:
+    """
+    Get games matching the library filters, filtered, sorted and paginated in SQL.
+
+    Args:
+        min_local_players: Minimum rawg__local_players_max
+        max_local_players: Maximum rawg__local_players_max
+        min_online_players: Minimum rawg__online_players_max
+        max_online_players: Maximum rawg__online_players_max
+        multiplayer_type: Key of MULTIPLAYER_FILTERS (ignored if unknown)
+        sort: Key of GAME_SORTS (defaults to title)
+        limit: Page size (None = all games)
+        offset: Number of games skipped
+
+    Returns:
+        list: Matching games with their JSON fields decoded
+    """
+    query, params = _filtered_games_query(min_local_players, max_local_players, min_online_players,
+                                          max_online_players, multiplayer_type, sort, limit, offset)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(query, params)
+    games = [_row_to_game(row) for row in cursor.fetchall()]
 
     conn.close()
     return games
 
 
+@db_query
+def count_filtered_games(min_local_players: Optional[int] = None, max_local_players: Optional[int] = None,
+                         min_online_players: Optional[int] = None, max_online_players: Optional[int] = None,
+                         multiplayer_type: str = '') -> int:
+    """Count the games matching the library filters (the total behind a page of get_filtered_games)."""
+    where, params = _game_filter_clause(min_local_players, max_local_players,
+                                        min_online_players, max_online_players, multiplayer_type)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM games {where}", params)
+    count = cursor.fetchone()[0]
+    conn.close()
+    return count
+
+
+@db_query
 def get_game_by_id(game_id: int) -> Optional[Dict]:
     """Get a single game by ID."""
     conn = get_db_connection()
@@ -488,39 +705,61 @@ def get_game_by_id(game_id: int) -> Optional[Dict]:
         conn.close()
         return None
 
-    game_dict = dict(row)
+    conn.close()
+    return _row_to_game(row)
 
-    # Parse JSON fields
-    json_fields = [
-        # RAWG fields
-        'rawg__ratings', 'rawg__metacritic_platforms', 'rawg__added_by_status',
-        'rawg__screenshots', 'rawg__trailers', 'rawg__genres', 'rawg__tags',
-        'rawg__platforms', 'rawg__parent_platforms', 'rawg__esrb_rating',
-        'rawg__achievements', 'rawg__stores', 'rawg__developers', 'rawg__publishers',
-        'rawg__creators', 'rawg__alternative_names', 'rawg__reactions',
-        # IGDB fields
-        'igdb__metadata', 'igdb__artworks', 'igdb__screenshots', 'igdb__videos',
-        'igdb__genres', 'igdb__themes', 'igdb__game_modes', 'igdb__player_perspectives',
-        'igdb__keywords', 'igdb__platforms', 'igdb__alternative_names',
-        'igdb__multiplayer_modes', 'igdb__involved_companies', 'igdb__developers',
-        'igdb__publishers', 'igdb__age_ratings', 'igdb__release_dates',
-        'igdb__similar_games', 'igdb__dlcs', 'igdb__expansions', 'igdb__bundles',
-        'igdb__remakes', 'igdb__remasters', 'igdb__franchises', 'igdb__collections',
-        'igdb__websites', 'igdb__external_games', 'igdb__game_engines',
-        'igdb__language_supports'
-    ]
-
-    for field in json_fields:
-        if game_dict.get(field):
-            try:
-                game_dict[field] = json.loads(game_dict[field])
-            except:
-                pass
 
+@db_query
+def search_library(words: List[str], limit: int = 5) -> List[Dict]:
+    """
+    Find library games whose title contains every given word, ignoring case, accents and punctuation.
+
+    Args:
+        words: Query words normalized with normalize_title()
+        limit: Maximum number of games returned
+
+    Returns:
+        list: {'id', 'title', 'rawg__id', 'rawg__background_image', 'rawg__released'} dicts,
+              titles starting with the first word first
+    """
+    if not words:
+        return []
+
+    # Escape LIKE wildcards so a query like "100%" matches literally
+    patterns = ['%' + word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                for word in words]
+    conditions = ' AND '.join("title_normalized LIKE ? ESCAPE '\\'" for _ in patterns)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT id, title, rawg__id, rawg__background_image, rawg__released FROM games
+        WHERE {conditions}
+        ORDER BY title_normalized LIKE ? ESCAPE '\\' DESC, title
+        LIMIT ?
+    """, patterns + [patterns[0][1:], limit])
+    games = [dict(row) for row in cursor.fetchall()]
     conn.close()
-    return game_dict
+    return games
 
 
+@db_query
+def get_library_rawg_ids(rawg_ids) -> set:
+    """Return which of the given RAWG IDs belong to games already in the library."""
+    rawg_ids = [i for i in rawg_ids if i is not None]
+    if not rawg_ids:
+        return set()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    placeholders = ','.join('?' * len(rawg_ids))
+    cursor.execute(f"SELECT rawg__id FROM games WHERE rawg__id IN ({placeholders})", rawg_ids)
+    found = {row[0] for row in cursor.fetchall()}
+    conn.close()
+    return found
+
+
+@db_query
 def get_game_count() -> int:
     """Get total number of games in library."""
     conn = get_db_connection()
@@ -531,19 +770,127 @@ def get_game_count() -> int:
     return count
 
 
+@db_query
 def get_rawg_synced_count() -> int:
     """Get number of games synced with RAWG."""
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM games WHERE rawg__synced = 1")
+    # Total minus the (partially indexed) sync work queue, so neither count scans the table
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM games) -
+               (SELECT COUNT(*) FROM games WHERE rawg__synced = 0 OR rawg__synced IS NULL)
+    """)
     count = cursor.fetchone()[0]
     conn.close()
     return count
 
 
+@db_query
+def get_library_stats() -> Dict:
+    """
+    Get library counts for the stats panel, each answered from an index.
+
+    Returns:
+        dict: total_games, synced_games_rawg, synced_games_igdb,
+              local_multiplayer_games, online_multiplayer_games
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    def count(where: str = "") -> int:
+        cursor.execute(f"SELECT COUNT(*) FROM games {where}")
+        return cursor.fetchone()[0]
+
+    total_games = count()
+    stats = {
+        'total_games': total_games,
+        # Synced = total minus the (partially indexed) sync work queue
+        'synced_games_rawg': total_games - count("WHERE rawg__synced = 0 OR rawg__synced IS NULL"),
+        'synced_games_igdb': total_games - count("WHERE igdb__synced = 0 OR igdb__synced IS NULL"),
+        'local_multiplayer_games': count(f"WHERE {MULTIPLAYER_FILTERS['local']}"),
+        'online_multiplayer_games': count(f"WHERE {MULTIPLAYER_FILTERS['online']}")
+    }
+
+    conn.close()
+    return stats
+
+
+def _library_queries() -> Dict[str, Tuple[str, List]]:
+    """The /api/games queries: every filter with every sort order, built by the same code the route runs."""
+    filters = {
+        'no filter': {},
+        'min local players': {'min_local_players': 2},
+        'max local players': {'max_local_players': 4},
+        'min online players': {'min_online_players': 2},
+        'max online players': {'max_online_players': 4},
+        **{f"{name} multiplayer": {'multiplayer_type': name} for name in MULTIPLAYER_FILTERS}
+    }
+
+    queries = {}
+    for name, filter_args in filters.items():
+        for sort in GAME_SORTS:
+            queries[f"{name}, sort by {sort}"] = _filtered_games_query(**filter_args, sort=sort, limit=200, offset=400)
+
+        # The total shown with each page (count_filtered_games)
+        where, params = _game_filter_clause(**filter_args)
+        queries[f"{name}, count"] = (f"SELECT COUNT(*) FROM games {where}", params)
+
+    return queries
+
+
+# Hot queries that must be answered from an index (checked by check_query_plans())
+HOT_QUERIES = {
+    'rawg work queue': ("SELECT id, title, epic_id FROM games WHERE rawg__synced = 0 OR rawg__synced IS NULL", []),
+    'igdb work queue': ("SELECT id, title, epic_id FROM games WHERE igdb__synced = 0 OR igdb__synced IS NULL", []),
+    'incomplete rawg data': ("SELECT id, title, rawg__id, rawg__incomplete FROM games "
+                             "WHERE rawg__synced = 1 AND rawg__incomplete IS NOT NULL AND rawg__incomplete != '[]'", []),
+    'title lookup': ("SELECT id FROM games WHERE title = ?", ['x']),
+    'rawg synced count': ("SELECT COUNT(*) FROM games WHERE rawg__synced = 0 OR rawg__synced IS NULL", []),
+    **_library_queries()
+}
+
+
+def check_query_plans() -> Dict[str, str]:
+    """
+    Run EXPLAIN QUERY PLAN on the hot queries and report full table scans.
+
+    Plans are checked against an empty in-memory copy of the schema, so the result
+    depends on the indexes only, not on the statistics of the current library.
+
+    Returns:
+        dict: Query name -> plan detail, for every query that scans the games table
+              without an index (empty when all hot queries use indexes)
+    """
+    source = get_db_connection()
+    schema = [row['sql'] for row in source.execute(
+        "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY type DESC"
+    )]
+    source.close()
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    for statement in schema:
+        cursor.execute(statement)
+
+    offenders = {}
+    for name, (query, params) in HOT_QUERIES.items():
+        cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        details = [row['detail'] for row in cursor.fetchall()]
+
+        # "SCAN games" alone is a full table scan; "SCAN games USING INDEX" is fine
+        full_scans = [detail for detail in details if detail.startswith('SCAN games') and 'INDEX' not in detail]
+        if full_scans or any('TEMP B-TREE' in detail for detail in details):
+            offenders[name] = '; '.join(details)
+
+    conn.close()
+    return offenders
+
+
 # ===== LEGACY COMPATIBILITY FUNCTIONS =====
 # These provide backwards compatibility with old code
 
+@db_query
 def update_game_metadata(game_id: int, metadata: Dict) -> bool:
     """
     Legacy function for backwards compatibility.
@@ -619,6 +966,3 @@ def update_game_metadata(game_id: int, metadata: Dict) -> bool:
 
     return update_game_with_rawg_data(game_id, rawg_data)
 
-
-# Initialize database on import
-init_db()
@@ -0,0 +1,211 @@
+"""
+Local image cache
+Stores cover and screenshot images from RAWG/IGDB under data/images and serves
+right-sized WebP thumbnails of them, so the grid doesn't download full-size CDN images
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import urljoin, urlparse
+
+from src.database import DATA_DIR
+from src.utils.http_client import get_session
+from src.utils.metrics import IMAGE_CACHE_REQUESTS
+from src.utils.resilience import request_with_retry, APIError
+
+IMAGE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(DATA_DIR, "images"))
+
+# Only images from these hosts are proxied (the app would otherwise be an open proxy)
+ALLOWED_HOSTS = set(os.getenv("IMAGE_CACHE_HOSTS", "media.rawg.io,images.igdb.com").split(','))
+
+# Thumbnail widths served; requested widths are rounded up to one of these
+THUMB_WIDTHS = (160, 320, 640, 1280)
+CARD_WIDTH = 640      # Width prefetched during syncs (game cards, 2x density)
+THUMB_QUALITY = 80
+
+# Download images of newly synced games in the background (0 = only on first view)
+PREFETCH = os.getenv("IMAGE_CACHE_PREFETCH", "1") == "1"
+PREFETCH_WORKERS = 4
+
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+MAX_REDIRECTS = 3  # CDN redirects followed, each checked against ALLOWED_HOSTS
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_lock = threading.Lock()
+
+
+def is_allowed(url: str) -> bool:
+    """Check that an image URL points to a supported CDN."""
+    parsed = urlparse(url or '')
+    return parsed.scheme in ('http', 'https') and parsed.hostname in ALLOWED_HOSTS
+
+
+def _key(url: str) -> str:
+    """Cache file name of an image URL."""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _original_path(url: str) -> str:
+    """Where the original image of a URL is stored."""
+    key = _key(url)
+    return os.path.join(IMAGE_DIR, 'originals', key[:2], key)
+
+
+def _thumb_path(url: str, width: int) -> str:
+    """Where the WebP thumbnail of a URL is stored."""
+    key = _key(url)
+    return os.path.join(IMAGE_DIR, 'thumbs', str(width), key[:2], f"{key}.webp")
+
+
+def _write_atomic(path: str, write):
+    """Write a file through a temporary name so readers never see a partial image."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def guess_mimetype(url: str, path: str) -> str:
+    """Content type of a cached file (thumbnails are WebP, originals keep their URL's type)."""
+    if path.endswith('.webp'):
+        return 'image/webp'
+    return mimetypes.guess_type(urlparse(url).path)[0] or 'image/jpeg'
+
+
+def thumb_width(width: Optional[int]) -> Optional[int]:
+    """Round a requested width up to a supported thumbnail width (None = original)."""
+    if not width:
+        return None
+    for size in THUMB_WIDTHS:
+        if width <= size:
+            return size
+    return None
+
+
+def fetch_original(url: str) -> Optional[str]:
+    """
+    Get the cached original of an image, downloading it if needed.
+
+    Returns:
+        str: Path of the stored image, or None if it could not be downloaded
+    """
+    path = _original_path(url)
+    if os.path.exists(path):
+        return path
+
+    # Redirects are followed by hand so they can't point the proxy at another host
+    location = url
+    for _ in range(MAX_REDIRECTS + 1):
+        try:
+            response = request_with_retry(get_session(), 'GET', location, max_retries=1, timeout=15,
+                                          allow_redirects=False)
+        except APIError as e:
+            print(f"[WARN] Could not cache image {url}: {str(e)}")
+            return None
+
+        if not response.is_redirect:
+            break
+
+        location = urljoin(location, response.headers['Location'])
+        if not is_allowed(location):
+            print(f"[WARN] Not caching {url}: redirected to a host that isn't allowed ({location})")
+            return None
+    else:
+        print(f"[WARN] Not caching {url}: too many redirects")
+        return None
+
+    if len(response.content) > MAX_IMAGE_BYTES or \
+            not response.headers.get('Content-Type', 'image/').startswith('image/'):
+        print(f"[WARN] Not caching {url}: not an image or too large")
+        return None
+
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            f.write(response.content)
+
+    _write_atomic(path, write)
+    return path
+
+
+def get_image(url: str, width: Optional[int] = None) -> Optional[str]:
+    """
+    Get a cached image, resized to a thumbnail width when Pillow is installed.
+
+    Args:
+        url: Image URL on an allowed host
+        width: Wanted width in pixels (rounded up to THUMB_WIDTHS; None = original)
+
+    Returns:
+        str: Path of the file to serve, or None if the image is unavailable
+    """
+    width = thumb_width(width)
+
+    if width and PILLOW_AVAILABLE:
+        path = _thumb_path(url, width)
+        if os.path.exists(path):
+            IMAGE_CACHE_REQUESTS.inc(result='hit')
+            return path
+
+    cached = os.path.exists(_original_path(url))
+    original = fetch_original(url)
+    IMAGE_CACHE_REQUESTS.inc(result='error' if original is None else 'hit' if cached else 'miss')
+    if original is None or not width or not PILLOW_AVAILABLE:
+        return original
+
+    def write(tmp_path):
+        with Image.open(original) as image:
+            if image.width > width:
+                image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            image.save(tmp_path, 'WEBP', quality=THUMB_QUALITY, method=4)
+
+    try:
+        _write_atomic(path, write)
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Could not resize {url}: {str(e)}")
+        return original
+
+    return path
+
+
+def prefetch_game_images(metadata: Dict):
+    """Cache the card image of a freshly synced game (RAWG background or IGDB cover)."""
+    prefetch_images([metadata.get('rawg__background_image'), metadata.get('igdb__cover')])
+
+
+def prefetch_images(urls: Iterable[Optional[str]], width: int = CARD_WIDTH):
+    """
+    Cache images in the background (used after a game is synced).
+
+    Args:
+        urls: Image URLs (empty and disallowed ones are skipped)
+        width: Thumbnail width generated for each image
+    """
+    global _prefetch_executor
+
+    if not PREFETCH:
+        return
+
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS,
+                                                    thread_name_prefix='image-prefetch')
+
+    for url in urls:
+        if url and is_allowed(url):
+            _prefetch_executor.submit(get_image, url, width)
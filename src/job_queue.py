@@ -0,0 +1,494 @@
+"""
+Durable Job Queue for sync tasks
+Stores jobs and per-game work items in SQLite so long syncs survive restarts
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from src.database import DATA_DIR
+from src.utils.metrics import JOB_ITEM_DURATION
+
+QUEUE_DATABASE_NAME = os.path.join(DATA_DIR, "job_queue.db")
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Items are claimed on a lease: the claiming process refreshes locked_at while it works on them,
+# and items whose lease expired (their process died) go back to the queue
+ITEM_LEASE_SECONDS = int(os.getenv("JOB_ITEM_LEASE_SECONDS", "120"))
+ITEM_HEARTBEAT_SECONDS = max(ITEM_LEASE_SECONDS // 4, 1)
+
+# Prefix of this process's worker IDs (unique per process start, as PIDs get reused)
+RUNNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Job / item states
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# The queue schema is created on the first connection, not on import
+_queue_ready = False
+_queue_lock = threading.Lock()
+
+
+def _connect():
+    """Open a queue connection without checking the schema."""
+    conn = sqlite3.connect(QUEUE_DATABASE_NAME, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_queue_connection():
+    """Create a connection to the job queue database (initializing it on first use)."""
+    global _queue_ready
+
+    if not _queue_ready:
+        with _queue_lock:
+            if not _queue_ready:
+                init_queue_db()
+                _queue_ready = True
+
+    return _connect()
+
+
+def init_queue_db():
+    """Initialize the job queue schema."""
+    os.makedirs(os.path.dirname(QUEUE_DATABASE_NAME), exist_ok=True)
+    conn = _connect()
+    cursor = conn.cursor()
+
+    # WAL lets several workers read while one of them claims an item
+    cursor.execute("PRAGMA journal_mode=WAL")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER NOT NULL REFERENCES jobs(id),
+            game_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            locked_by TEXT,
+            locked_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(job_id, game_id)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_job_items_claim
+        ON job_items (job_id, status, id)
+    """)
+
+    conn.close()
+
+
+# ===== JOB FUNCTIONS =====
+
+def create_job(kind: str, games: List[Dict], max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> int:
+    """
+    Create a job with one work item per game.
+
+    Args:
+        kind: Job kind, e.g. 'rawg_sync' or 'igdb_sync'
+        games: List of game dicts with 'id' and 'title'
+        max_attempts: How many times a failing item is retried
+
+    Returns:
+        int: The new job ID
+    """
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(
+            "INSERT INTO jobs (kind, status, max_attempts) VALUES (?, ?, ?)",
+            (kind, PENDING, max_attempts)
+        )
+        job_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT OR IGNORE INTO job_items (job_id, game_id, title) VALUES (?, ?, ?)",
+            [(job_id, game['id'], game['title']) for game in games]
+        )
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    return job_id
+
+
+def get_unfinished_job(kind: str) -> Optional[Dict]:
+    """Get the most recent job of this kind that has not finished yet."""
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT * FROM jobs
+        WHERE kind = ? AND status IN (?, ?)
+        ORDER BY id DESC
+        LIMIT 1
+    """, (kind, PENDING, RUNNING))
+
+    row = cursor.fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def get_unfinished_jobs() -> List[Dict]:
+    """Get all jobs that were interrupted or never started."""
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY id",
+        (PENDING, RUNNING)
+    )
+
+    jobs = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return jobs
+
+
+def cancel_unfinished_jobs(kind: str) -> int:
+    """Cancel every unfinished job of this kind. Returns the number cancelled."""
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "UPDATE jobs SET status = ?, updated_at = ?, finished_at = ? WHERE kind = ? AND status IN (?, ?)",
+        (CANCELLED, datetime.now(), datetime.now(), kind, PENDING, RUNNING)
+    )
+
+    count = cursor.rowcount
+    conn.close()
+    return count
+
+
+def get_job_progress(job_id: int) -> Dict:
+    """Get per-status item counts for a job."""
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "SELECT status, COUNT(*) AS count FROM job_items WHERE job_id = ? GROUP BY status",
+        (job_id,)
+    )
+
+    progress = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+    for row in cursor.fetchall():
+        progress[row['status']] = row['count']
+    progress['total'] = sum(progress.values())
+
+    conn.close()
+    return progress
+
+
+def get_failed_items(job_id: int) -> List[Dict]:
+    """Get the items of a job that failed permanently."""
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "SELECT game_id, title, attempts, last_error FROM job_items WHERE job_id = ? AND status = ? ORDER BY id",
+        (job_id, FAILED)
+    )
+
+    items = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return items
+
+
+def _set_job_status(job_id: int, status: str):
+    """Update a job's status."""
+    conn = get_queue_connection()
+    finished_at = datetime.now() if status in (DONE, CANCELLED) else None
+    conn.execute(
+        "UPDATE jobs SET status = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+        (status, datetime.now(), finished_at, job_id)
+    )
+    conn.close()
+
+
+# ===== WORK ITEM FUNCTIONS =====
+
+def requeue_interrupted_items(job_id: int) -> int:
+    """
+    Put items left 'running' by a crashed or restarted process back in the queue.
+
+    Only items whose lease expired are requeued: items claimed by a live worker
+    (in this or another process) keep having their lease refreshed.
+
+    Returns:
+        int: Number of items requeued
+    """
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        UPDATE job_items SET status = ?, locked_by = NULL, locked_at = NULL
+        WHERE job_id = ? AND status = ? AND (locked_at IS NULL OR locked_at < ?)
+    """, (PENDING, job_id, RUNNING, datetime.now() - timedelta(seconds=ITEM_LEASE_SECONDS)))
+
+    count = cursor.rowcount
+    conn.close()
+    return count
+
+
+def renew_item_leases(job_id: int) -> int:
+    """Refresh the lease of the items this process's workers are working on."""
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "UPDATE job_items SET locked_at = ? WHERE job_id = ? AND status = ? AND locked_by LIKE ?",
+        (datetime.now(), job_id, RUNNING, f"{RUNNER_ID}-%")
+    )
+
+    count = cursor.rowcount
+    conn.close()
+    return count
+
+
+def claim_next_item(job_id: int, worker_id: str) -> Optional[Dict]:
+    """
+    Atomically claim the next pending item of a job.
+
+    Args:
+        job_id: Job to take work from
+        worker_id: Identifier of the claiming worker
+
+    Returns:
+        dict: The claimed item, or None if the job has no pending work
+    """
+    conn = get_queue_connection()
+    cursor = conn.cursor()
+
+    try:
+        # IMMEDIATE takes the write lock up front so two workers never claim the same row
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("""
+            SELECT * FROM job_items
+            WHERE job_id = ? AND status = ?
+            ORDER BY id
+            LIMIT 1
+        """, (job_id, PENDING))
+
+        row = cursor.fetchone()
+        if not row:
+            cursor.execute("COMMIT")
+            return None
+
+        cursor.execute("""
+            UPDATE job_items
+            SET status = ?, attempts = attempts + 1, locked_by = ?, locked_at = ?, updated_at = ?
+            WHERE id = ?
+        """, (RUNNING, worker_id, datetime.now(), datetime.now(), row['id']))
+        cursor.execute("COMMIT")
+
+        item = dict(row)
+        item['attempts'] += 1
+        return item
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def complete_item(item_id: int):
+    """Checkpoint an item as done so it is never redone."""
+    conn = get_queue_connection()
+    conn.execute(
+        "UPDATE job_items SET status = ?, last_error = NULL, locked_by = NULL, updated_at = ? WHERE id = ?",
+        (DONE, datetime.now(), item_id)
+    )
+    conn.close()
+
+
+def fail_item(item_id: int, error: str, retry: bool, max_attempts: int, attempts: int) -> bool:
+    """
+    Record a failed attempt.
+
+    Args:
+        item_id: Work item ID
+        error: Error description
+        retry: Whether the failure is worth retrying
+        max_attempts: Retry budget of the job
+        attempts: Attempts made so far (including this one)
+
+    Returns:
+        bool: True if the item was put back in the queue
+    """
+    will_retry = retry and attempts < max_attempts
+    status = PENDING if will_retry else FAILED
+
+    conn = get_queue_connection()
+    conn.execute(
+        "UPDATE job_items SET status = ?, last_error = ?, locked_by = NULL, updated_at = ? WHERE id = ?",
+        (status, error, datetime.now(), item_id)
+    )
+    conn.close()
+    return will_retry
+
+
+# ===== RUNNER =====
+
+def run_job(job_id: int, make_handler: Callable[[], Callable[[Dict], bool]], workers: int = 1,
+            log: Callable[[str], None] = print) -> Dict:
+    """
+    Drain a job with one or more worker threads.
+
+    Each worker gets its own handler from make_handler. The handler receives the
+    work item and returns True on success or False on a permanent failure (e.g.
+    game not found). Exceptions are treated as transient and the item is retried
+    until the job's max_attempts is reached.
+
+    Args:
+        job_id: Job to run
+        make_handler: Factory returning a function that processes one item
+        workers: Number of worker threads
+        log: Logging function
+
+    Returns:
+        dict: Final progress counts of the job
+    """
+    conn = get_queue_connection()
+    job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    if not job:
+        raise ValueError(f"Job {job_id} does not exist")
+
+    max_attempts = job['max_attempts']
+    kind = job['kind']
+
+    requeued = requeue_interrupted_items(job_id)
+    if requeued:
+        log(f"[QUEUE] Requeued {requeued} interrupted item(s)")
+
+    _set_job_status(job_id, RUNNING)
+
+    def worker(worker_number: int):
+        worker_id = f"{RUNNER_ID}-{worker_number}"
+        process = make_handler()
+
+        while True:
+            # Stop if the job was cancelled (e.g. superseded by a forced resync)
+            status_conn = get_queue_connection()
+            status = status_conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()['status']
+            status_conn.close()
+            if status == CANCELLED:
+                return
+
+            item = claim_next_item(job_id, worker_id)
+            if not item:
+                return
+
+            started = time.perf_counter()
+            try:
+                if process(item):
+                    JOB_ITEM_DURATION.observe(time.perf_counter() - started, kind=kind, result='done')
+                    complete_item(item['id'])
+                else:
+                    JOB_ITEM_DURATION.observe(time.perf_counter() - started, kind=kind, result='failed')
+                    fail_item(item['id'], 'Sync returned no result', retry=False,
+                              max_attempts=max_attempts, attempts=item['attempts'])
+            except Exception as e:
+                JOB_ITEM_DURATION.observe(time.perf_counter() - started, kind=kind, result='error')
+                will_retry = fail_item(item['id'], str(e), retry=True,
+                                       max_attempts=max_attempts, attempts=item['attempts'])
+                if will_retry:
+                    log(f"[RETRY] '{item['title']}' attempt {item['attempts']}/{max_attempts} failed: {str(e)}")
+                else:
+                    log(f"[ERROR] '{item['title']}' gave up after {item['attempts']} attempts: {str(e)}")
+                    print(traceback.format_exc())
+                # Back off before the next claim, longer if the API asked us to
+                time.sleep(getattr(e, 'retry_after', None) or min(2 ** item['attempts'], 30))
+
+    stopped = threading.Event()
+
+    def heartbeat():
+        while not stopped.wait(ITEM_HEARTBEAT_SECONDS):
+            try:
+                renew_item_leases(job_id)
+            except sqlite3.Error as e:
+                log(f"[QUEUE] Could not renew item leases: {str(e)}")
+
+    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+    heartbeat_thread.start()
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stopped.set()
+    heartbeat_thread.join()
+
+    progress = get_job_progress(job_id)
+
+    conn = get_queue_connection()
+    status = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()['status']
+    conn.close()
+    if status != CANCELLED and progress[PENDING] == 0 and progress[RUNNING] == 0:
+        _set_job_status(job_id, DONE)
+
+    return progress
+
+
+def prepare_job(kind: str, games_to_sync: Callable[[], List[Dict]], force_new: bool = False,
+                log: Callable[[str], None] = print) -> Optional[int]:
+    """
+    Resume the unfinished job of this kind, or create a new one.
+
+    Args:
+        kind: Job kind
+        games_to_sync: Function returning the games for a new job
+        force_new: Cancel any unfinished job and start from scratch
+        log: Logging function
+
+    Returns:
+        int: Job ID, or None if there is nothing to do
+    """
+    if force_new:
+        cancel_unfinished_jobs(kind)
+    else:
+        job = get_unfinished_job(kind)
+        if job:
+            progress = get_job_progress(job['id'])
+            log(f"[QUEUE] Resuming job #{job['id']}: {progress[DONE]}/{progress['total']} already done")
+            return job['id']
+
+    games = games_to_sync()
+    if not games:
+        return None
+
+    job_id = create_job(kind, games)
+    log(f"[QUEUE] Created job #{job_id} with {len(games)} games")
+    return job_id
+
@@ -0,0 +1,522 @@
+"""
+Versioned schema migrations for the library database
+Tracks the schema version in PRAGMA user_version, applies each pending migration
+once and in order inside its own transaction, and runs data backfills in chunks
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+BACKFILL_BATCH_SIZE = 500  # Rows updated per backfill transaction
+BACKFILL_PAUSE = 0.05      # Seconds between batches, leaving room for the app's own writes
+
+# Managed indexes on the games table (name -> definition).
+# Changing this set needs a new migration calling _sync_games_indexes().
+# The partial indexes must keep the exact WHERE clause of the queries they serve.
+GAMES_INDEXES = {
+    # Sync work queues
+    'idx_games_rawg_unsynced': "ON games(id) WHERE rawg__synced = 0 OR rawg__synced IS NULL",
+    'idx_games_igdb_unsynced': "ON games(id) WHERE igdb__synced = 0 OR igdb__synced IS NULL",
+    'idx_games_rawg_incomplete': "ON games(id) WHERE rawg__incomplete IS NOT NULL AND rawg__incomplete != '[]'",
+    # Player count filters
+    'idx_games_local_players': "ON games(rawg__local_players_max)",
+    'idx_games_online_players': "ON games(rawg__online_players_max)",
+    # Sort orders
+    'idx_games_rating': "ON games(rawg__rating)",
+    'idx_games_released': "ON games(rawg__released)"
+}
+
+# (version, description, function(cursor)), in order
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+
+def migration(version: int, description: str):
+    """Register a schema migration. Versions must be added in increasing order, never edited once shipped."""
+    def register(function: Callable) -> Callable:
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} registered out of order")
+        MIGRATIONS.append((version, description, function))
+        return function
+    return register
+
+
+def _add_missing_columns(cursor, table: str, columns: Dict[str, str]):
+    """Add columns to a table that predates them (databases created before migrations existed may have them)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+
+    for name, column_type in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+
+def _sync_games_indexes(cursor):
+    """Create missing managed indexes and drop idx_games_* indexes no longer listed."""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'games' AND name LIKE 'idx_games_%'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    for name in existing - set(GAMES_INDEXES):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for name, definition in GAMES_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+
+
+def schedule_backfill(cursor, name: str, table: str, set_clause: str, where_clause: str):
+    """
+    Queue a data backfill from inside a migration.
+
+    The migration itself stays fast (schema only); run_pending_backfills() then
+    updates the matching rows in small batches while the app keeps running.
+
+    Args:
+        cursor: Migration cursor
+        name: Unique backfill name
+        table: Table to update
+        set_clause: SQL assignments, e.g. "igdb__cover_image_id = json_extract(igdb__cover, '$.image_id')"
+        where_clause: SQL condition selecting rows that still need the backfill
+    """
+    cursor.execute("""
+        INSERT OR IGNORE INTO schema_backfills (name, table_name, set_clause, where_clause)
+        VALUES (?, ?, ?, ?)
+    """, (name, table, set_clause, where_clause))
+
+
+# ===== MIGRATIONS =====
+
+@migration(1, "Initial games table")
+def _create_games(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS games (
+            -- Primary Key
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+            -- ===== EPIC GAMES DATA (from parser) =====
+            title TEXT NOT NULL UNIQUE,
+            epic_id TEXT,
+            epic_added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            -- ===== RAWG API DATA (from sync) =====
+            -- Basic Info
+            rawg__id INTEGER,
+            rawg__slug TEXT,
+            rawg__name TEXT,
+            rawg__name_original TEXT,
+            rawg__description TEXT,
+            rawg__description_raw TEXT,
+
+            -- Dates
+            rawg__released TEXT,
+            rawg__tba BOOLEAN,
+            rawg__updated TEXT,
+
+            -- Ratings & Reviews
+            rawg__rating REAL,
+            rawg__rating_top INTEGER,
+            rawg__ratings TEXT,
+            rawg__ratings_count INTEGER,
+            rawg__reviews_count INTEGER,
+            rawg__reviews_text_count INTEGER,
+            rawg__metacritic INTEGER,
+            rawg__metacritic_url TEXT,
+            rawg__metacritic_platforms TEXT,
+
+            -- Player Counts (KEY FEATURE!)
+            rawg__local_players_min INTEGER,
+            rawg__local_players_max INTEGER,
+            rawg__online_players_min INTEGER,
+            rawg__online_players_max INTEGER,
+
+            -- Statistics
+            rawg__playtime INTEGER,
+            rawg__added INTEGER,
+            rawg__added_by_status TEXT,
+            rawg__suggestions_count INTEGER,
+
+            -- Content Counts
+            rawg__achievements_count INTEGER,
+            rawg__screenshots_count INTEGER,
+            rawg__movies_count INTEGER,
+            rawg__creators_count INTEGER,
+            rawg__additions_count INTEGER,
+            rawg__game_series_count INTEGER,
+            rawg__parents_count INTEGER,
+
+            -- Media & Images
+            rawg__background_image TEXT,
+            rawg__background_image_additional TEXT,
+            rawg__screenshots TEXT,
+            rawg__trailers TEXT,
+
+            -- Classifications
+            rawg__genres TEXT,
+            rawg__tags TEXT,
+            rawg__platforms TEXT,
+            rawg__parent_platforms TEXT,
+            rawg__esrb_rating TEXT,
+
+            -- Achievements
+            rawg__achievements TEXT,
+
+            -- Store Links
+            rawg__stores TEXT,
+            rawg__website TEXT,
+
+            -- Development
+            rawg__developers TEXT,
+            rawg__publishers TEXT,
+            rawg__creators TEXT,
+
+            -- Community
+            rawg__reddit_url TEXT,
+            rawg__reddit_name TEXT,
+            rawg__reddit_description TEXT,
+            rawg__reddit_logo TEXT,
+            rawg__reddit_count INTEGER,
+            rawg__twitch_count INTEGER,
+            rawg__youtube_count INTEGER,
+
+            -- Additional Data
+            rawg__alternative_names TEXT,
+            rawg__reactions TEXT,
+
+            -- Sync Status
+            rawg__synced BOOLEAN DEFAULT 0,
+            rawg__synced_at TIMESTAMP,
+
+            -- ===== IGDB API DATA =====
+            -- Basic Info
+            igdb__id INTEGER,
+            igdb__name TEXT,
+            igdb__slug TEXT,
+            igdb__summary TEXT,
+            igdb__storyline TEXT,
+            igdb__url TEXT,
+
+            -- Dates
+            igdb__first_release_date INTEGER,
+            igdb__created_at INTEGER,
+            igdb__updated_at INTEGER,
+
+            -- Ratings
+            igdb__rating REAL,
+            igdb__rating_count INTEGER,
+            igdb__total_rating REAL,
+            igdb__total_rating_count INTEGER,
+            igdb__aggregated_rating REAL,
+            igdb__aggregated_rating_count INTEGER,
+            igdb__hypes INTEGER,
+            igdb__follows INTEGER,
+
+            -- Classification
+            igdb__category INTEGER,
+            igdb__status INTEGER,
+            igdb__version_title TEXT,
+
+            -- Media
+            igdb__cover TEXT,
+            igdb__artworks TEXT,
+            igdb__screenshots TEXT,
+            igdb__videos TEXT,
+
+            -- Game Info
+            igdb__genres TEXT,
+            igdb__themes TEXT,
+            igdb__game_modes TEXT,
+            igdb__player_perspectives TEXT,
+            igdb__keywords TEXT,
+            igdb__platforms TEXT,
+            igdb__alternative_names TEXT,
+
+            -- Multiplayer
+            igdb__multiplayer_modes TEXT,
+
+            -- Companies
+            igdb__involved_companies TEXT,
+            igdb__developers TEXT,
+            igdb__publishers TEXT,
+
+            -- Ratings & Age
+            igdb__age_ratings TEXT,
+            igdb__esrb_rating TEXT,
+            igdb__pegi_rating TEXT,
+
+            -- Release Info
+            igdb__release_dates TEXT,
+
+            -- Related Games
+            igdb__similar_games TEXT,
+            igdb__dlcs TEXT,
+            igdb__expansions TEXT,
+            igdb__bundles TEXT,
+            igdb__remakes TEXT,
+            igdb__remasters TEXT,
+            igdb__franchise TEXT,
+            igdb__franchises TEXT,
+            igdb__collection TEXT,
+            igdb__collections TEXT,
+            igdb__parent_game TEXT,
+
+            -- External Links
+            igdb__websites TEXT,
+            igdb__external_games TEXT,
+
+            -- Game Engines & Localization
+            igdb__game_engines TEXT,
+            igdb__language_supports TEXT,
+
+            -- Sync Status
+            igdb__synced BOOLEAN DEFAULT 0,
+            igdb__synced_at TIMESTAMP,
+
+            -- ===== TIMESTAMPS =====
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+@migration(2, "Track RAWG sub-resources that failed to sync")
+def _add_rawg_incomplete(cursor):
+    _add_missing_columns(cursor, 'games', {'rawg__incomplete': 'TEXT'})
+
+
+@migration(3, "IGDB related games and reference data tables")
+def _create_igdb_tables(cursor):
+    # Related IGDB games (DLCs, remakes, similar games...), shared by every game referencing them
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS igdb_games (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            slug TEXT,
+            first_release_date INTEGER,
+            cover_image_id TEXT,
+            cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # IGDB reference data (genres, platforms, companies...) resolved locally from IDs
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS igdb_reference (
+            endpoint TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            name TEXT,
+            slug TEXT,
+            updated_at INTEGER,
+            PRIMARY KEY (endpoint, id)
+        )
+    """)
+
+
+@migration(4, "Scraper bookkeeping table")
+def _create_scrape_state(cursor):
+    # e.g. newest Epic purchase seen, for incremental re-scrapes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scrape_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+@migration(5, "Indexes for sync queues, player filters and sort orders")
+def _create_games_indexes(cursor):
+    _sync_games_indexes(cursor)
+
+
+@migration(6, "Store IGDB cover image IDs for sized image URLs")
+def _add_igdb_cover_image_id(cursor):
+    _add_missing_columns(cursor, 'games', {'igdb__cover_image_id': 'TEXT'})
+
+    # Covers synced earlier only kept the t_cover_big URL; recover the ID from it
+    schedule_backfill(
+        cursor, 'igdb_cover_image_id', 'games',
+        set_clause="igdb__cover_image_id = replace(substr(igdb__cover, instr(igdb__cover, '/t_cover_big/') + 13), '.jpg', '')",
+        where_clause="igdb__cover_image_id IS NULL AND igdb__cover LIKE 'https://images.igdb.com/igdb/image/upload/t_cover_big/%.jpg'"
+    )
+
+
+@migration(7, "Normalized titles for accent-insensitive library search")
+def _add_title_normalized(cursor):
+    _add_missing_columns(cursor, 'games', {'title_normalized': 'TEXT'})
+
+    # normalize_title() is registered on every connection by src/database.py
+    schedule_backfill(
+        cursor, 'title_normalized', 'games',
+        set_clause="title_normalized = normalize_title(title)",
+        where_clause="title_normalized IS NULL"
+    )
+
+
+# ===== ENGINE =====
+
+def _ensure_backfills_table(conn: sqlite3.Connection):
+    """Create the backfill bookkeeping table (outside the versioned schema, needed by the engine itself)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_backfills (
+            name TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            set_clause TEXT NOT NULL,
+            where_clause TEXT NOT NULL,
+            last_rowid INTEGER DEFAULT 0,
+            done BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the schema version stored in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def latest_version() -> int:
+    """Get the version the newest migration brings the schema to."""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def migrate(conn: sqlite3.Connection, log: Callable[[str], None] = print) -> List[int]:
+    """
+    Apply every pending migration, each in its own transaction.
+
+    Safe to call from several processes at once: each migration re-checks the
+    version after taking the write lock, so it is applied exactly once.
+
+    Args:
+        conn: Database connection
+        log: Logging function
+
+    Returns:
+        list: Versions applied by this call
+    """
+    if get_schema_version(conn) >= latest_version():
+        return []
+
+    _ensure_backfills_table(conn)
+    applied = []
+
+    for version, description, function in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            function(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        applied.append(version)
+        log(f"[OK] Database migrated to version {version}: {description}")
+
+    return applied
+
+
+def run_backfill(connect: Callable[[], sqlite3.Connection], name: str,
+                 batch_size: int = BACKFILL_BATCH_SIZE, pause: float = BACKFILL_PAUSE) -> int:
+    """
+    Run a scheduled backfill in short rowid-ordered batches.
+
+    Each batch commits on its own, so readers and the app's writes are never blocked
+    for long, and progress is saved so an interrupted backfill resumes where it stopped.
+
+    Args:
+        connect: Function opening a database connection
+        name: Backfill name given to schedule_backfill()
+        batch_size: Rows updated per transaction
+        pause: Seconds to sleep between batches
+
+    Returns:
+        int: Number of rows updated
+    """
+    conn = connect()
+    try:
+        row = conn.execute("""
+            SELECT table_name, set_clause, where_clause, last_rowid, done
+            FROM schema_backfills WHERE name = ?
+        """, (name,)).fetchone()
+        if not row or row[4]:
+            return 0
+
+        table, set_clause, where_clause, last_rowid = row[0], row[1], row[2], row[3]
+        updated = 0
+
+        while True:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(f"""
+                    SELECT rowid FROM {table}
+                    WHERE rowid > ? AND ({where_clause})
+                    ORDER BY rowid LIMIT ?
+                """, (last_rowid, batch_size))
+                rowids = [r[0] for r in cursor.fetchall()]
+
+                if not rowids:
+                    cursor.execute("""
+                        UPDATE schema_backfills SET done = 1, finished_at = CURRENT_TIMESTAMP WHERE name = ?
+                    """, (name,))
+                    conn.commit()
+                    return updated
+
+                placeholders = ','.join('?' * len(rowids))
+                cursor.execute(f"UPDATE {table} SET {set_clause} WHERE rowid IN ({placeholders})", rowids)
+                last_rowid = rowids[-1]
+                cursor.execute("UPDATE schema_backfills SET last_rowid = ? WHERE name = ?", (last_rowid, name))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            updated += len(rowids)
+            time.sleep(pause)
+    finally:
+        conn.close()
+
+
+def run_pending_backfills(connect: Callable[[], sqlite3.Connection], log: Callable[[str], None] = print,
+                          background: bool = True):
+    """
+    Run every unfinished backfill, by default in a background thread.
+
+    Args:
+        connect: Function opening a database connection
+        log: Logging function
+        background: Return immediately and backfill from a daemon thread
+    """
+    conn = connect()
+    try:
+        _ensure_backfills_table(conn)
+        names = [row[0] for row in conn.execute("SELECT name FROM schema_backfills WHERE done = 0 ORDER BY created_at")]
+    finally:
+        conn.close()
+
+    if not names:
+        return
+
+    def run():
+        for name in names:
+            try:
+                updated = run_backfill(connect, name)
+                log(f"[OK] Backfill {name} finished ({updated} rows)")
+            except Exception as e:
+                log(f"[WARN] Backfill {name} stopped, will resume on next start: {str(e)}")
+
+    if background:
+        thread = threading.Thread(target=run, name="schema-backfills", daemon=True)
+        thread.start()
+    else:
+        run()
@@ -0,0 +1,164 @@
+"""
+Managed Chrome instance for the Epic Games scraper
+Keeps one browser warm between scrapes with a persistent profile (so the Epic
+login survives restarts) and shuts it down once it has been idle for a while
+"""
+
+import atexit
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from src.database import DATA_DIR
+
+PROFILE_DIR = os.getenv("EPIC_BROWSER_PROFILE_DIR", os.path.join(DATA_DIR, "chrome_profile"))
+
+# Headless only works once the saved profile is logged in (log in once with a visible window)
+HEADLESS = os.getenv("EPIC_BROWSER_HEADLESS", "0") == "1"
+
+# Seconds an unused browser stays open before it is shut down (0 = keep it until the app exits)
+IDLE_TIMEOUT = int(os.getenv("EPIC_BROWSER_IDLE_TIMEOUT", "900"))
+
+
+class BrowserManager:
+    def __init__(self, profile_dir: str = PROFILE_DIR, headless: bool = HEADLESS, idle_timeout: int = IDLE_TIMEOUT):
+        """
+        Initialize the browser manager (Chrome is started on first acquire()).
+
+        Args:
+            profile_dir: Chrome user-data-dir kept between runs (cookies, Epic login)
+            headless: Run Chrome without a window
+            idle_timeout: Seconds before an unused browser is shut down
+        """
+        self.profile_dir = profile_dir
+        self.headless = headless
+        self.idle_timeout = idle_timeout
+
+        self.driver = None
+        self.in_use = False
+        self.started_at: Optional[float] = None
+        self.released_at: Optional[float] = None
+
+        self._lock = threading.RLock()
+        self._idle_timer: Optional[threading.Timer] = None
+
+    def _launch(self, log: Callable[[str], None]):
+        """Start Chrome with the persistent profile."""
+        # Imported here so the web app doesn't load Selenium until a scrape starts
+        import undetected_chromedriver as uc
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+
+        options = uc.ChromeOptions()
+        options.add_argument('--disable-blink-features=AutomationControlled')
+
+        log("Starting Chrome (10-20 seconds)...")
+        driver = uc.Chrome(options=options, user_data_dir=self.profile_dir,
+                           headless=self.headless, version_main=None)
+
+        self.started_at = time.time()
+        return driver
+
+    def is_healthy(self) -> bool:
+        """Check that the browser is running and still answers WebDriver commands."""
+        with self._lock:
+            if self.driver is None:
+                return False
+
+            from selenium.common.exceptions import WebDriverException
+            try:
+                return bool(self.driver.window_handles)
+            except WebDriverException:
+                return False
+
+    def acquire(self, log: Callable[[str], None] = print):
+        """
+        Get the managed browser, reusing the warm one when it is still healthy.
+
+        Args:
+            log: Logging function for startup messages
+
+        Returns:
+            WebDriver: The Chrome driver (held until release())
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+
+            if self.driver is not None and not self.is_healthy():
+                log("⚠ Previous Chrome session stopped responding, restarting it")
+                self._quit()
+
+            if self.driver is None:
+                self.driver = self._launch(log)
+            else:
+                log("✓ Reusing the already running Chrome")
+
+            self.in_use = True
+            return self.driver
+
+    def release(self):
+        """Hand the browser back; it stays warm until the idle timeout."""
+        with self._lock:
+            self.in_use = False
+            self.released_at = time.time()
+            self._cancel_idle_timer()
+
+            if self.driver is not None and self.idle_timeout > 0:
+                self._idle_timer = threading.Timer(self.idle_timeout, self._shutdown_if_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def shutdown(self):
+        """Close the browser now."""
+        with self._lock:
+            self._cancel_idle_timer()
+            self._quit()
+            self.in_use = False
+
+    def status(self) -> Dict:
+        """Describe the managed browser (for the status API)."""
+        with self._lock:
+            running = self.driver is not None
+            return {
+                'running': running,
+                'healthy': self.is_healthy() if running else False,
+                'in_use': self.in_use,
+                'headless': self.headless,
+                'profile_dir': self.profile_dir,
+                'uptime_seconds': round(time.time() - self.started_at) if running and self.started_at else None,
+                'idle_seconds': (round(time.time() - self.released_at)
+                                 if running and not self.in_use and self.released_at else None),
+                'idle_timeout': self.idle_timeout
+            }
+
+    def _shutdown_if_idle(self):
+        """Idle timer callback: close the browser unless a scrape picked it up again."""
+        with self._lock:
+            if not self.in_use:
+                self._quit()
+
+    def _cancel_idle_timer(self):
+        """Stop a pending idle shutdown."""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _quit(self):
+        """Quit Chrome, ignoring a browser that is already gone."""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+            self.started_at = None
+
+
+_browser_manager = BrowserManager()
+atexit.register(_browser_manager.shutdown)
+
+
+def get_browser_manager() -> BrowserManager:
+    """Get the process-wide browser manager."""
+    return _browser_manager
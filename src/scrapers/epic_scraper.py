@@ -5,11 +5,113 @@ Simplest scraper ever:
 3. You signal when ready
 4. It starts parsing
 """
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+import os
 import time
-import random
-from src.database import add_game
+from src.scrapers.browser import get_browser_manager
+from src.database import add_games, get_existing_titles, get_scrape_state, set_scrape_state
+from src.utils.http_client import create_session
+from src.utils.resilience import request_with_retry
+
+PURCHASES_URL = "https://www.epicgames.com/account/transactions/purchases"
+ORDER_HISTORY_URL = "https://www.epicgames.com/account/v2/payment/ajaxGetOrderHistory"
+
+# 'api' reads the order history JSON directly, 'ui' clicks through the purchases page
+SCRAPE_MODE = os.getenv("EPIC_SCRAPE_MODE", "api")
+
+# Stop re-scrapes at the first page whose purchases are all already known (set to 0 to always walk everything)
+INCREMENTAL = os.getenv("EPIC_INCREMENTAL", "1") == "1"
+SCRAPE_STATE_KEY = "epic_purchases"
+
+# Purchases page selectors, tried in order (the hashed class name changes on redesigns).
+# Override with a comma-separated EPIC_TITLE_SELECTORS.
+DEFAULT_TITLE_SELECTORS = [
+    "span.am-hoct6b",
+    "table tbody tr td:nth-child(2) span",
+    "table tbody tr td:nth-child(2)"
+]
+TITLE_SELECTORS = [selector.strip() for selector in
+                   os.getenv("EPIC_TITLE_SELECTORS", ",".join(DEFAULT_TITLE_SELECTORS)).split(",")
+                   if selector.strip()]
+ROW_SELECTOR = "table tbody tr"
+PAGE_TIMEOUT = 20  # Seconds to wait for a page to render
+THROTTLE_MARKERS = ["too many requests", "rate limit", "try again later"]
+
+# Reads every purchase row of the page in one round trip.
+# arguments[0] is the list of title selectors; returns {selector, rows} for the first one that matches.
+EXTRACT_PURCHASES_SCRIPT = """
+const selectors = arguments[0];
+const text = el => (el && (el.innerText || el.textContent) || '').trim();
+const dateLike = value => /\\d/.test(value) && !isNaN(Date.parse(value));
+
+for (const selector of selectors) {
+    let nodes;
+    try {
+        nodes = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;  // Invalid selector
+    }
+    if (!nodes.length) continue;
+
+    const rows = [];
+    for (const node of nodes) {
+        const title = text(node);
+        if (title.length < 2) continue;
+
+        const row = node.closest('tr') || node.parentElement;
+        const cells = row ? Array.from(row.querySelectorAll('td')).map(text) : [];
+        const link = row ? row.querySelector('a[href*="/p/"], a[href*="offer"]') : null;
+        const time = row ? row.querySelector('time') : null;
+        const data = row ? row.dataset : {};
+
+        rows.push({
+            title: title,
+            epic_id: data.offerId || (link ? link.getAttribute('href').split(/[/?#]/).filter(Boolean).pop() : null),
+            purchased_at: time ? (time.getAttribute('datetime') || text(time)) : (cells.find(dateLike) || null),
+            order_id: data.orderId || cells.find(cell => /^[A-Z0-9-]{10,}$/.test(cell)) || null
+        });
+    }
+    if (rows.length) return {selector: selector, rows: rows};
+}
+return {selector: null, rows: []};
+"""
+
+
+class AdaptivePacer:
+    """
+    Delay between page turns that stays at zero until Epic throttles us,
+    then backs off exponentially and decays again after successful pages.
+    """
+
+    def __init__(self, max_delay: float = 30.0, max_throttles: int = 6):
+        self.delay = 0.0
+        self.max_delay = max_delay
+        self.max_throttles = max_throttles
+        self.consecutive_throttles = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """True once throttling persisted through every backoff step."""
+        return self.consecutive_throttles >= self.max_throttles
+
+    def throttled(self):
+        """Slow down after a throttling signal."""
+        self.consecutive_throttles += 1
+        self.delay = min(self.max_delay, max(1.0, self.delay * 2))
+
+    def succeeded(self):
+        """Speed back up after a page loaded normally."""
+        self.consecutive_throttles = 0
+        self.delay = self.delay / 2 if self.delay >= 0.2 else 0.0
+
+    def wait(self):
+        """Sleep for the current delay (no-op when not throttled)."""
+        if self.delay:
+            time.sleep(self.delay)
+
 
 class SimpleEpicGamesScraper:
     def __init__(self):
@@ -31,22 +133,25 @@ class SimpleEpicGamesScraper:
         self._log("Opening Chrome...")
         self._log("")
 
-        try:
-            options = uc.ChromeOptions()
-            options.add_argument('--disable-blink-features=AutomationControlled')
+        manager = get_browser_manager()
 
-            self._log("Starting Chrome (10-20 seconds)...")
-            self.driver = uc.Chrome(options=options, version_main=None)
+        try:
+            # Warm browser with a persistent profile: reused between scrapes, login kept between runs
+            self.driver = manager.acquire(self._log)
 
-            # Go to Epic Games homepage
-            self.driver.get("https://www.epicgames.com")
+            # Go to Epic Games homepage. The browser is handed back right away so it still
+            # shuts down once idle if the user never starts parsing; start_parsing() takes it again.
+            try:
+                self.driver.get("https://www.epicgames.com")
+            finally:
+                manager.release()
 
             self._log("✓ Chrome opened!")
             self._log("")
             self._log("=" * 60)
             self._log("NOW YOU DO:")
             self._log("=" * 60)
-            self._log("1. Log into Epic Games (if not already logged in)")
+            self._log("1. Log into Epic Games (if not already logged in - the login is remembered)")
             self._log("2. Click the green 'Continue' button when ready")
             self._log("=" * 60)
             self._log("")
@@ -60,11 +165,33 @@ class SimpleEpicGamesScraper:
             self._log(f"❌ Error: {str(e)}")
             return {'success': False, 'error': str(e)}
 
-    def start_parsing(self):
-        """Start parsing from wherever the browser currently is."""
+    def start_parsing(self, mode: str = None, full_scan: bool = False):
+        """
+        Start parsing from wherever the browser currently is.
+
+        Args:
+            mode: 'api' pages the purchases JSON with the browser's session cookies,
+                  'ui' clicks through the purchases page. 'api' falls back to 'ui' on failure.
+            full_scan: Walk the whole purchase history even if an earlier scrape completed
+        """
         if not self.driver:
             return {'success': False, 'message': 'Chrome not open. Click "Open Chrome" first.'}
 
+        manager = get_browser_manager()
+        if not manager.is_healthy():
+            self.driver = None
+            return {'success': False, 'message': 'Chrome was closed or stopped responding. Click "Open Chrome" again.'}
+
+        # Hold the browser while parsing (stops its idle timer); close_chrome() hands it back
+        self.driver = manager.acquire(self._log)
+
+        mode = mode or SCRAPE_MODE
+
+        # Incremental re-scrape: purchases are listed newest first, so once a page only
+        # holds purchases we already have, every later page does too
+        last_seen = None if full_scan or not INCREMENTAL else get_scrape_state(SCRAPE_STATE_KEY)
+        stop_when = (lambda page: self._page_is_known(page, last_seen)) if last_seen else None
+
         try:
             self._log("=" * 60)
             self._log("STARTING TO PARSE")
@@ -73,129 +200,372 @@ class SimpleEpicGamesScraper:
 
             # Navigate to purchases page
             self._log("Navigating to purchases page...")
-            self.driver.get("https://www.epicgames.com/account/transactions/purchases")
+            self.driver.get(PURCHASES_URL)
 
             # Wait for page to load
-            time.sleep(5)
+            WebDriverWait(self.driver, PAGE_TIMEOUT).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
 
             current_url = self.driver.current_url
             self._log(f"Current URL: {current_url}")
             self._log("✓ You're on the purchases page!")
             self._log("")
 
-            # Parse all pages
-            all_games = []
-            page_number = 1
-
-            while True:
-                self._log(f"📄 Page {page_number}...")
-
-                # Wait a moment
-                time.sleep(random.uniform(2, 3))
+            if last_seen:
+                self._log("Incremental scrape: stopping at the first page of already-known purchases")
+                self._log("")
 
-                # Extract games
-                games_on_page = self._extract_games()
-                all_games.extend(games_on_page)
-                self._log(f"   Found {len(games_on_page)} games")
-
-                # Try to click next
+            purchases = None
+            if mode == 'api':
                 try:
-                    next_button = self.driver.find_element(By.ID, "next-btn")
-
-                    # Check if disabled
-                    button_classes = next_button.get_attribute("class")
-                    if "Mui-disabled" in button_classes:
-                        self._log("")
-                        self._log("✓ Last page reached!")
-                        break
-
-                    # Click next
-                    self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", next_button)
-                    time.sleep(random.uniform(1, 2))
-                    next_button.click()
-                    time.sleep(random.uniform(3, 4))
-                    page_number += 1
-
-                except:
+                    # An empty history usually means the endpoint didn't recognize the session
+                    purchases = self._fetch_purchases_api(stop_when) or None
+                except Exception as e:
+                    self._log(f"⚠ Purchases API failed ({str(e)}), falling back to page scraping")
                     self._log("")
-                    self._log("✓ No more pages")
-                    break
 
-            # Remove duplicates
-            unique_games = list(dict.fromkeys(all_games))
+            if purchases is None:
+                purchases = self._scrape_purchases_ui(stop_when)
+
+            # Remove duplicates (keep the first epic_id seen for each title)
+            unique_games = {}
+            for purchase in purchases:
+                if purchase['title'] and purchase['title'] not in unique_games:
+                    unique_games[purchase['title']] = purchase.get('epic_id')
 
             self._log("")
             self._log(f"✓ Total unique games: {len(unique_games)}")
             self._log("")
 
-            # Save to database
-            self._log("Saving to database...")
-            new_games_count = 0
-            existing_games_count = 0
+            result = self._save_games(unique_games)
 
-            for game_title in unique_games:
-                try:
-                    game_id, was_new = add_game(game_title)
-
-                    if was_new:
-                        new_games_count += 1
-                        self._log(f"✓ [NEW] {game_title}")
-                    else:
-                        existing_games_count += 1
-                        self._log(f"✓ [EXISTS] {game_title}")
-
-                except Exception as e:
-                    self._log(f"✗ {game_title}: {str(e)}")
-
-            total_saved = new_games_count + existing_games_count
-
-            self._log("")
-            self._log("=" * 60)
-            self._log("SUCCESS!")
-            self._log("=" * 60)
-            self._log(f"Total games found: {len(unique_games)}")
-            self._log(f"NEW games added: {new_games_count}")
-            self._log(f"Already in database: {existing_games_count}")
-            self._log(f"Total saved: {total_saved}")
-            self._log("")
+            # Remember the newest purchase so the next scrape can stop early
+            if purchases:
+                newest = purchases[0]
+                set_scrape_state(SCRAPE_STATE_KEY, {
+                    'title': newest.get('title'),
+                    'order_id': newest.get('order_id'),
+                    'purchased_at': newest.get('purchased_at'),
+                    'scraped_at': time.time()
+                })
 
-            return {
-                'success': True,
-                'games_found': len(unique_games),
-                'games_saved': total_saved,
-                'new_games': new_games_count,
-                'existing_games': existing_games_count,
-                'message': f'Successfully scraped {len(unique_games)} games! ({new_games_count} new, {existing_games_count} existing)'
-            }
+            return result
 
         except Exception as e:
             self._log("")
             self._log(f"❌ Error: {str(e)}")
             return {'success': False, 'error': str(e)}
 
+        finally:
+            # Keep Chrome warm for the next scrape; it shuts down on its own once idle
+            self.close_chrome()
+
+    def _build_api_session(self):
+        """Create a pooled HTTP session authenticated with the browser's cookies."""
+        session = create_session()
+
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'],
+                                domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+        session.headers.update({
+            'User-Agent': self.driver.execute_script("return navigator.userAgent"),
+            'Referer': PURCHASES_URL,
+            'Accept': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest'
+        })
+
+        xsrf_token = session.cookies.get('XSRF-TOKEN')
+        if xsrf_token:
+            session.headers['X-XSRF-TOKEN'] = xsrf_token
+
+        return session
+
+    def _fetch_purchases_api(self, stop_when=None):
+        """
+        Page through the order history JSON behind the purchases page.
+
+        Args:
+            stop_when: Optional function(page_purchases) -> bool ending pagination early
+
+        Returns:
+            list: Purchases as dicts with 'title', 'epic_id', 'order_id' and 'purchased_at'
+        """
+        self._log("Fetching purchases from the order history API...")
+        session = self._build_api_session()
+
+        purchases = []
+        page_token = None
+        page_number = 1
+
+        while True:
+            params = {'sortDir': 'DESC', 'sortBy': 'DATE', 'locale': 'en-US'}
+            if page_token:
+                params['nextPageToken'] = page_token
+
+            response = request_with_retry(session, 'GET', ORDER_HISTORY_URL, params=params,
+                                          timeout=15, log=self._log)
+            data = response.json()
+
+            orders = data.get('orders', [])
+            page_purchases = [
+                {
+                    'title': (item.get('description') or '').strip(),
+                    'epic_id': item.get('offerId'),
+                    'order_id': order.get('orderId'),
+                    'purchased_at': order.get('createdAtMillis')
+                }
+                for order in orders
+                for item in order.get('items', [])
+            ]
+            purchases.extend(page_purchases)
+
+            self._log(f"📄 Page {page_number}: {len(orders)} orders")
+
+            if stop_when and stop_when(page_purchases):
+                self._log("   Only known purchases on this page, stopping")
+                break
+
+            # The API pages with a cursor, so each page needs the previous one's token
+            page_token = data.get('nextPageToken')
+            if not page_token or not orders:
+                break
+            page_number += 1
+
+        self._log(f"   Found {len(purchases)} purchased items")
+        return purchases
+
+    def _scrape_purchases_ui(self, stop_when=None):
+        """
+        Click through every page of the purchases page and collect purchases.
+
+        Args:
+            stop_when: Optional function(page_purchases) -> bool ending pagination early
+        """
+        all_games = []
+        page_number = 1
+        pacer = AdaptivePacer()
+
+        while True:
+            self._log(f"📄 Page {page_number}...")
+
+            # Wait until the page's rows have rendered (later pages are already there after _next_page)
+            if not self._wait_for_rows(pacer):
+                break
+
+            # Extract games (once per page)
+            games_on_page = self._extract_games()
+            all_games.extend(games_on_page)
+            self._log(f"   Found {len(games_on_page)} games")
+
+            if stop_when and stop_when(games_on_page):
+                self._log("   Only known purchases on this page, stopping")
+                break
+
+            if not self._next_page(pacer):
+                break
+            page_number += 1
+
+        return all_games
+
+    def _wait_for_rows(self, pacer: AdaptivePacer) -> bool:
+        """
+        Wait for the current page's rows, waiting longer while Epic throttles us.
+
+        The purchases page is a single-page app: reloading it would go back to page 1,
+        so a throttled page is waited for instead of refreshed.
+
+        Returns:
+            bool: False if throttling outlasted every backoff step
+        """
+        while True:
+            try:
+                WebDriverWait(self.driver, PAGE_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(TITLE_SELECTORS)))
+                )
+                return True
+            except TimeoutException:
+                if not self._is_throttled():
+                    self._log("   No games rendered on this page")
+                    return True
+
+                pacer.throttled()
+                if pacer.exhausted:
+                    self._log("   ✗ Still throttled after backing off, stopping here")
+                    return False
+                self._log(f"   ⚠ Throttled, slowing down ({pacer.delay:.1f}s between pages)")
+                pacer.wait()
+
+    def _next_page(self, pacer: AdaptivePacer) -> bool:
+        """
+        Click next and wait for the page to change, clicking again while Epic throttles us.
+
+        Returns:
+            bool: True once the next page is shown, False on the last page or when pagination can't go on
+        """
+        first_row = self._first_row()
+
+        while True:
+            try:
+                next_button = self.driver.find_element(By.ID, "next-btn")
+
+                # Check if disabled
+                button_classes = next_button.get_attribute("class") or ""
+                if "Mui-disabled" in button_classes:
+                    self._log("")
+                    self._log("✓ Last page reached!")
+                    return False
+
+                # Click next (only pauses if Epic has been throttling us)
+                pacer.wait()
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+                next_button.click()
+            except NoSuchElementException:
+                self._log("")
+                self._log("✓ No more pages")
+                return False
+            except WebDriverException as e:
+                # Stale or covered button: keep the purchases collected so far
+                self._log(f"   ✗ Could not open the next page ({e.__class__.__name__}), stopping here")
+                return False
+
+            if first_row is None:
+                return True
+
+            # The page changed once the previous first row is gone from the DOM
+            try:
+                WebDriverWait(self.driver, PAGE_TIMEOUT).until(EC.staleness_of(first_row))
+                pacer.succeeded()
+                return True
+            except TimeoutException:
+                if not self._is_throttled():
+                    self._log("   ⚠ Page content did not change after clicking next")
+                    return False
+
+                pacer.throttled()
+                if pacer.exhausted:
+                    self._log("   ✗ Still throttled after backing off, stopping here")
+                    return False
+
+                # Still on the same page: click next again after the longer delay
+                self._log(f"   ⚠ Throttled, slowing down ({pacer.delay:.1f}s between pages)")
+
+    def _first_row(self):
+        """Get the first purchase row (or title) element, used to detect page changes."""
+        for selector in [ROW_SELECTOR] + TITLE_SELECTORS:
+            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                return elements[0]
+        return None
+
+    def _is_throttled(self) -> bool:
+        """Check whether Epic is showing a rate limit / too many requests page."""
+        try:
+            page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
+        except WebDriverException:
+            return False
+        return any(marker in page_text for marker in THROTTLE_MARKERS)
+
+    def _page_is_known(self, page, last_seen):
+        """
+        Check whether every purchase of a page was already imported.
+
+        Args:
+            page: Purchases of one page
+            last_seen: Newest purchase recorded by the previous scrape
+        """
+        if not page:
+            return False
+
+        known_titles = get_existing_titles({purchase['title'] for purchase in page if purchase.get('title')})
+
+        for purchase in page:
+            if purchase.get('title') in known_titles:
+                continue
+            # Items of the newest order seen last time count as known even without a saved title
+            # (dates alone aren't trusted: an interrupted scrape may have left older pages unsaved)
+            if last_seen.get('order_id') and purchase.get('order_id') == last_seen['order_id']:
+                continue
+            return False
+
+        return True
+
+    def _save_games(self, unique_games):
+        """
+        Save scraped games to the database in one batch.
+
+        Args:
+            unique_games: Dict of title -> epic_id (or None)
+        """
+        self._log("Saving to database...")
+
+        saved = add_games(unique_games)
+        new_titles = [title for title, (game_id, was_new) in saved.items() if was_new]
+
+        new_games_count = len(new_titles)
+        existing_games_count = len(saved) - new_games_count
+
+        for game_title in new_titles:
+            self._log(f"✓ [NEW] {game_title}")
+
+        total_saved = len(saved)
+
+        self._log("")
+        self._log("=" * 60)
+        self._log("SUCCESS!")
+        self._log("=" * 60)
+        self._log(f"Total games found: {len(unique_games)}")
+        self._log(f"NEW games added: {new_games_count}")
+        self._log(f"Already in database: {existing_games_count}")
+        self._log(f"Total saved: {total_saved}")
+        self._log("")
+
+        return {
+            'success': True,
+            'games_found': len(unique_games),
+            'games_saved': total_saved,
+            'new_games': new_games_count,
+            'existing_games': existing_games_count,
+            'message': f'Successfully scraped {len(unique_games)} games! ({new_games_count} new, {existing_games_count} existing)'
+        }
+
     def _extract_games(self):
-        """Extract game titles from current page."""
-        games = []
+        """
+        Extract the purchases of the current page with a single script call.
+
+        Returns:
+            list: Purchases as dicts with 'title', 'epic_id', 'order_id' and 'purchased_at'
+        """
         try:
-            elements = self.driver.find_elements(By.CSS_SELECTOR, "span.am-hoct6b")
-            for element in elements:
-                try:
-                    title = element.text.strip()
-                    if title and len(title) > 1:
-                        games.append(title)
-                except:
-                    continue
-        except:
-            pass
-        return games
-
-    def close_chrome(self):
-        """Close the Chrome browser."""
+            result = self.driver.execute_script(EXTRACT_PURCHASES_SCRIPT, TITLE_SELECTORS) or {}
+        except WebDriverException as e:
+            self._log(f"   ⚠ Could not read the page: {str(e)}")
+            return []
+
+        selector = result.get('selector')
+        if selector and selector != TITLE_SELECTORS[0]:
+            self._log(f"   ⚠ Primary title selector found nothing, used fallback '{selector}'")
+
+        return result.get('rows') or []
+
+    def close_chrome(self, shutdown: bool = False):
+        """
+        Hand the Chrome browser back to the browser manager.
+
+        Args:
+            shutdown: Quit Chrome now instead of keeping it warm until the idle timeout
+        """
+        manager = get_browser_manager()
+
+        if shutdown:
+            manager.shutdown()
+        elif self.driver:
+            manager.release()
+
         if self.driver:
-            self._log("Closing Chrome...")
-            self.driver.quit()
             self.driver = None
-            self._log("✓ Chrome closed")
+            self._log("✓ Chrome closed" if shutdown else "✓ Chrome released (kept warm for the next scrape)")
             return {'success': True, 'message': 'Chrome closed'}
         return {'success': False, 'message': 'Chrome not open'}
 
@@ -207,12 +577,12 @@ def open_chrome_browser(callback=None):
     _scraper.set_callback(callback)
     return _scraper.open_chrome()
 
-def start_parsing_now(callback=None):
+def start_parsing_now(callback=None, mode=None, full_scan=False):
     """Start parsing - Step 2."""
     _scraper.set_callback(callback)
-    return _scraper.start_parsing()
+    return _scraper.start_parsing(mode=mode, full_scan=full_scan)
 
-def close_chrome_browser(callback=None):
+def close_chrome_browser(callback=None, shutdown=False):
     """Close Chrome."""
     _scraper.set_callback(callback)
-    return _scraper.close_chrome()
+    return _scraper.close_chrome(shutdown=shutdown)
@@ -0,0 +1,115 @@
+"""
+IGDB OAuth Token Store
+Shares the Twitch app access token across every IGDBSyncer in the process and
+persists it to disk, so per-game IGDB actions don't pay an OAuth round trip
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from src.database import DATA_DIR
+
+TOKEN_FILE = os.path.join(DATA_DIR, "igdb_token.json")
+REFRESH_MARGIN = 3600  # Refresh tokens this many seconds before they expire
+
+
+class IGDBTokenStore:
+    def __init__(self, path: str = TOKEN_FILE):
+        """
+        Initialize the token store.
+
+        Args:
+            path: JSON file the tokens are persisted to (readable by the owner only)
+        """
+        self.path = path
+        self._tokens: Dict[str, Dict] = {}  # client_id -> {'access_token', 'expires_at', 'refresh_at'}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        """Load persisted tokens (picks up tokens refreshed by other processes)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._tokens = json.load(f)
+        except (OSError, ValueError):
+            self._tokens = self._tokens or {}
+        self._loaded = True
+
+    def _save(self):
+        """Persist tokens atomically with owner-only permissions."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._tokens, f)
+        os.replace(temp_path, self.path)
+        os.chmod(self.path, 0o600)
+
+    @staticmethod
+    def _is_fresh(token: Optional[Dict]) -> bool:
+        """Return True if the token does not need refreshing yet."""
+        return bool(token) and time.time() < token['refresh_at']
+
+    def get_token(self, client_id: str, fetch: Callable[[], Tuple[str, int]]) -> Dict:
+        """
+        Get a valid access token, refreshing it proactively before it expires.
+
+        Concurrent callers needing a refresh wait for a single fetch instead of
+        each authenticating on their own.
+
+        Args:
+            client_id: IGDB Client ID the token belongs to
+            fetch: Function requesting a new token, returning (access_token, expires_in)
+
+        Returns:
+            dict: {'access_token': str, 'expires_at': float}
+        """
+        token = self._tokens.get(client_id)
+        if self._is_fresh(token):
+            return token
+
+        with self._lock:
+            if not self._loaded or not self._is_fresh(self._tokens.get(client_id)):
+                self._load()
+
+            token = self._tokens.get(client_id)
+            if self._is_fresh(token):
+                return token
+
+            access_token, expires_in = fetch()
+            now = time.time()
+            token = {
+                'access_token': access_token,
+                'expires_at': now + expires_in,
+                'refresh_at': now + expires_in - min(REFRESH_MARGIN, expires_in * 0.1)
+            }
+            self._tokens[client_id] = token
+
+            try:
+                self._save()
+            except OSError as e:
+                print(f"[WARN] Could not persist IGDB token: {str(e)}")
+
+            return token
+
+    def invalidate(self, client_id: str, access_token: str):
+        """Drop a token the API rejected so the next get_token() fetches a new one."""
+        with self._lock:
+            token = self._tokens.get(client_id)
+            if token and token['access_token'] == access_token:
+                del self._tokens[client_id]
+                try:
+                    self._save()
+                except OSError:
+                    pass
+
+
+_token_store = IGDBTokenStore()
+
+
+def get_token_store() -> IGDBTokenStore:
+    """Get the process-wide IGDB token store."""
+    return _token_store
@@ -0,0 +1,113 @@
+"""
+IGDB Image URLs
+Builds IGDB image URLs from stored image IDs, picking the size variant for where
+an image is shown, so cards and thumbnails don't download full-size covers
+"""
+
+import re
+from typing import Dict, List, Optional
+
+IGDB_IMAGE_URL = "https://images.igdb.com/igdb/image/upload/{size}/{image_id}.jpg"
+
+# Size variant -> width in pixels (see https://api-docs.igdb.com/#images)
+IGDB_IMAGE_WIDTHS = {
+    't_thumb': 90,
+    't_cover_small': 90,
+    't_cover_small_2x': 180,
+    't_cover_big': 264,
+    't_cover_big_2x': 528,
+    't_screenshot_med': 569,
+    't_screenshot_big': 889,
+    't_screenshot_huge': 1280,
+    't_720p': 1280,
+    't_1080p': 1920
+}
+
+# Rendering context -> (default size, srcset sizes)
+IMAGE_CONTEXTS = {
+    'card': ('t_cover_big', ['t_cover_small', 't_cover_small_2x', 't_cover_big', 't_cover_big_2x']),
+    'detail': ('t_cover_big_2x', ['t_cover_big', 't_cover_big_2x', 't_720p']),
+    'thumbnail': ('t_screenshot_med', ['t_screenshot_med', 't_screenshot_big']),
+    'fullscreen': ('t_1080p', ['t_720p', 't_1080p'])
+}
+
+_IMAGE_ID_PATTERN = re.compile(r"/t_[a-z0-9_]+/([A-Za-z0-9_]+)\.(?:jpg|png|webp)$")
+
+
+def igdb_image_url(image_id: str, size: str = 't_cover_big') -> str:
+    """
+    Build an IGDB image URL.
+
+    Args:
+        image_id: IGDB image ID (e.g. 'co1wyy')
+        size: Size variant from IGDB_IMAGE_WIDTHS
+    """
+    if size not in IGDB_IMAGE_WIDTHS:
+        raise ValueError(f"Unknown IGDB image size: {size}")
+    return IGDB_IMAGE_URL.format(size=size, image_id=image_id)
+
+
+def image_id_from_url(url: Optional[str]) -> Optional[str]:
+    """Get the image ID back from an IGDB image URL (for data stored before image IDs were)."""
+    if not url or 'images.igdb.com' not in url:
+        return None
+    match = _IMAGE_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def image_variants(image_id: str, context: str) -> Dict[str, str]:
+    """
+    Get the src and srcset of an image for a rendering context.
+
+    Args:
+        image_id: IGDB image ID
+        context: 'card', 'detail', 'thumbnail' or 'fullscreen'
+
+    Returns:
+        dict: {'src': default URL, 'srcset': '<url> <width>w, ...'}
+    """
+    default, sizes = IMAGE_CONTEXTS[context]
+    return {
+        'src': igdb_image_url(image_id, default),
+        'srcset': ', '.join(f"{igdb_image_url(image_id, size)} {IGDB_IMAGE_WIDTHS[size]}w" for size in sizes)
+    }
+
+
+def add_image_variants(game: Dict, detail: bool = False) -> Dict:
+    """
+    Add sized image URLs to a game read from the database, in place.
+
+    Adds 'igdb__cover_images' ({'card': {...}, 'detail': {...}}). With detail=True,
+    each IGDB screenshot and artwork also gets an 'images' entry
+    ({'thumbnail': {...}, 'fullscreen': {...}}).
+
+    Args:
+        game: Game dict
+        detail: Also add screenshot and artwork variants (left out of library lists to keep them small)
+
+    Returns:
+        dict: The same game
+    """
+    cover_id = game.get('igdb__cover_image_id') or image_id_from_url(game.get('igdb__cover'))
+    if cover_id:
+        game['igdb__cover_images'] = {
+            'card': image_variants(cover_id, 'card'),
+            'detail': image_variants(cover_id, 'detail')
+        }
+
+    if not detail:
+        return game
+
+    for field in ('igdb__screenshots', 'igdb__artworks'):
+        images: List = game.get(field) or []
+        for image in images:
+            if not isinstance(image, dict):
+                continue
+            image_id = image.get('image_id') or image_id_from_url(image.get('url'))
+            if image_id:
+                image['images'] = {
+                    'thumbnail': image_variants(image_id, 'thumbnail'),
+                    'fullscreen': image_variants(image_id, 'fullscreen')
+                }
+
+    return game
@@ -0,0 +1,162 @@
+"""
+IGDB Reference Data Cache
+Keeps genres, platforms, themes, game modes, perspectives, engines and companies
+in a local table so game queries only fetch IDs and resolve names locally
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List
+
+from src.database import (get_igdb_reference_entities, upsert_igdb_reference_entities,
+                          get_igdb_reference_max_updated_at)
+
+REFRESH_INTERVAL = 24 * 3600  # Re-check small tables for updates once a day
+PAGE_SIZE = 500               # IGDB maximum rows per query
+
+# Small tables loaded in full, then refreshed by updated_at
+BULK_ENDPOINTS = ['genres', 'themes', 'game_modes', 'player_perspectives', 'platforms', 'game_engines']
+
+# Game field -> reference endpoint it points to
+GAME_FIELD_ENDPOINTS = {
+    'genres': 'genres',
+    'themes': 'themes',
+    'game_modes': 'game_modes',
+    'player_perspectives': 'player_perspectives',
+    'platforms': 'platforms',
+    'game_engines': 'game_engines'
+}
+
+
+class IGDBReferenceCache:
+    def __init__(self):
+        """Initialize the cache (entities are loaded from the database on first use)."""
+        self._entities: Dict[str, Dict[int, Dict]] = {}  # endpoint -> id -> {'id', 'name', 'slug'}
+        self._refreshed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _get_entities(self, endpoint: str) -> Dict[int, Dict]:
+        """Get the in-memory entities of an endpoint, loading them from the database once."""
+        if endpoint not in self._entities:
+            self._entities[endpoint] = get_igdb_reference_entities(endpoint)
+        return self._entities[endpoint]
+
+    def _store(self, endpoint: str, rows: List[Dict]):
+        """Save fetched entities to the database and memory (caller holds the lock)."""
+        entities = [
+            {
+                'endpoint': endpoint,
+                'id': row.get('id'),
+                'name': row.get('name'),
+                'slug': row.get('slug'),
+                'updated_at': row.get('updated_at')
+            }
+            for row in rows
+        ]
+        upsert_igdb_reference_entities(entities)
+
+        cache = self._get_entities(endpoint)
+        for entity in entities:
+            cache[entity['id']] = {'id': entity['id'], 'name': entity['name'], 'slug': entity['slug']}
+
+    def refresh(self, endpoint: str, post: Callable[[str, str], List[Dict]]) -> int:
+        """
+        Load new and updated entities of a small table, page by page.
+
+        Args:
+            endpoint: IGDB endpoint (e.g. 'genres')
+            post: Function sending an Apicalypse query: post(endpoint, body) -> rows
+
+        Returns:
+            int: Number of entities fetched
+        """
+        since = get_igdb_reference_max_updated_at(endpoint)
+        fetched = 0
+        offset = 0
+
+        while True:
+            body = (f"fields id,name,slug,updated_at; where updated_at > {since}; "
+                    f"sort id asc; limit {PAGE_SIZE}; offset {offset};")
+            rows = post(endpoint, body)
+            self._store(endpoint, rows)
+            fetched += len(rows)
+
+            if len(rows) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+
+        self._refreshed_at[endpoint] = time.time()
+        return fetched
+
+    def ensure_loaded(self, post: Callable[[str, str], List[Dict]]):
+        """Refresh the small tables that haven't been checked recently."""
+        with self._lock:
+            for endpoint in BULK_ENDPOINTS:
+                if time.time() - self._refreshed_at.get(endpoint, 0) >= REFRESH_INTERVAL:
+                    self.refresh(endpoint, post)
+
+    def _fetch_missing(self, endpoint: str, ids: Iterable[int], post: Callable[[str, str], List[Dict]]):
+        """
+        Fetch entities that aren't cached yet by ID, in batches.
+
+        The lock is only held to find the missing IDs and to store the results, so other
+        sync workers resolve their games while this one waits on IGDB.
+        """
+        with self._lock:
+            cache = self._get_entities(endpoint)
+            missing = sorted({i for i in ids if isinstance(i, int) and i not in cache})
+
+        for start in range(0, len(missing), PAGE_SIZE):
+            chunk = missing[start:start + PAGE_SIZE]
+            body = f"fields id,name,slug,updated_at; where id = ({','.join(str(i) for i in chunk)}); limit {PAGE_SIZE};"
+            rows = post(endpoint, body)
+
+            with self._lock:
+                self._store(endpoint, rows)
+
+    def _lookup(self, endpoint: str, value):
+        """Replace an entity ID by its cached {'id', 'name', 'slug'} (unknown IDs stay as-is)."""
+        if isinstance(value, int):
+            return self._get_entities(endpoint).get(value, value)
+        return value
+
+    def resolve(self, game_data: Dict, post: Callable[[str, str], List[Dict]]) -> Dict:
+        """
+        Replace reference IDs in a game returned by IGDB with cached entities, in place.
+
+        Args:
+            game_data: Game fetched with ID-only reference fields
+            post: Function sending an Apicalypse query: post(endpoint, body) -> rows
+
+        Returns:
+            dict: The same game_data, with names resolved
+        """
+        self.ensure_loaded(post)
+
+        # IDs missing from a small table are entities created since the last refresh
+        for field, endpoint in GAME_FIELD_ENDPOINTS.items():
+            if game_data.get(field):
+                self._fetch_missing(endpoint, game_data[field], post)
+
+        # Companies are too many to bulk-load; only fetch the ones games reference
+        company_ids = [ic.get('company') for ic in game_data.get('involved_companies') or []
+                       if isinstance(ic, dict)]
+        self._fetch_missing('companies', company_ids, post)
+
+        for field, endpoint in GAME_FIELD_ENDPOINTS.items():
+            if game_data.get(field):
+                game_data[field] = [self._lookup(endpoint, value) for value in game_data[field]]
+
+        for involved in game_data.get('involved_companies') or []:
+            if isinstance(involved, dict):
+                involved['company'] = self._lookup('companies', involved.get('company'))
+
+        return game_data
+
+
+_reference_cache = IGDBReferenceCache()
+
+
+def get_reference_cache() -> IGDBReferenceCache:
+    """Get the process-wide IGDB reference data cache."""
+    return _reference_cache
@@ -1,20 +1,83 @@
-import requests
-import time
 import os
-from typing import Dict, Optional, List, Callable
-from dotenv import load_dotenv
+from typing import Dict, Optional, List, Callable, Tuple
+from src.utils.resilience import request_with_retry, PermanentAPIError
+from src.utils.http_client import get_session
+from src.utils.metrics import pause
+from src.sync.igdb_auth import get_token_store
+from src.sync.igdb_reference import get_reference_cache
+from src.sync.igdb_images import igdb_image_url
+from src.job_queue import prepare_job, run_job, get_job_progress, get_failed_items, PENDING, RUNNING, DONE, FAILED
+from src.image_cache import prefetch_game_images
+from src.utils.env import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # IGDB API configuration
 IGDB_CLIENT_ID = os.getenv("IGDB_CLIENT_ID", "")
 IGDB_CLIENT_SECRET = os.getenv("IGDB_CLIENT_SECRET", "")
-IGDB_BASE_URL = "https://api.igdb.com/v4"
-TWITCH_AUTH_URL = "https://id.twitch.tv/oauth2/token"
+IGDB_BASE_URL = os.getenv("IGDB_BASE_URL", "https://api.igdb.com/v4")
+TWITCH_AUTH_URL = os.getenv("TWITCH_AUTH_URL", "https://id.twitch.tv/oauth2/token")
+# Delay after each synced game (IGDB allows 4 requests per second), longer after a failure
+REQUEST_DELAY = float(os.getenv("IGDB_REQUEST_DELAY", "0.3"))
+FAILED_REQUEST_DELAY = float(os.getenv("IGDB_FAILED_REQUEST_DELAY", "0.5"))
+SYNC_WORKERS = int(os.getenv("IGDB_SYNC_WORKERS", "1"))  # Parallel queue workers
+
+# Field profiles: request only what is stored instead of expanding every relation.
+# Reference data (genres, platforms, companies...) is fetched as IDs and resolved
+# through the local reference cache; related games (DLCs, remakes, similar
+# games...) are fetched as IDs and cached once in the shared igdb_games table.
+_MINIMAL_FIELDS = [
+    'id', 'name', 'slug', 'first_release_date', 'cover.image_id'
+]
+
+_CARD_FIELDS = _MINIMAL_FIELDS + [
+    'summary', 'rating', 'rating_count', 'total_rating', 'total_rating_count',
+    'genres', 'platforms', 'game_modes'
+]
+
+_FULL_FIELDS = _CARD_FIELDS + [
+    # Basic info & dates
+    'storyline', 'url', 'created_at', 'updated_at',
+    # Ratings
+    'aggregated_rating', 'aggregated_rating_count', 'hypes', 'follows',
+    # Classification
+    'category', 'status', 'version_title',
+    # Media
+    'artworks.image_id', 'screenshots.image_id', 'videos.name', 'videos.video_id',
+    # Game info
+    'themes', 'player_perspectives', 'keywords.name', 'alternative_names.name',
+    # Multiplayer
+    'multiplayer_modes.*',
+    # Companies
+    'involved_companies.developer', 'involved_companies.publisher', 'involved_companies.company',
+    # Ratings & age
+    'age_ratings.category', 'age_ratings.rating',
+    # Release info
+    'release_dates.date', 'release_dates.human', 'release_dates.region', 'release_dates.platform.name',
+    # Related games (IDs only)
+    'similar_games', 'dlcs', 'expansions', 'bundles', 'remakes', 'remasters',
+    'franchise.name', 'franchises.name', 'collection.name', 'collections.name', 'parent_game.name',
+    # External links
+    'websites.category', 'websites.url',
+    'external_games.category', 'external_games.uid', 'external_games.url',
+    # Engines & localization
+    'game_engines', 'language_supports.language.name', 'language_supports.language_support_type.name'
+]
+
+IGDB_FIELD_PROFILES = {
+    'minimal': _MINIMAL_FIELDS,
+    'card': _CARD_FIELDS,
+    'full': _FULL_FIELDS
+}
+IGDB_FIELD_PROFILE = os.getenv("IGDB_FIELD_PROFILE", "full")
+
+# Fields holding related game IDs, cached in the shared igdb_games table
+RELATED_GAME_FIELDS = ['similar_games', 'dlcs', 'expansions', 'bundles', 'remakes', 'remasters']
 
 class IGDBSyncer:
-    def __init__(self, client_id: str = None, client_secret: str = None, callback=None):
+    def __init__(self, client_id: str = None, client_secret: str = None, callback=None,
+                 field_profile: str = None):
         """
         Initialize the IGDB API syncer.
 
@@ -22,13 +85,17 @@ class IGDBSyncer:
             client_id: IGDB Client ID (from Twitch Developer Portal)
             client_secret: IGDB Client Secret (from Twitch Developer Portal)
             callback: Optional function to call with status updates
+            field_profile: Default field profile for get_game_details ('minimal', 'card' or 'full')
         """
         self.client_id = client_id or IGDB_CLIENT_ID
         self.client_secret = client_secret or IGDB_CLIENT_SECRET
         self.callback = callback
+        self.field_profile = field_profile or IGDB_FIELD_PROFILE
+        if self.field_profile not in IGDB_FIELD_PROFILES:
+            raise ValueError(f"Unknown IGDB field profile: {self.field_profile}")
         self.access_token = None
         self.token_expires_at = 0
-        self.session = requests.Session()
+        self.session = get_session()
 
     def _log(self, message):
         """Send status updates via callback."""
@@ -41,149 +108,178 @@ class IGDBSyncer:
         Authenticate with IGDB using Twitch OAuth2.
 
         Returns:
-            bool: True if authentication successful, False otherwise
+            bool: True if authentication successful, False if credentials aren't configured
+
+        Raises:
+            TransientAPIError: Twitch is unreachable or rate limiting, so authentication should be retried later
+            PermanentAPIError: Twitch rejected the credentials
         """
         if not self.client_id or not self.client_secret:
             self._log("ERROR: IGDB Client ID and Secret not configured in .env file")
             return False
 
-        if self.access_token and time.time() < self.token_expires_at:
-            return True  # Token still valid
+        token = get_token_store().get_token(self.client_id, self._request_token)
+        self.access_token = token['access_token']
+        self.token_expires_at = token['expires_at']
+        return True
+
+    def _request_token(self) -> Tuple[str, int]:
+        """
+        Request a new app access token from Twitch.
 
+        Only called by the shared token store when no valid token is cached.
+
+        Returns:
+            tuple: (access_token, expires_in seconds)
+
+        Raises:
+            TransientAPIError: Twitch is unreachable or rate limiting
+            PermanentAPIError: Twitch rejected the credentials or sent no token
+        """
         self._log("Authenticating with IGDB...")
 
-        try:
-            response = requests.post(
-                TWITCH_AUTH_URL,
-                params={
-                    'client_id': self.client_id,
-                    'client_secret': self.client_secret,
-                    'grant_type': 'client_credentials'
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            self.access_token = data.get('access_token')
-            expires_in = data.get('expires_in', 0)
-            self.token_expires_at = time.time() + expires_in
-
-            self._log(f"✓ Authenticated successfully (token expires in {expires_in} seconds)")
-            return True
-
-        except Exception as e:
-            self._log(f"ERROR: Authentication failed: {str(e)}")
-            return False
+        response = request_with_retry(
+            self.session, 'POST',
+            TWITCH_AUTH_URL,
+            params={
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+                'grant_type': 'client_credentials'
+            },
+            timeout=10,
+            log=self._log
+        )
+
+        data = response.json()
+        access_token = data.get('access_token')
+        expires_in = data.get('expires_in', 0)
+        if not access_token:
+            raise PermanentAPIError("Twitch response did not contain an access token")
+
+        self._log(f"✓ Authenticated successfully (token expires in {expires_in} seconds)")
+        return access_token, expires_in
+
+    def _post(self, url: str, body: str, timeout: int = 10) -> List[Dict]:
+        """
+        POST an Apicalypse query through the resilient request layer.
 
-    def get_game_details(self, game_id: int) -> Optional[Dict]:
+        Re-authenticates once if IGDB rejects the token (e.g. revoked before its expiry).
         """
-        Get ALL detailed information about a game from IGDB with expanded fields.
+        for attempt in range(2):
+            headers = {
+                'Client-ID': self.client_id,
+                'Authorization': f'Bearer {self.access_token}',
+                'Accept': 'application/json'
+            }
+
+            try:
+                response = request_with_retry(self.session, 'POST', url, headers=headers, data=body,
+                                              timeout=timeout, log=self._log)
+                return response.json()
+            except PermanentAPIError as e:
+                if e.status_code != 401 or attempt > 0:
+                    raise
+                get_token_store().invalidate(self.client_id, self.access_token)
+                if not self.authenticate():
+                    raise
+
+    def _post_endpoint(self, endpoint: str, body: str) -> List[Dict]:
+        """POST an Apicalypse query to an IGDB endpoint by name (e.g. 'genres')."""
+        return self._post(f"{IGDB_BASE_URL}/{endpoint}", body)
+
+    def get_game_details(self, game_id: int, profile: str = None) -> Optional[Dict]:
+        """
+        Get detailed information about a game from IGDB.
 
         Args:
             game_id: IGDB game ID
+            profile: Field profile ('minimal', 'card' or 'full'), defaults to the syncer's profile
 
         Returns:
-            dict: Complete game information with all fields expanded, or None if error
+            dict: Game information with the profile's fields, or None if error
+
+        Raises:
+            TransientAPIError: IGDB is unreachable or rate limiting, so the fetch should be retried later
+            PermanentAPIError: Twitch rejected the IGDB credentials
         """
         if not self.authenticate():
             return None
 
-        self._log(f"Fetching ALL details for IGDB game ID: {game_id}")
+        profile = profile or self.field_profile
+        self._log(f"Fetching '{profile}' details for IGDB game ID: {game_id}")
 
         try:
             url = f"{IGDB_BASE_URL}/games"
-            headers = {
-                'Client-ID': self.client_id,
-                'Authorization': f'Bearer {self.access_token}',
-                'Accept': 'application/json'
-            }
+            # Request only the fields the profile needs; related games come back as IDs
+            fields = ','.join(IGDB_FIELD_PROFILES[profile])
+            body = f"fields {fields}; where id = {game_id};"
 
-            # Get ALL fields with FULL expansion of all related entities
-            # Use wildcard (*) for base fields and expand all arrays/references
-            body = f"""
-                fields *,
-                age_ratings.*,
-                age_ratings.content_descriptions.*,
-                age_ratings.rating_cover_url,
-                alternative_names.*,
-                artworks.*,
-                bundles.*,
-                category,
-                checksum,
-                collection.*,
-                collections.*,
-                cover.*,
-                created_at,
-                dlcs.*,
-                expanded_games.*,
-                expansions.*,
-                external_games.*,
-                first_release_date,
-                follows,
-                forks.*,
-                franchise.*,
-                franchises.*,
-                game_engines.*,
-                game_localizations.*,
-                game_modes.*,
-                genres.*,
-                hypes,
-                involved_companies.*,
-                involved_companies.company.*,
-                keywords.*,
-                language_supports.*,
-                language_supports.language.*,
-                language_supports.language_support_type.*,
-                multiplayer_modes.*,
-                name,
-                parent_game.*,
-                platforms.*,
-                platforms.platform_logo.*,
-                player_perspectives.*,
-                ports.*,
-                rating,
-                rating_count,
-                release_dates.*,
-                release_dates.platform.*,
-                remakes.*,
-                remasters.*,
-                screenshots.*,
-                similar_games.*,
-                slug,
-                standalone_expansions.*,
-                status,
-                storyline,
-                summary,
-                tags,
-                themes.*,
-                total_rating,
-                total_rating_count,
-                updated_at,
-                url,
-                version_parent.*,
-                version_title,
-                videos.*,
-                websites.*;
-                where id = {game_id};
-            """
-
-            response = requests.post(url, headers=headers, data=body, timeout=15)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._post(url, body, timeout=15)
 
             if data and len(data) > 0:
-                self._log(f"✓ Successfully fetched ALL game details with expanded fields")
+                # Turn genre/platform/company IDs back into names from the local cache
+                get_reference_cache().resolve(data[0], self._post_endpoint)
+                self._log(f"✓ Successfully fetched game details")
                 return data[0]
             else:
                 self._log(f"No game found with ID {game_id}")
                 return None
 
-        except Exception as e:
+        except PermanentAPIError as e:
             self._log(f"ERROR: Failed to fetch game details: {str(e)}")
             return None
 
+    def cache_related_games(self, game_data: Dict) -> int:
+        """
+        Fetch related games (DLCs, remakes, similar games...) that aren't cached yet
+        into the shared igdb_games table, in a single batched query.
+
+        Args:
+            game_data: Game data returned by get_game_details
+
+        Returns:
+            int: Number of newly cached games
+        """
+        from src.database import get_known_igdb_game_ids, upsert_igdb_games
+
+        related_ids = set()
+        for field in RELATED_GAME_FIELDS:
+            for related in game_data.get(field) or []:
+                related_ids.add(related.get('id') if isinstance(related, dict) else related)
+        related_ids.discard(None)
+
+        missing_ids = sorted(related_ids - get_known_igdb_game_ids(related_ids))
+        if not missing_ids:
+            return 0
+
+        fields = ','.join(IGDB_FIELD_PROFILES['minimal'])
+        cached = 0
+
+        # IGDB returns at most 500 rows per query
+        for start in range(0, len(missing_ids), 500):
+            chunk = missing_ids[start:start + 500]
+            body = f"fields {fields}; where id = ({','.join(str(i) for i in chunk)}); limit 500;"
+
+            try:
+                games = self._post(f"{IGDB_BASE_URL}/games", body)
+            except PermanentAPIError as e:
+                self._log(f"ERROR: Failed to fetch related games: {str(e)}")
+                continue
+
+            upsert_igdb_games([
+                {
+                    'id': g.get('id'),
+                    'name': g.get('name'),
+                    'slug': g.get('slug'),
+                    'first_release_date': g.get('first_release_date'),
+                    'cover_image_id': (g.get('cover') or {}).get('image_id')
+                }
+                for g in games
+            ])
+            cached += len(games)
+
+        return cached
+
     def search_game(self, game_title: str) -> Optional[Dict]:
         """
         Search for a game on IGDB by title and return the best match (preferring main games).
@@ -193,6 +289,10 @@ class IGDBSyncer:
 
         Returns:
             dict: Game data with just ID and name, or None if not found
+
+        Raises:
+            TransientAPIError: IGDB is unreachable or rate limiting, so the search should be retried later
+            PermanentAPIError: Twitch rejected the IGDB credentials
         """
         if not self.authenticate():
             return None
@@ -201,20 +301,11 @@ class IGDBSyncer:
 
         try:
             url = f"{IGDB_BASE_URL}/games"
-            headers = {
-                'Client-ID': self.client_id,
-                'Authorization': f'Bearer {self.access_token}',
-                'Accept': 'application/json'
-            }
-
             # Simple search - get top 5 results with just basic info
             # We'll filter for main games and fetch full details separately
             body = f'search "{game_title}"; fields id,name,category,version_parent; limit 5;'
 
-            response = requests.post(url, headers=headers, data=body, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._post(url, body, timeout=10)
 
             if not data or len(data) == 0:
                 self._log(f"No results found for: {game_title}")
@@ -235,7 +326,7 @@ class IGDBSyncer:
             self._log(f"✓ Found game: {best_match.get('name', 'Unknown')} (ID: {best_match.get('id')})")
             return best_match
 
-        except Exception as e:
+        except PermanentAPIError as e:
             self._log(f"ERROR: Search failed: {str(e)}")
             return None
 
@@ -279,12 +370,13 @@ class IGDBSyncer:
         metadata['igdb__status'] = game_data.get('status')
         metadata['igdb__version_title'] = game_data.get('version_title')
 
-        # Cover Image (convert IGDB image URL to full URL)
+        # Cover Image: the image ID is stored so the API can pick a size per context
+        # (igdb__cover keeps the t_cover_big URL for older readers)
         if game_data.get('cover'):
             cover = game_data['cover']
             if isinstance(cover, dict) and cover.get('image_id'):
-                # IGDB image URL format: https://images.igdb.com/igdb/image/upload/t_cover_big/{image_id}.jpg
-                metadata['igdb__cover'] = f"https://images.igdb.com/igdb/image/upload/t_cover_big/{cover['image_id']}.jpg"
+                metadata['igdb__cover_image_id'] = cover['image_id']
+                metadata['igdb__cover'] = igdb_image_url(cover['image_id'], 't_cover_big')
             elif isinstance(cover, dict):
                 metadata['igdb__cover'] = cover
 
@@ -294,7 +386,8 @@ class IGDBSyncer:
             for artwork in game_data['artworks']:
                 if isinstance(artwork, dict) and artwork.get('image_id'):
                     artworks.append({
-                        'url': f"https://images.igdb.com/igdb/image/upload/t_screenshot_big/{artwork['image_id']}.jpg",
+                        'url': igdb_image_url(artwork['image_id'], 't_screenshot_big'),
+                        'image_id': artwork['image_id'],
                         'id': artwork.get('id')
                     })
             metadata['igdb__artworks'] = artworks
@@ -305,7 +398,8 @@ class IGDBSyncer:
             for screenshot in game_data['screenshots']:
                 if isinstance(screenshot, dict) and screenshot.get('image_id'):
                     screenshots.append({
-                        'url': f"https://images.igdb.com/igdb/image/upload/t_screenshot_big/{screenshot['image_id']}.jpg",
+                        'url': igdb_image_url(screenshot['image_id'], 't_screenshot_big'),
+                        'image_id': screenshot['image_id'],
                         'id': screenshot.get('id')
                     })
             metadata['igdb__screenshots'] = screenshots
@@ -401,12 +495,10 @@ class IGDBSyncer:
         if game_data.get('similar_games'):
             metadata['igdb__similar_games'] = [sg.get('id') if isinstance(sg, dict) else sg for sg in game_data['similar_games']]
 
-        # DLCs, Expansions, Bundles
-        metadata['igdb__dlcs'] = game_data.get('dlcs')
-        metadata['igdb__expansions'] = game_data.get('expansions')
-        metadata['igdb__bundles'] = game_data.get('bundles')
-        metadata['igdb__remakes'] = game_data.get('remakes')
-        metadata['igdb__remasters'] = game_data.get('remasters')
+        # DLCs, Expansions, Bundles (IDs, resolved through the shared igdb_games table)
+        for field in ['dlcs', 'expansions', 'bundles', 'remakes', 'remasters']:
+            if game_data.get(field):
+                metadata[f'igdb__{field}'] = [r.get('id') if isinstance(r, dict) else r for r in game_data[field]]
 
         # Franchise & Collections
         if game_data.get('franchise'):
@@ -450,6 +542,51 @@ class IGDBSyncer:
 
         return metadata
 
+    def sync_game(self, game_id: int, game_title: str) -> bool:
+        """
+        Sync a single library game with IGDB (search, fetch details, save).
+
+        Args:
+            game_id: Database game ID
+            game_title: Game title to search for
+
+        Returns:
+            bool: True if successful
+        """
+        from src.database import update_game_with_igdb_data
+
+        # Search for the game
+        search_result = self.search_game(game_title)
+
+        if not search_result:
+            self._log(f"  ✗ Could not find '{game_title}' on IGDB")
+            return False
+
+        # Get full details
+        igdb_game_id = search_result.get('id')
+        game_data = self.get_game_details(igdb_game_id)
+
+        if not game_data:
+            self._log(f"  ✗ Failed to fetch details for '{game_title}'")
+            return False
+
+        # Cache related games once instead of storing full copies per game
+        self.cache_related_games(game_data)
+
+        # Extract all metadata
+        metadata = self.extract_all_metadata(game_data)
+
+        # Update database
+        success = update_game_with_igdb_data(game_id, metadata)
+
+        if success:
+            prefetch_game_images(metadata)
+            self._log(f"  ✓ Successfully synced '{game_title}'")
+        else:
+            self._log(f"  ✗ Failed to update database for '{game_title}'")
+
+        return success
+
 
 def sync_game_with_igdb(game_id: int, callback=None) -> Dict:
     """
@@ -480,29 +617,30 @@ def sync_game_with_igdb(game_id: int, callback=None) -> Dict:
         }
 
 
-def sync_all_games_with_igdb(callback: Callable[[str], None] = None) -> Dict:
+def sync_all_games_with_igdb(callback: Callable[[str], None] = None, workers: int = SYNC_WORKERS) -> Dict:
     """
     Sync all unsynced games with IGDB API.
 
+    Work is tracked in the durable job queue, so an interrupted sync resumes
+    where it stopped instead of starting over.
+
     Args:
         callback: Optional callback function for progress updates
+        workers: Number of worker threads draining the queue
 
     Returns:
         dict: Result summary with success count and errors
     """
-    from src.database import get_games_without_igdb_sync, update_game_with_igdb_data
+    from src.database import get_games_without_igdb_sync
 
     def log(message: str):
         print(message)
         if callback:
             callback(message)
 
-    syncer = IGDBSyncer(callback=log)
-
-    # Get games that need syncing
-    games_to_sync = get_games_without_igdb_sync()
+    job_id = prepare_job('igdb_sync', get_games_without_igdb_sync, log=log)
 
-    if not games_to_sync:
+    if job_id is None:
         log("No games found that need IGDB syncing")
         return {
             'success': True,
@@ -511,62 +649,26 @@ def sync_all_games_with_igdb(callback: Callable[[str], None] = None) -> Dict:
             'message': 'No games to sync'
         }
 
-    log(f"Found {len(games_to_sync)} games to sync with IGDB")
+    progress = get_job_progress(job_id)
+    log(f"Found {progress[PENDING] + progress[RUNNING]} games to sync with IGDB")
 
-    synced_count = 0
-    failed_count = 0
-    failed_games = []
+    def make_handler():
+        syncer = IGDBSyncer(callback=callback)
 
-    for i, game in enumerate(games_to_sync, 1):
-        game_id = game['id']
-        game_title = game['title']
+        def handle(item: Dict) -> bool:
+            log(f"\nSyncing: {item['title']}")
+            success = syncer.sync_game(item['game_id'], item['title'])
+            # Rate limiting
+            pause('igdb', REQUEST_DELAY if success else FAILED_REQUEST_DELAY)
+            return success
 
-        log(f"\n[{i}/{len(games_to_sync)}] Syncing: {game_title}")
-
-        try:
-            # Search for the game
-            search_result = syncer.search_game(game_title)
-
-            if not search_result:
-                log(f"  ✗ Could not find '{game_title}' on IGDB")
-                failed_count += 1
-                failed_games.append(game_title)
-                time.sleep(0.5)  # Rate limiting
-                continue
-
-            # Get full details
-            igdb_game_id = search_result.get('id')
-            game_data = syncer.get_game_details(igdb_game_id)
-
-            if not game_data:
-                log(f"  ✗ Failed to fetch details for '{game_title}'")
-                failed_count += 1
-                failed_games.append(game_title)
-                time.sleep(0.5)
-                continue
-
-            # Extract all metadata
-            metadata = syncer.extract_all_metadata(game_data)
-
-            # Update database
-            success = update_game_with_igdb_data(game_id, metadata)
-
-            if success:
-                log(f"  ✓ Successfully synced '{game_title}'")
-                synced_count += 1
-            else:
-                log(f"  ✗ Failed to update database for '{game_title}'")
-                failed_count += 1
-                failed_games.append(game_title)
+        return handle
 
-            # Rate limiting (IGDB allows 4 requests per second)
-            time.sleep(0.3)
+    progress = run_job(job_id, make_handler, workers=workers, log=log)
 
-        except Exception as e:
-            log(f"  ✗ Error syncing '{game_title}': {str(e)}")
-            failed_count += 1
-            failed_games.append(game_title)
-            time.sleep(0.5)
+    synced_count = progress[DONE]
+    failed_count = progress[FAILED]
+    failed_games = [item['title'] for item in get_failed_items(job_id)]
 
     log(f"\n{'='*60}")
     log(f"IGDB Sync Complete!")
@@ -581,5 +683,6 @@ def sync_all_games_with_igdb(callback: Callable[[str], None] = None) -> Dict:
         'synced_count': synced_count,
         'failed_count': failed_count,
         'failed_games': failed_games,
+        'job_id': job_id,
         'message': f'Synced {synced_count} games, {failed_count} failed'
     }
@@ -0,0 +1,211 @@
+"""
+RAWG Search Service
+Answers the add-game search from the local library and a cache of recent RAWG searches,
+reusing cached results for extended queries and sharing identical in-flight requests
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from src.database import search_library, get_library_rawg_ids, normalize_title
+from src.utils.metrics import register_collector, counter_lines
+
+CACHE_SIZE = int(os.getenv("RAWG_SEARCH_CACHE_SIZE", "256"))   # Normalized queries kept
+CACHE_TTL = int(os.getenv("RAWG_SEARCH_CACHE_TTL", "3600"))     # Seconds a cached search stays valid
+FETCH_SIZE = 20        # Results fetched per RAWG search, so extended queries can be answered from them
+MIN_QUERY_LENGTH = 2   # Shorter queries are only matched against the library
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace (the same way library titles are stored)."""
+    return normalize_title(query)
+
+
+def _summarize(game: Dict) -> Dict:
+    """Keep the fields the search results show."""
+    return {
+        'id': game.get('id'),
+        'name': game.get('name'),
+        'released': game.get('released'),
+        'background_image': game.get('background_image'),
+        'rating': game.get('rating'),
+        'metacritic': game.get('metacritic'),
+        'genres': [g['name'] for g in game.get('genres') or []],
+        'platforms': [p['platform']['name'] for p in game.get('platforms') or []]
+    }
+
+
+class RAWGSearchService:
+    def __init__(self, cache_size: int = CACHE_SIZE, ttl: int = CACHE_TTL):
+        """
+        Initialize the search service.
+
+        Args:
+            cache_size: Maximum number of cached searches (least recently used are dropped)
+            ttl: Seconds before a cached search is fetched again
+        """
+        self.cache_size = cache_size
+        self.ttl = ttl
+
+        # Normalized query -> (fetched_at, {'results': [...], 'exhaustive': bool})
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._syncer = None
+
+        self.stats = {'hits': 0, 'prefix_hits': 0, 'coalesced': 0, 'misses': 0}
+
+    def _get_syncer(self):
+        """Get the RAWG client (created on first use)."""
+        if self._syncer is None:
+            from src.sync.rawg_sync import RAWGSyncer
+            self._syncer = RAWGSyncer()
+        return self._syncer
+
+    def _get_cached(self, key: str) -> Optional[Dict]:
+        """Get a fresh cached search (caller holds the lock)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        fetched_at, page = entry
+        if time.time() - fetched_at > self.ttl:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return page
+
+    def _store(self, key: str, page: Dict):
+        """Cache a search, dropping the least recently used ones past cache_size."""
+        with self._lock:
+            self._cache[key] = (time.time(), page)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _from_prefix(self, key: str) -> Optional[Dict]:
+        """
+        Answer an extended query from a cached shorter one (caller holds the lock).
+
+        Only searches that returned every RAWG match are reused: filtering a
+        truncated result list could miss games ranked past its end.
+        """
+        words = key.split()
+
+        for length in range(len(key) - 1, MIN_QUERY_LENGTH - 1, -1):
+            page = self._get_cached(key[:length].rstrip())
+            if page is None or not page['exhaustive']:
+                continue
+
+            results = [game for game in page['results']
+                       if all(word in normalize_query(game['name']) for word in words)]
+            if results:
+                return {'results': results, 'exhaustive': True}
+
+        return None
+
+    async def _fetch(self, key: str) -> Dict:
+        """Search RAWG for a normalized query."""
+        from src.utils.http_client import create_async_client
+
+        async with create_async_client() as client:
+            page = await self._get_syncer().asearch_page(client, key, page_size=FETCH_SIZE)
+
+        results = [_summarize(game) for game in page['results']]
+        return {'results': results, 'exhaustive': page['count'] <= len(results)}
+
+    async def _search_rawg(self, key: str) -> Tuple[Dict, str]:
+        """
+        Get the RAWG results of a normalized query from the cache or upstream.
+
+        Returns:
+            tuple: (page, source) where source is 'cache', 'prefix', 'coalesced' or 'rawg'
+        """
+        with self._lock:
+            page = self._get_cached(key)
+            if page is not None:
+                self.stats['hits'] += 1
+                return page, 'cache'
+
+            page = self._from_prefix(key)
+            if page is not None:
+                self.stats['prefix_hits'] += 1
+                source = 'prefix'
+            else:
+                # Identical searches running in other requests wait for the first one
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = Future()
+                    self.stats['misses'] += 1
+                else:
+                    self.stats['coalesced'] += 1
+
+        if page is not None:
+            self._store(key, page)
+            return page, source
+
+        if not leader:
+            # Futures are thread-safe, so this works across the per-request event loops
+            return await asyncio.wrap_future(future), 'coalesced'
+
+        try:
+            page = await self._fetch(key)
+            self._store(key, page)
+            future.set_result(page)
+            return page, 'rawg'
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    async def search(self, query: str, limit: int = 5) -> Dict:
+        """
+        Search the library and RAWG for a game to add.
+
+        Args:
+            query: Text typed by the user
+            limit: Maximum number of results per list
+
+        Returns:
+            dict: {'library': games already owned, 'results': RAWG games (each with 'in_library'),
+                   'source': where the RAWG results came from ('cache', 'prefix', 'coalesced', 'rawg' or None)}
+
+        Raises:
+            APIError: RAWG could not be reached
+        """
+        key = normalize_query(query)
+        # Database calls run off the event loop, which serves other requests meanwhile
+        library = await asyncio.to_thread(search_library, key.split(), limit)
+
+        if len(key) < MIN_QUERY_LENGTH:
+            return {'library': library, 'results': [], 'source': None}
+
+        page, source = await self._search_rawg(key)
+        results = [dict(game) for game in page['results'][:limit]]
+
+        owned = await asyncio.to_thread(get_library_rawg_ids, [game['id'] for game in results])
+        for game in results:
+            game['in_library'] = game['id'] in owned
+
+        return {'library': library, 'results': results, 'source': source}
+
+
+_search_service = RAWGSearchService()
+
+register_collector(lambda: counter_lines(
+    'rawg_search_cache_requests_total', 'Add-game searches by how RAWG results were found '
+    '(hits, prefix_hits and coalesced avoided a RAWG request)', 'result', dict(_search_service.stats)))
+
+
+def get_search_service() -> RAWGSearchService:
+    """Get the process-wide RAWG search service."""
+    return _search_service
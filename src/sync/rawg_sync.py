@@ -3,20 +3,40 @@ RAWG API Sync Module
 Fetches comprehensive game metadata from RAWG API and stores with rawg__ prefix
 """
 
-import requests
-import time
+import asyncio
 import os
 from typing import Dict, Optional, List
-from dotenv import load_dotenv
-from src.database import get_games_without_rawg_sync, update_game_with_rawg_data, get_all_games
+from src.database import (get_games_without_rawg_sync, update_game_with_rawg_data, get_all_games,
+                          get_games_with_incomplete_rawg_data)
+from src.job_queue import prepare_job, run_job, get_job_progress, PENDING, RUNNING, DONE, FAILED
+from src.utils.resilience import request_with_retry, arequest_with_retry, TransientAPIError, PermanentAPIError
+from src.utils.http_client import get_session
+from src.utils.metrics import pause
+from src.image_cache import prefetch_game_images
+from src.utils.env import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # RAWG API configuration
 RAWG_API_KEY = os.getenv("RAWG_API_KEY", "")
-RAWG_BASE_URL = "https://api.rawg.io/api"
-REQUEST_DELAY = 1.0  # Delay between requests to respect rate limits
+RAWG_BASE_URL = os.getenv("RAWG_BASE_URL", "https://api.rawg.io/api")
+REQUEST_DELAY = float(os.getenv("RAWG_REQUEST_DELAY", "1.0"))  # Delay between requests to respect rate limits
+
+# Sub-resources fetched per game: name -> RAWG endpoint / database column
+SUB_RESOURCE_ENDPOINTS = {
+    'screenshots': 'screenshots',
+    'achievements': 'achievements',
+    'trailers': 'movies',
+    'stores': 'stores'
+}
+SUB_RESOURCE_FIELDS = {
+    'screenshots': 'rawg__screenshots',
+    'achievements': 'rawg__achievements',
+    'trailers': 'rawg__trailers',
+    'stores': 'rawg__stores'
+}
+SYNC_WORKERS = int(os.getenv("RAWG_SYNC_WORKERS", "1"))  # Parallel queue workers
 
 
 class RAWGSyncer:
@@ -24,7 +44,8 @@ class RAWGSyncer:
         """Initialize the RAWG API syncer."""
         self.api_key = api_key or RAWG_API_KEY
         self.callback = callback
-        self.session = requests.Session()
+        self.session = get_session()
+        self.incomplete: Dict[int, set] = {}  # RAWG ID -> sub-resources that failed transiently
 
     def _log(self, message):
         """Send status updates via callback."""
@@ -32,111 +53,204 @@ class RAWGSyncer:
         if self.callback:
             self.callback(message)
 
+    def _get(self, path: str, params: Dict = None) -> Dict:
+        """GET a RAWG endpoint through the resilient request layer and return the JSON body."""
+        request_params = {'key': self.api_key}
+        request_params.update(params or {})
+
+        response = request_with_retry(self.session, 'GET', f"{RAWG_BASE_URL}{path}",
+                                      params=request_params, timeout=10, log=self._log)
+        return response.json()
+
     def search_game(self, game_title: str) -> Optional[Dict]:
-        """Search for a game on RAWG by title."""
+        """
+        Search for a game on RAWG by title.
+
+        Raises:
+            TransientAPIError: RAWG is unreachable or rate limiting, so the search should be retried later
+        """
         self._log(f"Searching RAWG for: {game_title}")
 
         try:
-            url = f"{RAWG_BASE_URL}/games"
-            params = {
-                'key': self.api_key,
-                'search': game_title,
-                'page_size': 1
-            }
-
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._get("/games", {'search': game_title, 'page_size': 1})
             if data['results']:
                 return data['results'][0]
             else:
                 self._log(f"No results found for: {game_title}")
                 return None
 
-        except Exception as e:
+        except PermanentAPIError as e:
             self._log(f"Error searching for {game_title}: {str(e)}")
             return None
 
+    def search_games(self, query: str, page_size: int = 5) -> List[Dict]:
+        """
+        Search RAWG and return the top results (used by the manual add-game search).
+
+        Raises:
+            APIError: The search failed
+        """
+        data = self._get("/games", {'search': query, 'page_size': page_size})
+        return data.get('results', [])
+
     def get_game_details(self, game_id: int) -> Optional[Dict]:
-        """Get detailed information about a game from RAWG."""
-        try:
-            url = f"{RAWG_BASE_URL}/games/{game_id}"
-            params = {'key': self.api_key}
+        """
+        Get detailed information about a game from RAWG.
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        Raises:
+            TransientAPIError: RAWG is unreachable or rate limiting, so the fetch should be retried later
+        """
+        self.incomplete[game_id] = set()
 
-            return response.json()
+        try:
+            return self._get(f"/games/{game_id}")
 
-        except Exception as e:
+        except PermanentAPIError as e:
             self._log(f"Error getting details for game ID {game_id}: {str(e)}")
             return None
 
-    def get_game_screenshots(self, game_id: int) -> List[Dict]:
-        """Get screenshots for a game from RAWG."""
-        try:
-            url = f"{RAWG_BASE_URL}/games/{game_id}/screenshots"
-            params = {'key': self.api_key}
+    def _get_sub_resource(self, game_id: int, resource: str) -> List[Dict]:
+        """
+        Fetch a list sub-resource of a game (screenshots, achievements, movies, stores).
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        Transient failures don't abort the sync: the resource is recorded as incomplete
+        so it is left untouched in the database and can be refetched later.
+        """
+        endpoint = SUB_RESOURCE_ENDPOINTS[resource]
 
-            data = response.json()
+        try:
+            data = self._get(f"/games/{game_id}/{endpoint}")
             return data.get('results', [])
 
-        except Exception as e:
-            self._log(f"Error getting screenshots: {str(e)}")
+        except TransientAPIError as e:
+            self._log(f"Error getting {resource} (will refetch later): {str(e)}")
+            self.incomplete.setdefault(game_id, set()).add(resource)
+            return []
+
+        except PermanentAPIError as e:
+            self._log(f"Error getting {resource}: {str(e)}")
             return []
 
+    def get_game_screenshots(self, game_id: int) -> List[Dict]:
+        """Get screenshots for a game from RAWG."""
+        return self._get_sub_resource(game_id, 'screenshots')
+
     def get_game_achievements(self, game_id: int) -> List[Dict]:
         """Get achievements for a game from RAWG."""
-        try:
-            url = f"{RAWG_BASE_URL}/games/{game_id}/achievements"
-            params = {'key': self.api_key}
+        return self._get_sub_resource(game_id, 'achievements')
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+    def get_game_trailers(self, game_id: int) -> List[Dict]:
+        """Get trailers for a game from RAWG."""
+        return self._get_sub_resource(game_id, 'trailers')
 
-            data = response.json()
-            return data.get('results', [])
+    def get_game_stores(self, game_id: int) -> List[Dict]:
+        """Get store links for a game from RAWG."""
+        return self._get_sub_resource(game_id, 'stores')
 
-        except Exception as e:
-            self._log(f"Error getting achievements: {str(e)}")
-            return []
+    # ===== ASYNC API (interactive routes) =====
 
-    def get_game_trailers(self, game_id: int) -> List[Dict]:
-        """Get trailers for a game from RAWG."""
-        try:
-            url = f"{RAWG_BASE_URL}/games/{game_id}/movies"
-            params = {'key': self.api_key}
+    async def _aget(self, client, path: str, params: Dict = None) -> Dict:
+        """Async version of _get() using an httpx.AsyncClient."""
+        request_params = {'key': self.api_key}
+        request_params.update(params or {})
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        response = await arequest_with_retry(client, 'GET', f"{RAWG_BASE_URL}{path}",
+                                             params=request_params, timeout=10, log=self._log)
+        return response.json()
 
-            data = response.json()
-            return data.get('results', [])
+    async def asearch_page(self, client, query: str, page_size: int = 5) -> Dict:
+        """
+        Get the first page of a RAWG search, with the total match count.
 
-        except Exception as e:
-            self._log(f"Error getting trailers: {str(e)}")
-            return []
+        Returns:
+            dict: {'results': list, 'count': int}
+
+        Raises:
+            APIError: The search failed
+        """
+        data = await self._aget(client, "/games", {'search': query, 'page_size': page_size})
+        results = data.get('results', [])
+        return {'results': results, 'count': data.get('count', len(results))}
+
+    async def asearch_games(self, client, query: str, page_size: int = 5) -> List[Dict]:
+        """
+        Async version of search_games().
+
+        Raises:
+            APIError: The search failed
+        """
+        return (await self.asearch_page(client, query, page_size))['results']
+
+    async def asearch_game(self, client, game_title: str) -> Optional[Dict]:
+        """
+        Async version of search_game().
+
+        Raises:
+            TransientAPIError: RAWG is unreachable or rate limiting, so the search should be retried later
+        """
+        self._log(f"Searching RAWG for: {game_title}")
 
-    def get_game_stores(self, game_id: int) -> List[Dict]:
-        """Get store links for a game from RAWG."""
         try:
-            url = f"{RAWG_BASE_URL}/games/{game_id}/stores"
-            params = {'key': self.api_key}
+            results = await self.asearch_games(client, game_title, page_size=1)
+        except PermanentAPIError as e:
+            self._log(f"Error searching for {game_title}: {str(e)}")
+            return None
+
+        if not results:
+            self._log(f"No results found for: {game_title}")
+            return None
+        return results[0]
 
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+    async def _aget_sub_resource(self, client, game_id: int, resource: str) -> List[Dict]:
+        """Async version of _get_sub_resource()."""
+        endpoint = SUB_RESOURCE_ENDPOINTS[resource]
 
-            data = response.json()
+        try:
+            data = await self._aget(client, f"/games/{game_id}/{endpoint}")
             return data.get('results', [])
 
-        except Exception as e:
-            self._log(f"Error getting stores: {str(e)}")
+        except TransientAPIError as e:
+            self._log(f"Error getting {resource} (will refetch later): {str(e)}")
+            self.incomplete.setdefault(game_id, set()).add(resource)
+            return []
+
+        except PermanentAPIError as e:
+            self._log(f"Error getting {resource}: {str(e)}")
             return []
 
+    async def afetch_game(self, client, game_id: int) -> Optional[Dict]:
+        """
+        Fetch a game's details and all its sub-resources concurrently.
+
+        Args:
+            client: httpx.AsyncClient to send the requests with
+            game_id: RAWG game ID
+
+        Returns:
+            dict: Metadata ready for update_game_with_rawg_data, or None if the game doesn't exist
+
+        Raises:
+            TransientAPIError: The details request failed transiently
+        """
+        self.incomplete[game_id] = set()
+        resources = list(SUB_RESOURCE_ENDPOINTS)
+
+        details, *sub_resources = await asyncio.gather(
+            self._aget(client, f"/games/{game_id}"),
+            *(self._aget_sub_resource(client, game_id, resource) for resource in resources),
+            return_exceptions=True
+        )
+
+        if isinstance(details, PermanentAPIError):
+            self._log(f"Error getting details for game ID {game_id}: {str(details)}")
+            return None
+        if isinstance(details, BaseException):
+            raise details
+
+        fetched = dict(zip(resources, sub_resources))
+        return self.extract_all_metadata(details, fetched['screenshots'], fetched['achievements'],
+                                         fetched['trailers'], fetched['stores'])
+
     def extract_all_metadata(self, game_details: Dict, screenshots: List, achievements: List,
                             trailers: List, stores: List) -> Dict:
         """
@@ -214,14 +328,7 @@ class RAWGSyncer:
         metadata['rawg__achievements'] = achievements
 
         # Store Links
-        metadata['rawg__stores'] = [
-            {
-                'store_id': s.get('store', {}).get('id'),
-                'store_name': s.get('store', {}).get('name'),
-                'url': s.get('url')
-            }
-            for s in stores
-        ]
+        metadata['rawg__stores'] = self._format_stores(stores)
         metadata['rawg__website'] = game_details.get('website')
 
         # Development
@@ -244,8 +351,25 @@ class RAWGSyncer:
         metadata['rawg__alternative_names'] = game_details.get('alternative_names', [])
         metadata['rawg__reactions'] = game_details.get('reactions')
 
+        # Don't overwrite stored data with the empty result of a failed fetch
+        incomplete = self.incomplete.get(game_details.get('id'), set())
+        for resource in incomplete:
+            metadata.pop(SUB_RESOURCE_FIELDS[resource], None)
+        metadata['rawg__incomplete'] = sorted(incomplete)
+
         return metadata
 
+    def _format_stores(self, stores: List[Dict]) -> List[Dict]:
+        """Reduce RAWG store entries to the fields stored in the database."""
+        return [
+            {
+                'store_id': s.get('store', {}).get('id'),
+                'store_name': s.get('store', {}).get('name'),
+                'url': s.get('url')
+            }
+            for s in stores
+        ]
+
     def _extract_player_counts(self, tags: List[Dict]) -> tuple:
         """
         Extract player count information from RAWG tags.
@@ -304,25 +428,25 @@ class RAWGSyncer:
         if not game_details:
             return False
 
-        time.sleep(REQUEST_DELAY)
+        pause('rawg', REQUEST_DELAY)
 
         # Step 3: Get screenshots
         self._log("[API] Fetching screenshots...")
         screenshots = self.get_game_screenshots(rawg_id)
         self._log(f"  → {len(screenshots)} screenshots found")
-        time.sleep(REQUEST_DELAY)
+        pause('rawg', REQUEST_DELAY)
 
         # Step 4: Get achievements
         self._log("[API] Fetching achievements...")
         achievements = self.get_game_achievements(rawg_id)
         self._log(f"  → {len(achievements)} achievements found")
-        time.sleep(REQUEST_DELAY)
+        pause('rawg', REQUEST_DELAY)
 
         # Step 5: Get trailers
         self._log("[API] Fetching trailers...")
         trailers = self.get_game_trailers(rawg_id)
         self._log(f"  → {len(trailers)} trailers found")
-        time.sleep(REQUEST_DELAY)
+        pause('rawg', REQUEST_DELAY)
 
         # Step 6: Get store links
         self._log("[API] Fetching store links...")
@@ -338,20 +462,57 @@ class RAWGSyncer:
         success = update_game_with_rawg_data(game_id, metadata)
 
         if success:
-            self._log(f"[SUCCESS] '{game_title}' synced successfully!\n")
+            prefetch_game_images(metadata)
+            if metadata['rawg__incomplete']:
+                self._log(f"[PARTIAL] '{game_title}' synced, missing: {', '.join(metadata['rawg__incomplete'])}\n")
+            else:
+                self._log(f"[SUCCESS] '{game_title}' synced successfully!\n")
         else:
             self._log(f"[ERROR] Failed to save '{game_title}' to database\n")
 
         return success
 
+    def refetch_incomplete(self, game_id: int, rawg_id: int, resources: List[str]) -> bool:
+        """
+        Refetch only the sub-resources that failed during an earlier sync.
+
+        Args:
+            game_id: Database game ID
+            rawg_id: RAWG game ID
+            resources: Sub-resource names recorded in rawg__incomplete
+
+        Returns:
+            bool: True if the database was updated
+        """
+        self.incomplete[rawg_id] = set()
+        metadata = {}
+
+        for resource in resources:
+            if resource not in SUB_RESOURCE_ENDPOINTS:
+                continue
+            self._log(f"[API] Refetching {resource}...")
+            results = self._get_sub_resource(rawg_id, resource)
+            if resource not in self.incomplete[rawg_id]:
+                if resource == 'stores':
+                    results = self._format_stores(results)
+                metadata[SUB_RESOURCE_FIELDS[resource]] = results
+            pause('rawg', REQUEST_DELAY)
+
+        metadata['rawg__incomplete'] = sorted(self.incomplete[rawg_id])
+        return update_game_with_rawg_data(game_id, metadata)
 
-def sync_with_rawg(callback=None, force_resync=False) -> Dict:
+
+def sync_with_rawg(callback=None, force_resync=False, workers=SYNC_WORKERS) -> Dict:
     """
     Sync all unsynced games with RAWG API.
 
+    Work is tracked in the durable job queue, so an interrupted sync resumes
+    where it stopped instead of starting over.
+
     Args:
         callback: Optional callback function for status updates
         force_resync: If True, re-sync all games
+        workers: Number of worker threads draining the queue
 
     Returns:
         dict: Summary of sync operation
@@ -366,13 +527,18 @@ def sync_with_rawg(callback=None, force_resync=False) -> Dict:
 
     # Get games that need syncing
     if force_resync:
-        games = get_all_games()
-        syncer._log(f"Force re-syncing ALL {len(games)} games...")
+        games_to_sync = get_all_games
+        syncer._log("Force re-syncing ALL games...")
     else:
-        games = get_games_without_rawg_sync()
-        syncer._log(f"Found {len(games)} games to sync with RAWG")
+        games_to_sync = get_games_without_rawg_sync
+
+    job_id = prepare_job('rawg_sync', games_to_sync, force_new=force_resync, log=syncer._log)
 
-    if not games:
+    # Heal games whose screenshots/achievements/... failed during an earlier sync
+    if get_games_with_incomplete_rawg_data():
+        refetch_incomplete_rawg_data(callback=callback)
+
+    if job_id is None:
         syncer._log("No games to sync!")
         return {
             'success': True,
@@ -381,23 +547,24 @@ def sync_with_rawg(callback=None, force_resync=False) -> Dict:
             'message': 'No games to sync'
         }
 
-    synced = 0
-    failed = 0
+    progress = get_job_progress(job_id)
+    syncer._log(f"Found {progress[PENDING] + progress[RUNNING]} games to sync with RAWG")
 
-    for game in games:
-        try:
-            success = syncer.sync_game(game['id'], game['title'])
-            if success:
-                synced += 1
-            else:
-                failed += 1
+    def make_handler():
+        worker_syncer = RAWGSyncer(api_key=syncer.api_key, callback=callback)
 
+        def handle(item: Dict) -> bool:
+            success = worker_syncer.sync_game(item['game_id'], item['title'])
             # Rate limiting
-            time.sleep(REQUEST_DELAY)
+            pause('rawg', REQUEST_DELAY)
+            return success
 
-        except Exception as e:
-            syncer._log(f"[ERROR] Exception syncing '{game['title']}': {str(e)}")
-            failed += 1
+        return handle
+
+    progress = run_job(job_id, make_handler, workers=workers, log=syncer._log)
+
+    synced = progress[DONE]
+    failed = progress[FAILED]
 
     syncer._log("\n" + "="*60)
     syncer._log(f"SYNC COMPLETE: {synced} synced, {failed} failed")
@@ -407,5 +574,45 @@ def sync_with_rawg(callback=None, force_resync=False) -> Dict:
         'success': True,
         'synced_count': synced,
         'failed_count': failed,
-        'total_games': len(games)
+        'total_games': progress['total'],
+        'job_id': job_id
+    }
+
+
+def refetch_incomplete_rawg_data(callback=None) -> Dict:
+    """
+    Refetch sub-resources (screenshots, achievements, trailers, stores) that
+    failed transiently during earlier syncs, without resyncing whole games.
+
+    Args:
+        callback: Optional callback function for status updates
+
+    Returns:
+        dict: Summary of the refetch
+    """
+    syncer = RAWGSyncer(callback=callback)
+
+    if not syncer.api_key:
+        return {
+            'success': False,
+            'error': 'RAWG API key not configured. Add it to your .env file.'
+        }
+
+    games = get_games_with_incomplete_rawg_data()
+    syncer._log(f"Found {len(games)} games with incomplete RAWG data")
+
+    completed = 0
+    for game in games:
+        syncer._log(f"\n--- Refetching: {game['title']} ({', '.join(game['rawg__incomplete'])}) ---")
+        try:
+            syncer.refetch_incomplete(game['id'], game['rawg__id'], game['rawg__incomplete'])
+            if not syncer.incomplete.get(game['rawg__id']):
+                completed += 1
+        except Exception as e:
+            syncer._log(f"[ERROR] Exception refetching '{game['title']}': {str(e)}")
+
+    return {
+        'success': True,
+        'completed_count': completed,
+        'still_incomplete_count': len(games) - completed
     }
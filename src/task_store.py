@@ -0,0 +1,270 @@
+"""
+Shared background task state
+Keeps each task's running flag, result and logs in SQLite instead of process memory,
+so every web worker sees (and can't double-start) a task started by another one
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from src.database import DATA_DIR
+
+TASK_DATABASE_NAME = os.path.join(DATA_DIR, "task_state.db")
+TASK_TYPES = ['scraping', 'syncing', 'igdb']
+MAX_LOG_LINES = 5000  # Oldest log lines of a task are dropped past this
+
+# Identifies the process running a task (unique per process start, as hostnames and PIDs get reused)
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# A running task is a lease: its owner refreshes updated_at every TASK_HEARTBEAT_SECONDS, and a task
+# not refreshed for TASK_LEASE_SECONDS belongs to a dead worker and can be taken over.
+# The process holding the open scraping browser (chrome_owner) refreshes it the same way.
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "60"))
+TASK_HEARTBEAT_SECONDS = max(TASK_LEASE_SECONDS // 4, 1)
+
+_store_ready = False
+_store_lock = threading.Lock()
+
+_heartbeat_thread = None
+_heartbeat_lock = threading.Lock()
+
+
+def _connect():
+    """Open a task store connection without checking the schema."""
+    conn = sqlite3.connect(TASK_DATABASE_NAME, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def get_task_connection():
+    """Create a connection to the task store (initializing it on first use)."""
+    global _store_ready
+
+    if not _store_ready:
+        with _store_lock:
+            if not _store_ready:
+                init_task_store()
+                _store_ready = True
+
+    return _connect()
+
+
+def init_task_store():
+    """Initialize the task store schema."""
+    os.makedirs(os.path.dirname(TASK_DATABASE_NAME), exist_ok=True)
+    conn = _connect()
+    cursor = conn.cursor()
+
+    # WAL lets every worker poll task status while a task writes its logs
+    cursor.execute("PRAGMA journal_mode=WAL")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_type TEXT PRIMARY KEY,
+            running BOOLEAN NOT NULL DEFAULT 0,
+            owner TEXT,
+            result TEXT,
+            chrome_open BOOLEAN NOT NULL DEFAULT 0,
+            chrome_owner TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Stores created before the browser owner was tracked
+    if 'chrome_owner' not in {row['name'] for row in cursor.execute("PRAGMA table_info(tasks)")}:
+        cursor.execute("ALTER TABLE tasks ADD COLUMN chrome_owner TEXT")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS task_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_type TEXT NOT NULL,
+            message TEXT NOT NULL
+        )
+    """)
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_logs_task ON task_logs (task_type, id)")
+
+    cursor.executemany("INSERT OR IGNORE INTO tasks (task_type) VALUES (?)", [(t,) for t in TASK_TYPES])
+
+    conn.close()
+
+
+def _lease_cutoff() -> str:
+    """SQLite datetime modifier: heartbeats older than this have expired."""
+    return f"-{TASK_LEASE_SECONDS} seconds"
+
+
+def _heartbeat():
+    """Refresh the lease of every task this process is running or holds the browser of."""
+    while True:
+        time.sleep(TASK_HEARTBEAT_SECONDS)
+        try:
+            conn = get_task_connection()
+            conn.execute("""
+                UPDATE tasks SET updated_at = CURRENT_TIMESTAMP
+                WHERE (running = 1 AND owner = ?) OR chrome_owner = ?
+            """, (OWNER, OWNER))
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"[TASKS] Heartbeat failed: {e}")
+
+
+def _start_heartbeat():
+    """Start the heartbeat thread of this process (once)."""
+    global _heartbeat_thread
+
+    with _heartbeat_lock:
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat, daemon=True, name='task-heartbeat')
+            _heartbeat_thread.start()
+
+
+def get_task(task_type: str, with_logs: bool = True) -> Dict[str, Any]:
+    """
+    Get the state of a background task.
+
+    Args:
+        task_type: 'scraping', 'syncing' or 'igdb'
+        with_logs: Include the task's log lines
+
+    Returns:
+        dict: {'running': bool, 'result': dict or None, 'chrome_open': bool,
+               'chrome_owner': process holding the open browser (see OWNER) or None, 'logs': list}
+    """
+    conn = get_task_connection()
+
+    row = conn.execute("""
+        SELECT *, updated_at >= datetime('now', ?) AS alive FROM tasks WHERE task_type = ?
+    """, (_lease_cutoff(), task_type)).fetchone()
+    task = {
+        'running': bool(row['running'] and row['alive']),
+        'result': json.loads(row['result']) if row['result'] else None,
+        # The browser lives in its owner's process, so it is gone once the owner stops heartbeating
+        'chrome_open': bool(row['chrome_open'] and row['alive']),
+        'chrome_owner': row['chrome_owner'] if row['chrome_open'] and row['alive'] else None
+    }
+
+    if with_logs:
+        task['logs'] = get_logs(task_type, conn=conn)
+
+    conn.close()
+    return task
+
+
+def get_logs(task_type: str, conn: sqlite3.Connection = None) -> List[str]:
+    """Get the log lines of a task, oldest first."""
+    own_conn = conn is None
+    conn = conn or get_task_connection()
+
+    logs = [row['message'] for row in conn.execute(
+        "SELECT message FROM task_logs WHERE task_type = ? ORDER BY id", (task_type,)
+    )]
+
+    if own_conn:
+        conn.close()
+    return logs
+
+
+def start_task(task_type: str) -> bool:
+    """
+    Atomically mark a task as running and reset its logs and result.
+
+    A task whose owner stopped refreshing its lease (crashed or replaced worker) is taken over.
+
+    Returns:
+        bool: False if the task is already running (in this or another worker)
+    """
+    conn = get_task_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("""
+            SELECT running, updated_at >= datetime('now', ?) AS alive FROM tasks WHERE task_type = ?
+        """, (_lease_cutoff(), task_type)).fetchone()
+
+        if row['running'] and row['alive']:
+            conn.execute("ROLLBACK")
+            return False
+
+        conn.execute("""
+            UPDATE tasks SET running = 1, owner = ?, result = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE task_type = ?
+        """, (OWNER, task_type))
+        conn.execute("DELETE FROM task_logs WHERE task_type = ?", (task_type,))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    _start_heartbeat()
+    return True
+
+
+def finish_task(task_type: str, result: Optional[Dict] = None):
+    """Mark a task as stopped and store its result."""
+    update_task(task_type, running=False, result=result)
+
+
+def update_task(task_type: str, **fields):
+    """
+    Update task fields.
+
+    Args:
+        task_type: 'scraping', 'syncing' or 'igdb'
+        **fields: Any of running, result, chrome_open (opening the browser makes this process its owner)
+    """
+    assignments = []
+    params = []
+
+    for name, value in fields.items():
+        if name not in ('running', 'result', 'chrome_open'):
+            raise ValueError(f"Unknown task field: {name}")
+        if name == 'result':
+            value = json.dumps(value) if value is not None else None
+        elif name == 'running' and value:
+            assignments.append("owner = ?")
+            params.append(OWNER)
+            _start_heartbeat()
+        elif name == 'chrome_open':
+            assignments.append("chrome_owner = ?")
+            params.append(OWNER if value else None)
+            if value:
+                _start_heartbeat()
+        assignments.append(f"{name} = ?")
+        params.append(value)
+
+    conn = get_task_connection()
+    conn.execute(f"UPDATE tasks SET {', '.join(assignments)}, updated_at = CURRENT_TIMESTAMP WHERE task_type = ?",
+                 params + [task_type])
+    conn.close()
+
+
+def append_log(task_type: str, message: str):
+    """Add a log line to a task."""
+    conn = get_task_connection()
+    cursor = conn.execute("INSERT INTO task_logs (task_type, message) VALUES (?, ?)", (task_type, message))
+
+    # Trim old lines every so often instead of on every insert
+    if cursor.lastrowid % 500 == 0:
+        conn.execute("""
+            DELETE FROM task_logs WHERE task_type = ? AND id <= (
+                SELECT id FROM task_logs WHERE task_type = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+        """, (task_type, task_type, MAX_LOG_LINES))
+
+    conn.close()
+
+
+def clear_task(task_type: str):
+    """Clear a task's logs and result."""
+    conn = get_task_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DELETE FROM task_logs WHERE task_type = ?", (task_type,))
+    conn.execute("UPDATE tasks SET result = NULL, updated_at = CURRENT_TIMESTAMP WHERE task_type = ?", (task_type,))
+    conn.execute("COMMIT")
+    conn.close()
@@ -0,0 +1,23 @@
+"""
+Environment loading
+Reads .env into os.environ once per process, before any module reads its settings
+"""
+
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env():
+    """Load the .env file once (later calls are no-ops)."""
+    global _loaded
+
+    if _loaded:
+        return
+
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
@@ -0,0 +1,233 @@
+"""
+Process-wide pooled HTTP client
+Every outbound API call shares one keep-alive connection pool per host, so
+requests after the first skip the TCP + TLS handshake
+"""
+
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Pool tuning: one pool per host, each keeping up to POOL_MAXSIZE idle connections
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+
+# Optional HTTP/2 for https hosts (requires: pip install "httpx[http2]")
+HTTP2_ENABLED = os.getenv("HTTP_CLIENT_HTTP2", "0") == "1"
+
+# No Connection header: HTTP/1.1 keeps connections alive by default and HTTP/2 forbids it
+DEFAULT_HEADERS = {
+    'User-Agent': 'myGamingLib/1.0',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Connection-specific headers, which HTTP/2 doesn't allow
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes br responses when brotli is installed
+    DEFAULT_HEADERS['Accept-Encoding'] = 'gzip, deflate, br'
+except ImportError:
+    pass
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Loading the CA bundle takes ~20ms of CPU, so every async client shares one SSL context
+_ssl_context = None
+
+
+class _HTTPXRawResponse:
+    """Streamed httpx response body exposed as the raw response requests reads from."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def stream(self, chunk_size: int = None, decode_content: bool = True):
+        """Yield the decoded body in chunks."""
+        yield from self._response.iter_bytes(chunk_size)
+
+    def read(self, amt: int = None, decode_content: bool = True) -> bytes:
+        """Read the rest of the decoded body (amt is ignored)."""
+        return b''.join(self._response.iter_bytes())
+
+    def close(self):
+        """Close the response, returning its connection to the pool."""
+        self._response.close()
+
+    def release_conn(self):
+        """Called by requests.Response.close()."""
+        self._response.close()
+
+
+class HTTP2Adapter(requests.adapters.BaseAdapter):
+    """
+    Transport adapter sending requests over HTTP/2 with httpx.
+
+    Mounted on a regular requests.Session, so callers keep using the requests API
+    (responses, exceptions, raise_for_status) unchanged.
+    """
+
+    def __init__(self):
+        super().__init__()
+        import httpx
+        self._httpx = httpx
+        self._clients = {}  # (verify, cert, proxy) -> httpx.Client
+        self._clients_lock = threading.Lock()
+        self._client_for(True, None, None)  # Fails now (ImportError) if h2 isn't installed
+
+    def _client_for(self, verify, cert, proxy):
+        """
+        Get the httpx client for a request's TLS and proxy settings.
+
+        requests passes verify/cert/proxies per request (from the session or the
+        environment, e.g. REQUESTS_CA_BUNDLE or HTTPS_PROXY), while httpx fixes
+        them per client, so each distinct combination gets its own pooled client.
+        """
+        key = (verify, cert, proxy)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._httpx.Client(
+                    http2=True,
+                    verify=self._ssl_context_for(verify, cert),
+                    proxy=proxy,
+                    trust_env=False,  # requests already resolved the environment's settings
+                    limits=self._httpx.Limits(max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                                              max_keepalive_connections=POOL_MAXSIZE)
+                )
+                self._clients[key] = client
+            return client
+
+    @staticmethod
+    def _ssl_context_for(verify, cert):
+        """SSL context for requests' verify (bool or CA bundle path) and cert (path or (cert, key)) arguments."""
+        import ssl
+
+        if verify is False:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif isinstance(verify, str) and os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        elif isinstance(verify, str):
+            context = ssl.create_default_context(cafile=verify)
+        else:
+            import certifi
+            context = ssl.create_default_context(cafile=certifi.where())
+
+        if isinstance(cert, tuple):
+            context.load_cert_chain(*cert)
+        elif cert:
+            context.load_cert_chain(cert)
+        return context
+
+    def _timeout(self, timeout):
+        """Convert a requests timeout (seconds, or a (connect, read) tuple) to an httpx.Timeout."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send a prepared requests.PreparedRequest and return a requests.Response."""
+        httpx = self._httpx
+        client = self._client_for(verify, cert, requests.utils.select_proxy(request.url, proxies))
+
+        try:
+            httpx_request = client.build_request(
+                request.method, request.url,
+                headers={name: value for name, value in request.headers.items()
+                         if name.lower() not in HOP_BY_HOP_HEADERS},
+                content=request.body,
+                timeout=self._timeout(timeout)
+            )
+            httpx_response = client.send(httpx_request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e), request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e), request=request)
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict(httpx_response.headers)
+        if stream:
+            # Read lazily through iter_content()/content, like urllib3's raw response
+            response.raw = _HTTPXRawResponse(httpx_response)
+        else:
+            response._content = httpx_response.content
+        response.encoding = httpx_response.encoding
+        response.reason = httpx_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """Close the underlying httpx clients."""
+        with self._clients_lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+def create_session() -> requests.Session:
+    """
+    Create a new session with the tuned connection pool and default headers.
+
+    Use this instead of get_session() when the session needs its own cookies
+    (e.g. an authenticated browser session).
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if HTTP2_ENABLED:
+        try:
+            session.mount('https://', HTTP2Adapter())
+        except ImportError:
+            print("[WARN] HTTP_CLIENT_HTTP2=1 but httpx[http2] is not installed, using HTTP/1.1")
+
+    return session
+
+
+def create_async_client():
+    """
+    Create an httpx.AsyncClient with the same pool limits and default headers.
+
+    Async clients are bound to the event loop they run in, so async routes
+    create one per request (use it as an async context manager).
+    """
+    global _ssl_context
+    import httpx
+
+    if _ssl_context is None:
+        import ssl
+        import certifi
+        _ssl_context = ssl.create_default_context(cafile=certifi.where())
+
+    return httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        verify=_ssl_context,
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE)
+    )
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide shared session (created on first use)."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+
+    return _session
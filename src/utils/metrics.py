@@ -0,0 +1,313 @@
+"""
+Metrics
+In-process counters and latency histograms for routes, outbound API calls, database
+queries and caches, exposed in the Prometheus text format and as Server-Timing headers
+"""
+
+import contextvars
+import functools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Histogram buckets in seconds (upper bounds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Outbound hosts -> provider label (other hosts are labelled with their host name)
+PROVIDERS = ['rawg', 'igdb', 'twitch']
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+_IMAGE_PATH = re.compile(r'\.(?:jpe?g|png|webp|gif)$', re.IGNORECASE)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        """
+        A value that only goes up (requests, bytes, seconds waited...).
+
+        Args:
+            name: Metric name
+            help_text: Description shown in /metrics
+            labelnames: Label names, given as keyword arguments to inc()
+        """
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """Add to the counter of a label combination (no-op with METRICS_ENABLED=0)."""
+        if not METRICS_ENABLED:
+            return
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(self.labelnames, key)} {value:g}" for key, value in values.items()]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Distribution of durations (or sizes) per label combination.
+
+        Args:
+            name: Metric name (ending in _seconds for durations)
+            help_text: Description shown in /metrics
+            labelnames: Label names, given as keyword arguments to observe()
+            buckets: Bucket upper bounds, ascending
+        """
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values: Dict[Tuple, List] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Record one observation (no-op with METRICS_ENABLED=0)."""
+        if not METRICS_ENABLED:
+            return
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+
+        for key, state in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + (f'{bound:g}',))} "
+                             f"{cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + ('+Inf',))} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-2]:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+
+        return lines
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+# ===== METRICS =====
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time spent handling web requests', ('method', 'route', 'status'))
+
+OUTBOUND_REQUEST_DURATION = Histogram(
+    'outbound_request_duration_seconds', 'Time spent on API requests, per attempt',
+    ('provider', 'endpoint', 'status'))
+OUTBOUND_WAIT_SECONDS = Counter(
+    'outbound_wait_seconds_total', 'Seconds spent waiting before API requests (retry backoff, Retry-After, '
+    'sync pacing)', ('provider', 'reason'))
+OUTBOUND_RATE_LIMITED = Counter(
+    'outbound_rate_limited_total', 'API responses asking us to slow down (HTTP 429)', ('provider',))
+
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds', 'Time spent in database functions (query and row decoding)', ('operation',))
+
+JOB_ITEM_DURATION = Histogram(
+    'job_item_duration_seconds', 'Time spent syncing one queued game', ('kind', 'result'))
+
+IMAGE_CACHE_REQUESTS = Counter(
+    'image_cache_requests_total', 'Image cache lookups (hit: served from disk, miss: downloaded)', ('result',))
+
+_METRICS = [HTTP_REQUEST_DURATION, OUTBOUND_REQUEST_DURATION, OUTBOUND_WAIT_SECONDS, OUTBOUND_RATE_LIMITED,
+            DB_QUERY_DURATION, JOB_ITEM_DURATION, IMAGE_CACHE_REQUESTS]
+
+# Functions returning extra exposition lines, called on each scrape (e.g. cache statistics)
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def register_collector(collect: Callable[[], List[str]]):
+    """Add a function returning exposition lines computed when /metrics is scraped."""
+    _collectors.append(collect)
+
+
+def counter_lines(name: str, help_text: str, label: str, values: Dict[str, float]) -> List[str]:
+    """Exposition lines of a counter kept elsewhere (e.g. a cache's own statistics), one sample per label value."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f"{name}{_format_labels((label,), (value_label,))} {value:g}" for value_label, value in values.items()]
+    return lines
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _METRICS:
+        lines += metric.collect()
+    for collect in _collectors:
+        lines += collect()
+    return '\n'.join(lines) + '\n'
+
+
+# ===== OUTBOUND REQUESTS =====
+
+def provider_of(url: str) -> str:
+    """Provider label of an API URL ('rawg', 'igdb', 'twitch' or the host name)."""
+    parsed = urlparse(url)
+    for provider in PROVIDERS:
+        if provider in (parsed.hostname or ''):
+            return provider
+    # Self-hosted mirrors and the benchmark server mount the APIs under /rawg, /igdb...
+    for provider in PROVIDERS:
+        if f"/{provider}/" in parsed.path:
+            return provider
+    return parsed.hostname or 'unknown'
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Endpoint label of a URL: its path with numeric IDs replaced (e.g. /api/games/{id}/movies),
+    or 'image' for image files (one per game, so they would make a label each).
+    """
+    path = urlparse(url).path
+    if _IMAGE_PATH.search(path):
+        return 'image'
+    return _ID_SEGMENT.sub('/{id}', path) or '/'
+
+
+def observe_outbound(url: str, status, seconds: float):
+    """Record one API request attempt (status is the HTTP status or 'error')."""
+    if not METRICS_ENABLED:
+        return
+    provider = provider_of(url)
+    OUTBOUND_REQUEST_DURATION.observe(seconds, provider=provider, endpoint=endpoint_of(url), status=status)
+    if status == 429:
+        OUTBOUND_RATE_LIMITED.inc(provider=provider)
+    add_request_timing(provider, seconds)
+
+
+def observe_wait(url_or_provider: str, reason: str, seconds: float):
+    """Record time spent waiting before an API request ('rate_limit', 'backoff' or 'pacing')."""
+    if not METRICS_ENABLED:
+        return
+    provider = provider_of(url_or_provider) if '://' in url_or_provider else url_or_provider
+    OUTBOUND_WAIT_SECONDS.inc(seconds, provider=provider, reason=reason)
+    add_request_timing('wait', seconds)
+
+
+def pause(provider: str, seconds: float):
+    """Sleep between sync requests to respect an API's rate limit, recording the wait."""
+    if seconds > 0:
+        observe_wait(provider, 'pacing', seconds)
+        time.sleep(seconds)
+
+
+# ===== DATABASE =====
+
+def db_query(func: Callable) -> Callable:
+    """Decorator timing a database function (labelled with the function name)."""
+    if not METRICS_ENABLED:
+        return func
+
+    operation = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            DB_QUERY_DURATION.observe(seconds, operation=operation)
+            add_request_timing('db', seconds)
+
+    return wrapper
+
+
+# ===== PER-REQUEST TIMINGS (Server-Timing) =====
+
+class RequestTimings:
+    def __init__(self):
+        """Time spent per component (db, rawg, igdb...) while handling one web request."""
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+
+# Copied into asyncio tasks and asyncio.to_thread calls, so async views are covered too
+_request_timings: contextvars.ContextVar[Optional[RequestTimings]] = \
+    contextvars.ContextVar('request_timings', default=None)
+
+
+def start_request() -> RequestTimings:
+    """Start collecting the timings of the current web request."""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def add_request_timing(name: str, seconds: float):
+    """Add time spent in a component to the current web request (no-op outside requests)."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def finish_request(method: str, route: str, status: int) -> Optional[RequestTimings]:
+    """
+    Record the current web request in the route histogram.
+
+    Returns:
+        RequestTimings: The request's timings, or None if start_request() wasn't called
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        return None
+    _request_timings.set(None)
+
+    HTTP_REQUEST_DURATION.observe(time.perf_counter() - timings.started, method=method, route=route, status=status)
+    return timings
+
+
+def server_timing_header(timings: RequestTimings) -> str:
+    """Format request timings as a Server-Timing header value (durations in ms)."""
+    entries = [f"{name};dur={seconds * 1000:.1f};desc=\"{timings.counts[name]} calls\""
+               for name, seconds in sorted(timings.durations.items())]
+    entries.append(f"total;dur={(time.perf_counter() - timings.started) * 1000:.1f}")
+    return ', '.join(entries)
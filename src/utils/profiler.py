@@ -0,0 +1,162 @@
+"""
+Sampling profiler
+Samples the stacks of the running process's threads (web requests and sync workers)
+for a few seconds and returns them as collapsed stacks, so slow requests and syncs
+can be diagnosed live instead of restarting under a profiler
+"""
+
+import hmac
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Set
+
+# Profiling is only available with this token (unset = disabled)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+SAMPLE_INTERVAL = float(os.getenv("PROFILER_INTERVAL_MS", "5")) / 1000
+MAX_SECONDS = 60  # Longest process profile a request may ask for
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_process_profile_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """Check whether profiling is configured (ADMIN_TOKEN is set)."""
+    return bool(ADMIN_TOKEN)
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check an admin token (always False while profiling is disabled)."""
+    return is_enabled() and bool(token) and hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+def _frame_label(frame) -> str:
+    """Name of a stack frame: function (file:first line), with files shown relative to the project."""
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        # Library code: keep the package directory and file name
+        filename = os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+    # ';' separates frames in the collapsed format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ',')
+
+
+class StackSampler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL, labels: Dict[int, str] = None,
+                 exclude: Set[int] = None, only: Set[int] = None):
+        """
+        Sample the stacks of threads from a background thread.
+
+        Args:
+            interval: Seconds between samples
+            labels: Thread ID -> name used as the root frame instead of the thread's name
+            exclude: IDs of threads left out (e.g. the one waiting for the profile)
+            only: IDs of the only threads sampled (None = every thread), see add_thread()
+        """
+        self.interval = interval
+        self.labels = labels or {}
+        self.exclude = exclude or set()
+        self.only = only
+        self.stacks: Counter = Counter()  # Collapsed stack -> number of samples
+        self.samples = 0
+        self.started = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_thread(self, thread_id: int, label: str = None):
+        """Also sample a thread that joined the profiled work (e.g. the event loop running an async view)."""
+        if label:
+            self.labels[thread_id] = label
+        if self.only is not None:
+            self.only = self.only | {thread_id}
+
+    def start(self) -> 'StackSampler':
+        """Start sampling."""
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='stack-sampler')
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'StackSampler':
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    def _run(self):
+        exclude = self.exclude | {threading.get_ident()}
+
+        # Sample right away, so even requests shorter than one interval get a sample
+        self._sample(exclude)
+        while not self._stop.wait(self.interval):
+            self._sample(exclude)
+
+    def _sample(self, exclude: Set[int]):
+        """Record the current stack of every sampled thread."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        only = self.only
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in exclude or (only is not None and thread_id not in only):
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(self.labels.get(thread_id) or names.get(thread_id, f"thread-{thread_id}"))
+
+            self.stacks[';'.join(reversed(stack))] += 1
+
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Samples in the collapsed stack format ('root;caller;callee count' per line),
+        readable by flamegraph.pl, speedscope and most flame graph viewers.
+        """
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 20) -> Dict:
+        """Sample counts and the functions most often on top of a stack (where time is spent)."""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+
+        return {
+            'samples': self.samples,
+            'duration': round(self.duration, 3),
+            'interval': self.interval,
+            'top_functions': [{'function': name, 'samples': count} for name, count in leaves.most_common(top)]
+        }
+
+
+def profile_process(seconds: float) -> StackSampler:
+    """
+    Sample every thread of the process for a number of seconds (blocks the caller).
+
+    Raises:
+        ValueError: seconds is not a finite number
+        RuntimeError: Another process profile is already running
+    """
+    if not math.isfinite(seconds):
+        raise ValueError("seconds must be a finite number")
+
+    if not _process_profile_lock.acquire(blocking=False):
+        raise RuntimeError("A profile is already running")
+
+    try:
+        sampler = StackSampler(exclude={threading.get_ident()}).start()
+        time.sleep(min(max(seconds, 0.1), MAX_SECONDS))
+        return sampler.stop()
+    finally:
+        _process_profile_lock.release()
@@ -0,0 +1,279 @@
+"""
+Resilient HTTP request layer shared by the API syncers
+Classifies errors, respects Retry-After, retries with jittered exponential
+backoff and stops hammering unhealthy hosts with a per-host circuit breaker
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from src.utils.metrics import observe_outbound, observe_wait
+
+MAX_RETRIES = 4            # Retries after the first attempt
+BACKOFF_BASE = 1.0         # Seconds, doubled on every attempt
+BACKOFF_CAP = 30.0         # Never wait longer than this between attempts
+MAX_RETRY_AFTER = 120.0    # Give up instead of honoring a longer Retry-After
+
+# Circuit breaker settings
+FAILURE_THRESHOLD = 5      # Consecutive transient failures before the circuit opens
+RESET_TIMEOUT = 60.0       # Seconds the circuit stays open before a trial request
+
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class APIError(Exception):
+    """Base class for errors raised by the resilient request layer."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TransientAPIError(APIError):
+    """A failure that is expected to go away (timeout, 429, 5xx). Worth retrying later."""
+
+
+class PermanentAPIError(APIError):
+    """A failure that retrying will not fix (bad request, not found, bad credentials)."""
+
+
+class CircuitOpenError(TransientAPIError):
+    """The host failed too often recently; requests are refused until it cools down."""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker: closed -> open after repeated failures -> half-open trial."""
+
+    def __init__(self, host: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to the host right now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.reset_timeout:
+                # Half-open: let one trial request through
+                self.opened_at = time.time()
+                return True
+            return False
+
+    def remaining(self) -> float:
+        """Seconds until the open circuit allows a trial request."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.time() - self.opened_at))
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """Count a transient failure and open the circuit past the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a host."""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if missing/unparseable
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Exponential backoff with full jitter for the given (0-based) attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def is_transient_exception(error: Exception) -> bool:
+    """Return True if a requests exception is a network hiccup worth retrying."""
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def _check_response(breaker: CircuitBreaker, host: str, status: int, headers, attempt: int):
+    """
+    Classify an HTTP status for the retry loop.
+
+    Returns:
+        tuple: (TransientAPIError, delay) for a retryable status, or None on success
+
+    Raises:
+        PermanentAPIError: The request itself is wrong (4xx other than 408/425/429)
+        TransientAPIError: The host asked us to wait longer than MAX_RETRY_AFTER
+    """
+    if status < 400:
+        breaker.record_success()
+        return None
+
+    if status not in TRANSIENT_STATUS_CODES:
+        # The host answered properly; the request itself is wrong
+        breaker.record_success()
+        raise PermanentAPIError(f"HTTP {status} from {host}", status_code=status)
+
+    retry_after = parse_retry_after(headers.get('Retry-After'))
+
+    # Rate limiting means the host is healthy, so only errors count against the circuit
+    if status != 429:
+        breaker.record_failure()
+
+    error = TransientAPIError(f"HTTP {status} from {host}", status_code=status, retry_after=retry_after)
+    delay = retry_after if retry_after is not None else backoff_delay(attempt)
+
+    if delay > MAX_RETRY_AFTER:
+        raise error
+
+    return error, delay
+
+
+def request_with_retry(session: requests.Session, method: str, url: str, max_retries: int = MAX_RETRIES,
+                       log: Callable[[str], None] = None, **kwargs) -> requests.Response:
+    """
+    Send an HTTP request, retrying transient failures.
+
+    Args:
+        session: Session used to send the request
+        method: HTTP method
+        url: Request URL
+        max_retries: Retries after the first attempt
+        log: Optional logging function for retry notices
+        **kwargs: Passed through to session.request (params, data, headers, timeout...)
+
+    Returns:
+        requests.Response: A successful (< 400) response
+
+    Raises:
+        TransientAPIError: Retries exhausted on timeouts, 429 or 5xx (or the circuit is open)
+        PermanentAPIError: Any other 4xx or a non-retryable request error
+    """
+    host = urlparse(url).netloc
+    breaker = get_circuit_breaker(host)
+
+    for attempt in range(max_retries + 1):
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Too many recent failures from {host}, pausing requests",
+                                   retry_after=breaker.remaining())
+
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            observe_outbound(url, 'error', time.perf_counter() - start)
+            if not is_transient_exception(e):
+                raise PermanentAPIError(f"Request to {host} failed: {str(e)}")
+            breaker.record_failure()
+            error = TransientAPIError(f"Request to {host} failed: {str(e)}")
+            delay = backoff_delay(attempt)
+        else:
+            observe_outbound(url, response.status_code, time.perf_counter() - start)
+            retry = _check_response(breaker, host, response.status_code, response.headers, attempt)
+            if retry is None:
+                return response
+            error, delay = retry
+
+        if attempt == max_retries:
+            raise error
+
+        if log:
+            log(f"  ↻ {str(error)}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        observe_wait(url, 'rate_limit' if error.status_code == 429 else 'backoff', delay)
+        time.sleep(delay)
+
+
+async def arequest_with_retry(client, method: str, url: str, max_retries: int = MAX_RETRIES,
+                              log: Callable[[str], None] = None, **kwargs):
+    """
+    Async version of request_with_retry() for an httpx.AsyncClient.
+
+    Shares the circuit breakers and error classification of the sync version,
+    and waits between attempts without blocking the event loop.
+
+    Returns:
+        httpx.Response: A successful (< 400) response
+
+    Raises:
+        TransientAPIError: Retries exhausted on timeouts, 429 or 5xx (or the circuit is open)
+        PermanentAPIError: Any other 4xx or a non-retryable request error
+    """
+    import httpx
+
+    host = urlparse(url).netloc
+    breaker = get_circuit_breaker(host)
+
+    for attempt in range(max_retries + 1):
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Too many recent failures from {host}, pausing requests",
+                                   retry_after=breaker.remaining())
+
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            observe_outbound(url, 'error', time.perf_counter() - start)
+            breaker.record_failure()
+            error = TransientAPIError(f"Request to {host} failed: {str(e)}")
+            delay = backoff_delay(attempt)
+        except httpx.HTTPError as e:
+            observe_outbound(url, 'error', time.perf_counter() - start)
+            raise PermanentAPIError(f"Request to {host} failed: {str(e)}")
+        else:
+            observe_outbound(url, response.status_code, time.perf_counter() - start)
+            retry = _check_response(breaker, host, response.status_code, response.headers, attempt)
+            if retry is None:
+                return response
+            error, delay = retry
+
+        if attempt == max_retries:
+            raise error
+
+        if log:
+            log(f"  ↻ {str(error)}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        observe_wait(url, 'rate_limit' if error.status_code == 429 else 'backoff', delay)
+        await asyncio.sleep(delay)
@@ -22,6 +22,10 @@ document.addEventListener('alpine:init', () => {
         },
         genres: [],
 
+        // Search index over allGames (see gameIndex.js) and the last filter result it narrows from
+        index: null,
+        lastSearch: null,
+
         // Loading states
         isLoading: true,
 
@@ -39,160 +43,85 @@ document.addEventListener('alpine:init', () => {
             await this.loadGames();
         },
 
-        // Load all games from API
-        async loadGames() {
+        // Incremented by each load, so a superseded load stops fetching pages
+        loadId: 0,
+
+        // Load all games from API, page by page (the first page renders right away)
+        async loadGames(params = new URLSearchParams()) {
+            const loadId = ++this.loadId;
             this.isLoading = true;
             try {
-                const response = await fetch('/api/games');
-                const data = await response.json();
-                this.allGames = data.games || [];
-                this.updateStats();
-                this.extractGenres();
-                this.applyFilters();
-
-                // Trigger render after loading
-                if (window.renderGames) {
-                    window.renderGames();
-                }
+                await API.loadAllGames(params, (games) => {
+                    if (loadId !== this.loadId) return false;
+
+                    this.allGames = games;
+                    this.updateIndex();
+                    this.updateStats();
+                    this.extractGenres();
+                    this.applyFilters();
+
+                    // Trigger render after each page
+                    if (window.renderGames) {
+                        window.renderGames();
+                    }
+                    return true;
+                });
             } catch (error) {
                 console.error('Failed to load games:', error);
             } finally {
-                this.isLoading = false;
+                if (loadId === this.loadId) {
+                    this.isLoading = false;
+                }
             }
         },
 
-        // Update statistics
+        // Update statistics (from the index flags)
         updateStats() {
-            const games = this.allGames;
-            this.stats.total = games.length;
-            this.stats.syncedRawg = games.filter(g => g.rawg__synced === 1 || g.rawg__synced === true).length;
-            this.stats.syncedIgdb = games.filter(g => g.igdb__synced === 1 || g.igdb__synced === true).length;
-            this.stats.localMp = games.filter(g => g.rawg__tags?.includes('Local Multiplayer') ||
-                                                     g.rawg__tags?.includes('Local Co-Op')).length;
-            this.stats.onlineMp = games.filter(g => g.rawg__tags?.includes('Online Co-Op') ||
-                                                      g.rawg__tags?.includes('Multiplayer')).length;
+            const index = this.index;
+            let syncedRawg = 0, syncedIgdb = 0, localMp = 0, onlineMp = 0;
+
+            index.games.forEach((g, i) => {
+                if (g.rawg__synced === 1 || g.rawg__synced === true) syncedRawg++;
+                if (g.igdb__synced === 1 || g.igdb__synced === true) syncedIgdb++;
+                if (index.flags[i] & GameIndex.FLAG_LOCAL) localMp++;
+                if (index.flags[i] & GameIndex.FLAG_ONLINE) onlineMp++;
+            });
+
+            this.stats.total = index.games.length;
+            this.stats.syncedRawg = syncedRawg;
+            this.stats.syncedIgdb = syncedIgdb;
+            this.stats.localMp = localMp;
+            this.stats.onlineMp = onlineMp;
+        },
+
+        // Index games that arrived since the last call (a new list starts a new index)
+        updateIndex() {
+            if (!this.index || this.allGames[0] !== this.index.games[0] ||
+                this.allGames.length < this.index.games.length) {
+                this.index = GameIndex.create();
+            }
+            GameIndex.add(this.index, this.allGames.slice(this.index.games.length));
+            this.lastSearch = null;
         },
 
         // Extract unique genres from all games
         extractGenres() {
-            const genreSet = new Set();
-            this.allGames.forEach(game => {
-                const genres = game.rawg__genres || [];
-                genres.forEach(genre => {
-                    const genreName = typeof genre === 'object' ? genre.name : genre;
-                    if (genreName) genreSet.add(genreName);
-                });
-            });
-            this.genres = Array.from(genreSet).sort();
+            this.genres = [...this.index.genreNames].sort();
         },
 
-        // Apply all filters and sorting
+        // Apply all filters and sorting (from the presorted index orders)
         applyFilters() {
-            let filtered = [...this.allGames];
-
-            // Apply search filter
-            if (this.searchQuery) {
-                const query = this.searchQuery.toLowerCase();
-                filtered = filtered.filter(game =>
-                    game.title?.toLowerCase().includes(query)
-                );
-            }
-
-            // Apply genre filter
-            if (this.selectedGenre) {
-                filtered = filtered.filter(game => {
-                    const genres = game.rawg__genres || [];
-                    const genreNames = genres.map(g => typeof g === 'object' ? g.name : g);
-                    return genreNames.includes(this.selectedGenre);
-                });
-            }
-
-            // Apply player filter
-            if (this.selectedPlayerFilter) {
-                filtered = filtered.filter(game => {
-                    const tags = game.rawg__tags || [];
-                    if (this.selectedPlayerFilter === 'local') {
-                        return tags.includes('Local Multiplayer') || tags.includes('Local Co-Op');
-                    } else if (this.selectedPlayerFilter === 'online') {
-                        return tags.includes('Online Co-Op') || tags.includes('Multiplayer');
-                    } else if (this.selectedPlayerFilter === 'singleplayer') {
-                        return tags.includes('Singleplayer');
-                    }
-                    return true;
-                });
-            }
-
-            // Apply combined player count filter
-            if (this.selectedPlayerCount) {
-                if (this.selectedPlayerCount === '1') {
-                    // Single player only
-                    filtered = filtered.filter(game => {
-                        const localMax = game.rawg__local_players_max;
-                        const onlineMax = game.rawg__online_players_max;
-                        return (!localMax || localMax === 1) && (!onlineMax || onlineMax === 1);
-                    });
-                } else if (this.selectedPlayerCount.startsWith('local_')) {
-                    // Local multiplayer filter
-                    const minPlayers = parseInt(this.selectedPlayerCount.split('_')[1]);
-                    filtered = filtered.filter(game => {
-                        const localMax = game.rawg__local_players_max;
-                        return localMax && localMax >= minPlayers;
-                    });
-                } else if (this.selectedPlayerCount.startsWith('online_')) {
-                    // Online multiplayer filter
-                    const minPlayers = parseInt(this.selectedPlayerCount.split('_')[1]);
-                    filtered = filtered.filter(game => {
-                        const onlineMax = game.rawg__online_players_max;
-                        return onlineMax && onlineMax >= minPlayers;
-                    });
-                }
-            }
-
-            // Apply local players filter
-            if (this.selectedLocalPlayers) {
-                const minPlayers = parseInt(this.selectedLocalPlayers);
-                filtered = filtered.filter(game => {
-                    const localMax = game.rawg__local_players_max;
-                    if (minPlayers === 1) {
-                        return !localMax || localMax === 1;
-                    } else {
-                        return localMax && localMax >= minPlayers;
-                    }
-                });
-            }
-
-            // Apply online players filter
-            if (this.selectedOnlinePlayers) {
-                const minPlayers = parseInt(this.selectedOnlinePlayers);
-                filtered = filtered.filter(game => {
-                    const onlineMax = game.rawg__online_players_max;
-                    if (minPlayers === 1) {
-                        return !onlineMax || onlineMax === 1;
-                    } else {
-                        return onlineMax && onlineMax >= minPlayers;
-                    }
-                });
-            }
-
-            // Apply sorting
-            filtered.sort((a, b) => {
-                if (this.sortBy === 'title') {
-                    return (a.title || '').localeCompare(b.title || '');
-                } else if (this.sortBy === 'rating') {
-                    const ratingA = Formatters.calculateCombinedScore(a) || 0;
-                    const ratingB = Formatters.calculateCombinedScore(b) || 0;
-                    return ratingB - ratingA;
-                } else if (this.sortBy === 'release_date') {
-                    return (b.rawg__released || '').localeCompare(a.rawg__released || '');
-                } else if (this.sortBy === 'local_players') {
-                    return (b.rawg__local_players_max || 0) - (a.rawg__local_players_max || 0);
-                } else if (this.sortBy === 'online_players') {
-                    return (b.rawg__online_players_max || 0) - (a.rawg__online_players_max || 0);
-                }
-                return 0;
-            });
-
-            this.filteredGames = filtered;
+            this.lastSearch = GameIndex.search(this.index, {
+                query: this.searchQuery,
+                genre: this.selectedGenre,
+                playerFilter: this.selectedPlayerFilter,
+                playerCount: this.selectedPlayerCount,
+                localPlayers: this.selectedLocalPlayers,
+                onlinePlayers: this.selectedOnlinePlayers,
+                sortBy: this.sortBy
+            }, this.lastSearch);
+
+            this.filteredGames = this.lastSearch.games;
         },
 
         // Set current game for detail view
@@ -308,17 +237,24 @@ function initializeApp() {
     // Initial render will be triggered by loadGames() in the store
 }
 
+// Delay between the last keystroke in the library search and filtering
+const SEARCH_DEBOUNCE_MS = 80;
+
 /**
  * Setup filter event listeners
  */
 function setupFilterListeners() {
     const gameStore = Alpine.store('games');
 
-    // Search input
+    // Search input (debounced; each keystroke narrows the previous result)
+    let searchTimer = null;
     document.getElementById('searchInput')?.addEventListener('input', (e) => {
-        gameStore.searchQuery = e.target.value;
-        gameStore.applyFilters();
-        renderGames();
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            gameStore.searchQuery = e.target.value;
+            gameStore.applyFilters();
+            renderGames();
+        }, SEARCH_DEBOUNCE_MS);
     });
 
     // Genre filter
@@ -437,28 +373,7 @@ function clearAdvancedPlayerFilters() {
  * Load games with specific filters from API
  */
 async function loadGamesWithFilters(params) {
-    const gameStore = Alpine.store('games');
-    gameStore.isLoading = true;
-
-    try {
-        const url = '/api/games' + (params.toString() ? '?' + params.toString() : '');
-        const response = await fetch(url);
-        const data = await response.json();
-
-        if (data.success) {
-            gameStore.allGames = data.games || [];
-            gameStore.updateStats();
-            gameStore.extractGenres();
-            gameStore.applyFilters();
-            renderGames();
-        } else {
-            console.error('Failed to load filtered games:', data.error);
-        }
-    } catch (error) {
-        console.error('Failed to load filtered games:', error);
-    } finally {
-        gameStore.isLoading = false;
-    }
+    await Alpine.store('games').loadGames(params);
 }
 
 /**
@@ -54,6 +54,7 @@ const GameDetail = {
     _buildComprehensiveView(game, hasRAWGData, hasIGDBData) {
         // Prepare all data
         const imageUrl = game.rawg__background_image || game.igdb__cover || '';
+        const igdbCover = !game.rawg__background_image && game.igdb__cover_images ? game.igdb__cover_images.detail : null;
         const title = game.title;
 
         // Ratings - show both if different
@@ -125,7 +126,8 @@ const GameDetail = {
                 ` : ''}
             </div>
 
-            ${imageUrl ? `<img src="${imageUrl}" alt="${Formatters.escapeHtml(title)}" class="game-detail-image">` : ''}
+            ${igdbCover ? `<img ${Formatters.imageAttrs(igdbCover, '(max-width: 900px) 100vw, 900px')} alt="${Formatters.escapeHtml(title)}" class="game-detail-image">` :
+              imageUrl ? `<img src="${Formatters.imageUrl(imageUrl, 1280)}" alt="${Formatters.escapeHtml(title)}" class="game-detail-image">` : ''}
 
             <div class="game-detail-grid">
                 <div class="game-detail-main">
@@ -489,7 +491,7 @@ const GameDetail = {
         const publishers = this._formatIGDBArray(game.igdb__publishers);
 
         return `
-            <div class="game-detail-header" ${cover ? `style="background-image: linear-gradient(rgba(0,0,0,0.7), rgba(0,0,0,0.9)), url('${cover}')"` : ''}>
+            <div class="game-detail-header" ${cover ? `style="background-image: linear-gradient(rgba(0,0,0,0.7), rgba(0,0,0,0.9)), url('${Formatters.imageUrl(cover, 1280)}')"` : ''}>
                 <h2>${Formatters.escapeHtml(game.igdb__name || game.title)}</h2>
             </div>
             <div class="game-detail-content">
@@ -562,7 +564,7 @@ const GameDetail = {
                 ` : ''}
             </div>
 
-            ${imageUrl ? `<img src="${imageUrl}" alt="${Formatters.escapeHtml(game.title)}" class="game-detail-image">` : ''}
+            ${imageUrl ? `<img src="${Formatters.imageUrl(imageUrl, 1280)}" alt="${Formatters.escapeHtml(game.title)}" class="game-detail-image">` : ''}
 
             <div class="game-detail-grid">
                 <div class="game-detail-main">
@@ -634,7 +636,7 @@ const GameDetail = {
 
         const screenshots = game.rawg__screenshots.map(screenshot => {
             const imageUrl = typeof screenshot === 'object' ? screenshot.image : screenshot;
-            return `<img src="${imageUrl}" alt="Screenshot" class="screenshot" onclick="window.open('${imageUrl}', '_blank')">`;
+            return `<img src="${Formatters.imageUrl(imageUrl, 640)}" alt="Screenshot" class="screenshot" loading="lazy" onclick="window.open('${Formatters.imageUrl(imageUrl)}', '_blank')">`;
         }).join('');
 
         return `
@@ -4,22 +4,57 @@
  */
 
 const GameGrid = {
+    // Virtualized grid: only the cards near the viewport exist, positioned absolutely
+    CARD_HEIGHT: 380,          // Fixed card height in px (content past it is clipped)
+    MIN_CARD_WIDTH: 300,       // Same as the .games-grid column minimum
+    MIN_CARD_WIDTH_MOBILE: 250,
+    OVERSCAN_ROWS: 2,          // Rows rendered above and below the viewport
+
+    games: [],
+    columns: 1,
+    cardWidth: 0,
+    gap: 0,
+    visibleCards: new Map(),   // game index -> card element
+    freeCards: [],             // Card elements ready to be reused
+    renderedRange: null,
+    imageObserver: null,
+    updateScheduled: false,
+    forcePending: false,       // A resize is waiting for the scheduled frame
+    listenersAttached: false,
+
     /**
      * Create HTML for a single game card
      */
     createGameCard(game) {
         const hasSyncData = game.rawg__synced || game.rawg_synced;
+
+        return `
+            <div class="game-card ${!hasSyncData ? 'no-sync' : ''}" onclick="GameGrid.showGameDetail(${game.id})">
+                ${this._cardContentHTML(game, false)}
+            </div>
+        `;
+    },
+
+    /**
+     * Create the inner HTML of a game card
+     * @param {Object} game - Game to show
+     * @param {boolean} lazy - Put image URLs in data- attributes, loaded once the card is near the viewport
+     */
+    _cardContentHTML(game, lazy) {
         const imageUrl = game.rawg__background_image || '';
+        const igdbCover = game.igdb__cover_images ? game.igdb__cover_images.card : null;
         const combinedScore = Formatters.calculateCombinedScore(game);
         const releaseYear = game.rawg__released ? Formatters.getYear(game.rawg__released) : null;
 
         const genres = this._formatGenres(game);
         const playerCountBadges = this._formatPlayerCounts(game);
+        const src = lazy ? 'data-src' : 'src';
 
         return `
-            <div class="game-card ${!hasSyncData ? 'no-sync' : ''}" onclick="GameGrid.showGameDetail(${game.id})">
                 ${imageUrl ?
-                    `<img src="${imageUrl}" alt="${Formatters.escapeHtml(game.title)}" class="game-card-image">` :
+                    `<img ${src}="${Formatters.imageUrl(imageUrl, 640)}" alt="${Formatters.escapeHtml(game.title)}" class="game-card-image" loading="lazy" decoding="async">` :
+                    igdbCover ?
+                    `<img ${Formatters.imageAttrs(igdbCover, '(max-width: 768px) 100vw, 360px', lazy)} alt="${Formatters.escapeHtml(game.title)}" class="game-card-image" loading="lazy" decoding="async">` :
                     '<div class="game-card-image"></div>'
                 }
                 <div class="game-card-content">
@@ -33,7 +68,6 @@ const GameGrid = {
                         ${genres}
                     </div>
                 </div>
-            </div>
         `;
     },
 
@@ -127,17 +161,204 @@ const GameGrid = {
     },
 
     /**
-     * Render all games in the grid
+     * Render games in the grid (only the visible ones get DOM nodes)
      */
     renderGames(games) {
         const grid = document.getElementById('gamesGrid');
+        this._attachListeners(grid);
 
         if (!games || games.length === 0) {
+            this._resetVirtualGrid(grid);
             grid.innerHTML = '<div class="loading">No games found. Click "Parse Epic Games" to get started!</div>';
             return;
         }
 
-        grid.innerHTML = games.map(game => this.createGameCard(game)).join('');
+        if (!grid.classList.contains('virtual')) {
+            grid.innerHTML = '';
+            grid.classList.add('virtual');
+        }
+
+        this.games = games;
+        this._measure(grid);
+        this._update(true);
+    },
+
+    /**
+     * Leave virtual mode (for the empty-library message)
+     */
+    _resetVirtualGrid(grid) {
+        grid.classList.remove('virtual');
+        grid.style.height = '';
+        this.games = [];
+        this.visibleCards.clear();
+        this.freeCards = [];
+        this.renderedRange = null;
+    },
+
+    /**
+     * Compute the column count, card width and total grid height
+     */
+    _measure(grid) {
+        const style = getComputedStyle(grid);
+        const minWidth = window.innerWidth <= 768 ? this.MIN_CARD_WIDTH_MOBILE : this.MIN_CARD_WIDTH;
+        const width = grid.clientWidth;
+
+        this.gap = parseFloat(style.columnGap) || 0;
+        this.columns = Math.max(1, Math.floor((width + this.gap) / (minWidth + this.gap)));
+        this.cardWidth = (width - this.gap * (this.columns - 1)) / this.columns;
+
+        const rows = Math.ceil(this.games.length / this.columns);
+        grid.style.height = `${Math.max(rows * (this.CARD_HEIGHT + this.gap) - this.gap, 0)}px`;
+    },
+
+    /**
+     * Show the cards of the rows near the viewport, reusing the card elements
+     * @param {boolean} force - Refresh even if the visible range didn't change (new list or layout)
+     */
+    _update(force = false) {
+        const grid = document.getElementById('gamesGrid');
+        if (!grid.classList.contains('virtual')) return;
+
+        const rowHeight = this.CARD_HEIGHT + this.gap;
+        const totalRows = Math.ceil(this.games.length / this.columns);
+        const gridTop = grid.getBoundingClientRect().top;
+
+        const firstRow = Math.max(0, Math.floor(-gridTop / rowHeight) - this.OVERSCAN_ROWS);
+        const lastRow = Math.min(totalRows, Math.ceil((window.innerHeight - gridTop) / rowHeight) + this.OVERSCAN_ROWS);
+        const start = Math.min(firstRow * this.columns, this.games.length);
+        const end = Math.max(start, Math.min(lastRow * this.columns, this.games.length));
+
+        if (!force && this.renderedRange && this.renderedRange.start === start && this.renderedRange.end === end) {
+            return;
+        }
+        this.renderedRange = { start, end };
+
+        // Recycle the cards that left the range
+        for (const [index, card] of this.visibleCards) {
+            if (index < start || index >= end) {
+                this.visibleCards.delete(index);
+                this.freeCards.push(card);
+            }
+        }
+
+        for (let index = start; index < end; index++) {
+            let card = this.visibleCards.get(index);
+            if (!card) {
+                card = this.freeCards.pop() || this._createCardElement(grid);
+                this.visibleCards.set(index, card);
+            }
+            this._fillCard(card, this.games[index]);
+            this._placeCard(card, index);
+        }
+
+        this.freeCards.forEach(card => { card.style.display = 'none'; });
+    },
+
+    /**
+     * Create an empty card element in the grid
+     */
+    _createCardElement(grid) {
+        const card = document.createElement('div');
+        card.style.height = `${this.CARD_HEIGHT}px`;
+        grid.appendChild(card);
+        return card;
+    },
+
+    /**
+     * Show a game in a card element (kept as-is when it already shows that game)
+     */
+    _fillCard(card, game) {
+        card.style.display = '';
+        if (card._game === game) return;
+
+        card.querySelectorAll('img[data-src]').forEach(img => this.imageObserver?.unobserve(img));
+
+        const hasSyncData = game.rawg__synced || game.rawg_synced;
+        card._game = game;
+        card.className = `game-card ${!hasSyncData ? 'no-sync' : ''}`;
+        card.dataset.gameId = game.id;
+        card.innerHTML = this._cardContentHTML(game, true);
+
+        card.querySelectorAll('img[data-src]').forEach(img => this._observeImage(img));
+    },
+
+    /**
+     * Position a card at its row and column
+     */
+    _placeCard(card, index) {
+        const row = Math.floor(index / this.columns);
+        const column = index % this.columns;
+
+        card.style.width = `${this.cardWidth}px`;
+        card.style.top = `${row * (this.CARD_HEIGHT + this.gap)}px`;
+        card.style.left = `${column * (this.cardWidth + this.gap)}px`;
+    },
+
+    /**
+     * Load a card image once it gets close to the viewport
+     */
+    _observeImage(img) {
+        if (!this.imageObserver) {
+            if (!('IntersectionObserver' in window)) {
+                this._loadImage(img);
+                return;
+            }
+            this.imageObserver = new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        this.imageObserver.unobserve(entry.target);
+                        this._loadImage(entry.target);
+                    }
+                });
+            }, { rootMargin: '300px 0px' });
+        }
+        this.imageObserver.observe(img);
+    },
+
+    /**
+     * Move an image's data-src/data-srcset into src/srcset
+     */
+    _loadImage(img) {
+        if (img.dataset.srcset) {
+            img.srcset = img.dataset.srcset;
+        }
+        img.src = img.dataset.src;
+        img.removeAttribute('data-src');
+    },
+
+    /**
+     * Listen to clicks, scrolling and resizing once
+     */
+    _attachListeners(grid) {
+        if (this.listenersAttached) return;
+        this.listenersAttached = true;
+
+        // One click handler for every (recycled) card
+        grid.addEventListener('click', (event) => {
+            const card = event.target.closest('.game-card[data-game-id]');
+            if (card) {
+                this.showGameDetail(Number(card.dataset.gameId));
+            }
+        });
+
+        // One update per frame; a resize during a pending scroll frame still re-measures
+        const scheduleUpdate = (force) => {
+            this.forcePending = this.forcePending || force;
+            if (this.updateScheduled) return;
+            this.updateScheduled = true;
+            requestAnimationFrame(() => {
+                const forced = this.forcePending;
+                this.updateScheduled = false;
+                this.forcePending = false;
+                if (forced) {
+                    this._measure(grid);
+                }
+                this._update(forced);
+            });
+        };
+
+        window.addEventListener('scroll', () => scheduleUpdate(false), { passive: true });
+        window.addEventListener('resize', () => scheduleUpdate(true));
     }
 };
 
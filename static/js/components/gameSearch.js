@@ -4,6 +4,14 @@
  */
 
 const GameSearch = {
+    // Search-as-you-type settings
+    DEBOUNCE_MS: 300,
+    MIN_QUERY_LENGTH: 2,
+
+    debounceTimer: null,
+    searchController: null,
+    lastQuery: '',
+
     /**
      * Open the add game modal
      */
@@ -15,6 +23,8 @@ const GameSearch = {
         document.getElementById('searchResults').innerHTML = '';
         document.getElementById('gameSearchInput').value = '';
         document.getElementById('searchStatus').style.display = 'none';
+        this.lastQuery = '';
+        document.getElementById('gameSearchInput').focus();
     },
 
     /**
@@ -23,19 +33,62 @@ const GameSearch = {
     closeModal() {
         const modal = document.getElementById('addGameModal');
         modal.style.display = 'none';
+        this.cancelSearch();
+    },
+
+    /**
+     * Cancel a pending or running search
+     */
+    cancelSearch() {
+        clearTimeout(this.debounceTimer);
+        if (this.searchController) {
+            this.searchController.abort();
+            this.searchController = null;
+        }
+    },
+
+    /**
+     * Search once the user stops typing
+     */
+    scheduleSearch() {
+        clearTimeout(this.debounceTimer);
+        const query = document.getElementById('gameSearchInput').value.trim();
+
+        if (query.length < this.MIN_QUERY_LENGTH) {
+            this.cancelSearch();
+            this.lastQuery = '';
+            document.getElementById('searchResults').innerHTML = '';
+            document.getElementById('searchStatus').style.display = 'none';
+            return;
+        }
+
+        this.debounceTimer = setTimeout(() => this.searchGames({ quiet: true }), this.DEBOUNCE_MS);
     },
 
     /**
-     * Search RAWG for games
+     * Search the library and RAWG for games
+     * @param {Object} options - quiet: skip the alert and repeated queries (search-as-you-type)
      */
-    async searchGames() {
+    async searchGames({ quiet = false } = {}) {
         const query = document.getElementById('gameSearchInput').value.trim();
 
         if (!query) {
-            alert('Please enter a game name to search');
+            if (!quiet) {
+                alert('Please enter a game name to search');
+            }
             return;
         }
 
+        if (quiet && query === this.lastQuery) {
+            return;
+        }
+
+        // Only the latest search may update the results
+        this.cancelSearch();
+        const controller = new AbortController();
+        this.searchController = controller;
+        this.lastQuery = query;
+
         const searchBtn = document.getElementById('searchGameBtn');
         const searchStatus = document.getElementById('searchStatus');
         const searchResults = document.getElementById('searchResults');
@@ -49,31 +102,62 @@ const GameSearch = {
         searchResults.innerHTML = '';
 
         try {
-            const data = await API.searchGames(query);
+            const data = await API.searchGames(query, controller.signal);
 
-            if (data.success && data.results.length > 0) {
+            if (data.success && (data.results.length > 0 || data.library.length > 0)) {
                 searchStatus.style.display = 'none';
-                this.displaySearchResults(data.results);
-            } else {
+                this.displaySearchResults(data.results, data.library);
+            } else if (data.success) {
                 searchStatus.textContent = 'No games found. Try a different search term.';
                 searchStatus.style.color = '#f5576c';
+            } else {
+                this.lastQuery = '';
+                searchStatus.textContent = `Error searching: ${data.error}`;
+                searchStatus.style.color = '#f5576c';
             }
         } catch (error) {
+            if (error.name === 'AbortError') {
+                return;
+            }
             console.error('Search error:', error);
+            this.lastQuery = '';
             searchStatus.textContent = 'Error searching. Please try again.';
             searchStatus.style.color = '#f5576c';
         } finally {
-            searchBtn.disabled = false;
-            searchBtn.innerHTML = '<span class="btn-icon">🔍</span> Search RAWG';
+            if (this.searchController === controller) {
+                this.searchController = null;
+                searchBtn.disabled = false;
+                searchBtn.innerHTML = '<span class="btn-icon">🔍</span> Search RAWG';
+            }
         }
     },
 
     /**
      * Display search results
+     * @param {Array} results - RAWG games
+     * @param {Array} library - Matching games already in the library
      */
-    displaySearchResults(results) {
+    displaySearchResults(results, library = []) {
         const searchResults = document.getElementById('searchResults');
 
+        const libraryHTML = library.length > 0 ? `
+            <div class="search-result-genres" style="margin-bottom: 5px;">Already in your library</div>
+            ${library.map(game => `
+                <div class="search-result-card">
+                    ${game.rawg__background_image ?
+                        `<img src="${Formatters.imageUrl(game.rawg__background_image, 320)}" alt="${Formatters.escapeHtml(game.title)}" class="search-result-image" loading="lazy">` :
+                        '<div class="search-result-image" style="background: rgba(255,255,255,0.1); display: flex; align-items: center; justify-content: center;">No Image</div>'}
+                    <div class="search-result-info">
+                        <div class="search-result-title">${Formatters.escapeHtml(game.title)}</div>
+                        <div class="search-result-meta">
+                            ${game.rawg__released ? `<span>📅 ${game.rawg__released}</span>` : ''}
+                            <span>✓ In library</span>
+                        </div>
+                    </div>
+                </div>
+            `).join('')}
+        ` : '';
+
         const resultsHTML = results.map(game => {
             const genres = game.genres && game.genres.length > 0 ?
                 `<div class="search-result-genres">${game.genres.join(', ')}</div>` : '';
@@ -82,7 +166,7 @@ const GameSearch = {
                 `<div style="font-size: 0.8em; color: #999; margin-top: 5px;">Platforms: ${game.platforms.slice(0, 4).join(', ')}${game.platforms.length > 4 ? '...' : ''}</div>` : '';
 
             const imageHTML = game.background_image ?
-                `<img src="${game.background_image}" alt="${Formatters.escapeHtml(game.name)}" class="search-result-image">` :
+                `<img src="${game.background_image}" alt="${Formatters.escapeHtml(game.name)}" class="search-result-image" loading="lazy">` :
                 '<div class="search-result-image" style="background: rgba(255,255,255,0.1); display: flex; align-items: center; justify-content: center;">No Image</div>';
 
             return `
@@ -98,16 +182,18 @@ const GameSearch = {
                         ${genres}
                         ${platforms}
                         <div class="search-result-actions">
-                            <button class="btn-small btn-add" onclick="GameSearch.addGameToLibrary(${game.id}, '${game.name.replace(/'/g, "\\'")}', event)">
+                            ${game.in_library ?
+                                '<button class="btn-small btn-add" disabled>✓ Already Added</button>' :
+                                `<button class="btn-small btn-add" onclick="GameSearch.addGameToLibrary(${game.id}, '${game.name.replace(/'/g, "\\'")}', event)">
                                 ➕ Add to Library
-                            </button>
+                            </button>`}
                         </div>
                     </div>
                 </div>
             `;
         }).join('');
 
-        searchResults.innerHTML = resultsHTML;
+        searchResults.innerHTML = libraryHTML + resultsHTML;
     },
 
     /**
@@ -173,10 +259,16 @@ const GameSearch = {
             this.searchGames();
         });
 
-        // Enter key to search
+        // Search as the user types
+        document.getElementById('gameSearchInput')?.addEventListener('input', () => {
+            this.scheduleSearch();
+        });
+
+        // Enter key to search right away
         document.getElementById('gameSearchInput')?.addEventListener('keypress', (e) => {
             if (e.key === 'Enter') {
-                this.searchGames();
+                clearTimeout(this.debounceTimer);
+                this.searchGames({ quiet: true });
             }
         });
     }
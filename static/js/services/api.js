@@ -18,6 +18,49 @@ const API = {
         }
     },
 
+    /**
+     * Fetch one page of games
+     * @param {URLSearchParams} params - Filters and sort order
+     * @param {number} offset - Games to skip
+     * @param {number} limit - Page size
+     */
+    async getGamesPage(params, offset, limit) {
+        const query = new URLSearchParams(params);
+        query.set('offset', offset);
+        query.set('limit', limit);
+
+        const response = await fetch(`/api/games?${query}`);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error);
+        }
+        return data;
+    },
+
+    /**
+     * Fetch every matching game page by page, reporting each page as it arrives
+     * @param {URLSearchParams} params - Filters and sort order
+     * @param {Function} onPage - Called with (gamesSoFar, total) after each page; return false to stop
+     * @param {number} firstPageSize - Games in the first request (small, so the grid shows up quickly)
+     * @param {number} pageSize - Games per following request
+     */
+    async loadAllGames(params = new URLSearchParams(), onPage = () => true, firstPageSize = 200, pageSize = 1000) {
+        let games = [];
+        let total = Infinity;
+
+        while (games.length < total) {
+            const limit = games.length === 0 ? firstPageSize : pageSize;
+            const data = await this.getGamesPage(params, games.length, limit);
+            games = games.concat(data.games);
+            total = data.total;
+
+            if (onPage(games, total) === false || data.games.length === 0) {
+                break;
+            }
+        }
+        return games;
+    },
+
     /**
      * Fetch library statistics
      */
@@ -110,19 +153,24 @@ const API = {
     },
 
     /**
-     * Search RAWG for games
+     * Search the library and RAWG for games
+     * @param {string} query - Search text
+     * @param {AbortSignal} signal - Optional signal to cancel a superseded search
      */
-    async searchGames(query) {
+    async searchGames(query, signal = undefined) {
         try {
             const response = await fetch('/api/search-game', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query })
+                body: JSON.stringify({ query }),
+                signal
             });
             const data = await response.json();
             return data;
         } catch (error) {
-            console.error('Error searching games:', error);
+            if (error.name !== 'AbortError') {
+                console.error('Error searching games:', error);
+            }
             throw error;
         }
     },
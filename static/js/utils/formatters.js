@@ -117,6 +117,31 @@ const Formatters = {
         return text.replace(/\n/g, '<br>');
     },
 
+    /**
+     * URL of an image through the local image cache (resized to about `width` pixels)
+     * Images from other hosts are returned unchanged.
+     */
+    imageUrl(url, width = null) {
+        if (!url) return '';
+        if (!/^https?:\/\/(media\.rawg\.io|images\.igdb\.com)\//.test(url)) return url;
+        return `/api/image?url=${encodeURIComponent(url)}${width ? `&w=${width}` : ''}`;
+    },
+
+    /**
+     * Attributes of a sized image ({src, srcset} from the API) through the local image cache
+     * Each srcset candidate is already the right size, so it is cached as-is.
+     * With lazy, the URLs go in data-src/data-srcset for the grid's image observer.
+     */
+    imageAttrs(variant, sizes, lazy = false) {
+        if (!variant) return '';
+        const srcset = variant.srcset.split(', ').map(candidate => {
+            const [url, width] = candidate.split(' ');
+            return `${this.imageUrl(url)} ${width}`;
+        }).join(', ');
+        const prefix = lazy ? 'data-' : '';
+        return `${prefix}src="${this.imageUrl(variant.src)}" ${prefix}srcset="${srcset}" sizes="${sizes}"`;
+    },
+
     /**
      * Escape HTML for safe display
      */
@@ -0,0 +1,190 @@
+/**
+ * Game Index
+ * Precomputed search data for the library filters: normalized titles, genre
+ * membership, player flags and presorted orders, built once when games load
+ */
+
+const GameIndex = {
+    /**
+     * Normalize text for matching (lowercase, no accents or punctuation, single spaces)
+     * Matches normalize_query() on the server.
+     */
+    normalize(text) {
+        if (!text) return '';
+        return text
+            .normalize('NFKD')
+            .replace(/[\u0300-\u036f]/g, '')
+            .toLowerCase()
+            .replace(/[^\p{L}\p{N}_\s]/gu, ' ')
+            .split(/\s+/)
+            .filter(Boolean)
+            .join(' ');
+    },
+
+    /**
+     * Create an empty index
+     */
+    create() {
+        return {
+            games: [],
+            titles: [],            // Normalized title per game
+            genreIds: [],          // Genre IDs per game
+            flags: [],             // Player tag bits per game (see FLAG_*)
+            localMax: [],
+            onlineMax: [],
+            scores: [],            // Combined rating per game
+            genreNames: [],        // Genre ID -> name
+            genreLookup: new Map(),// Genre name -> ID
+            orders: {}             // Sort key -> game positions in that order (built on first use)
+        };
+    },
+
+    FLAG_LOCAL: 1,
+    FLAG_ONLINE: 2,
+    FLAG_SINGLE: 4,
+
+    /**
+     * Add games to an index
+     */
+    add(index, games) {
+        games.forEach(game => {
+            const genres = (game.rawg__genres || [])
+                .map(g => typeof g === 'object' ? g.name : g)
+                .filter(Boolean);
+            const tags = game.rawg__tags || [];
+
+            index.games.push(game);
+            index.titles.push(this.normalize(game.title));
+            index.genreIds.push(genres.map(name => {
+                if (!index.genreLookup.has(name)) {
+                    index.genreLookup.set(name, index.genreNames.length);
+                    index.genreNames.push(name);
+                }
+                return index.genreLookup.get(name);
+            }));
+
+            let flags = 0;
+            if (tags.includes('Local Multiplayer') || tags.includes('Local Co-Op')) flags |= this.FLAG_LOCAL;
+            if (tags.includes('Online Co-Op') || tags.includes('Multiplayer')) flags |= this.FLAG_ONLINE;
+            if (tags.includes('Singleplayer')) flags |= this.FLAG_SINGLE;
+            index.flags.push(flags);
+
+            index.localMax.push(game.rawg__local_players_max || 0);
+            index.onlineMax.push(game.rawg__online_players_max || 0);
+            index.scores.push(Formatters.calculateCombinedScore(game) || 0);
+        });
+
+        // Orders include every game, so they are rebuilt after new games arrive
+        index.orders = {};
+    },
+
+    /**
+     * Get game positions sorted by a sort key (computed once per key)
+     */
+    order(index, sortBy) {
+        if (index.orders[sortBy]) return index.orders[sortBy];
+
+        const positions = Array.from(index.games.keys());
+        const games = index.games;
+        const collator = new Intl.Collator();
+
+        const compare = {
+            title: (a, b) => collator.compare(games[a].title || '', games[b].title || ''),
+            rating: (a, b) => index.scores[b] - index.scores[a],
+            release_date: (a, b) => (games[b].rawg__released || '').localeCompare(games[a].rawg__released || ''),
+            local_players: (a, b) => index.localMax[b] - index.localMax[a],
+            online_players: (a, b) => index.onlineMax[b] - index.onlineMax[a]
+        }[sortBy];
+
+        if (compare) {
+            positions.sort(compare);
+        }
+
+        index.orders[sortBy] = positions;
+        return positions;
+    },
+
+    /**
+     * Build a predicate for the non-text filters (null when none is set)
+     */
+    _filterPredicate(index, filters) {
+        const checks = [];
+
+        if (filters.genre) {
+            const genreId = index.genreLookup.get(filters.genre);
+            checks.push(i => index.genreIds[i].includes(genreId));
+        }
+
+        if (filters.playerFilter === 'local') {
+            checks.push(i => index.flags[i] & this.FLAG_LOCAL);
+        } else if (filters.playerFilter === 'online') {
+            checks.push(i => index.flags[i] & this.FLAG_ONLINE);
+        } else if (filters.playerFilter === 'singleplayer') {
+            checks.push(i => index.flags[i] & this.FLAG_SINGLE);
+        }
+
+        if (filters.playerCount === '1') {
+            checks.push(i => index.localMax[i] <= 1 && index.onlineMax[i] <= 1);
+        } else if (filters.playerCount?.startsWith('local_')) {
+            const minPlayers = parseInt(filters.playerCount.split('_')[1]);
+            checks.push(i => index.localMax[i] >= minPlayers);
+        } else if (filters.playerCount?.startsWith('online_')) {
+            const minPlayers = parseInt(filters.playerCount.split('_')[1]);
+            checks.push(i => index.onlineMax[i] >= minPlayers);
+        }
+
+        // 1 means single player (unknown counts included), more means at least that many
+        [['localPlayers', index.localMax], ['onlinePlayers', index.onlineMax]].forEach(([key, counts]) => {
+            if (!filters[key]) return;
+            const minPlayers = parseInt(filters[key]);
+            checks.push(minPlayers === 1 ? i => counts[i] <= 1 : i => counts[i] >= minPlayers);
+        });
+
+        if (checks.length === 0) return null;
+        return i => checks.every(check => check(i));
+    },
+
+    /**
+     * Filter and sort the indexed games
+     * @param {Object} index - Index built with create()/add()
+     * @param {Object} filters - query, genre, playerFilter, playerCount, localPlayers, onlinePlayers, sortBy
+     * @param {Object} previous - Result of the previous search, narrowed instead of starting over
+     *                            when only the query changed and it extends the previous one
+     * @returns {Object} {positions, games, key, query}
+     */
+    search(index, filters, previous = null) {
+        const query = this.normalize(filters.query);
+        const key = JSON.stringify([filters.genre, filters.playerFilter, filters.playerCount,
+                                    filters.localPlayers, filters.onlinePlayers, filters.sortBy,
+                                    index.games.length]);
+
+        // Every match of a longer query is among the matches of the shorter one
+        const narrowing = previous && previous.key === key && query.startsWith(previous.query);
+
+        let positions;
+        if (narrowing) {
+            if (query === previous.query) return previous;
+            positions = previous.positions;
+        } else {
+            positions = this.order(index, filters.sortBy);
+            const predicate = this._filterPredicate(index, filters);
+            if (predicate) {
+                positions = positions.filter(predicate);
+            }
+        }
+
+        if (query) {
+            positions = positions.filter(i => index.titles[i].includes(query));
+        }
+
+        return {
+            positions,
+            games: positions.map(i => index.games[i]),
+            key,
+            query
+        };
+    }
+};
+
+// Make GameIndex available globally
+window.GameIndex = GameIndex;
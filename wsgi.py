@@ -0,0 +1,8 @@
+"""
+Production WSGI entry point
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import app, resume_interrupted_syncs
+
+# Every worker tries; the shared task store lets only one of them resume each job
+resume_interrupted_syncs()